@@ -3,9 +3,56 @@ import json
 import time
 import random
 import sys
+import bisect
+import heapq
+import itertools
+from array import array
+import copy
+import functools
+import re
+import signal
+import unicodedata
+import contextlib
+import io
+import math
+import struct
+import importlib
+import importlib.util
+import getpass
+import hashlib
+from types import MappingProxyType
+from collections import Counter
+from functools import partial
 from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Any
+
+class _LazyModule:
+    """Módulo importado só no primeiro uso de um atributo.
+
+    O numpy sozinho custa mais que o resto do jogo para importar, e uma partida normal
+    (9 lotes) nunca precisa dele; o mesmo vale para o SQLite, os shards, a telemetria
+    e o argparse, que só entram em cena nos benchmarks, nos saves em banco ou na CLI.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+np = _LazyModule("numpy") if importlib.util.find_spec("numpy") else None
+argparse = _LazyModule("argparse")
+csv = _LazyModule("csv")
+multiprocessing = _LazyModule("multiprocessing")
+shared_memory = _LazyModule("multiprocessing.shared_memory")
+sqlite3 = _LazyModule("sqlite3")
+subprocess = _LazyModule("subprocess")
+tempfile = _LazyModule("tempfile")
+threading = _LazyModule("threading")
 
 # ==================== Interfaces e Classes Base ====================
 class ISerializable(ABC):
@@ -26,23 +73,36 @@ class IGameSystem(ABC):
 # ==================== Modelos do Jogo ====================
 class Crop(ISerializable):
     def __init__(self, name: str, cost: int, growth_time: int, value: int, 
-                 color: str, stamina_cost: float):
+                 color: str, stamina_cost: float, key: Optional[str] = None):
         self.name = name
+        # Chave no catálogo (o nome é só para exibição): vizinhança e pragas casam por ela
+        self.key = key or name
         self.cost = cost
         self.growth_time = growth_time
         self.value = value
         self.color = color
         self.stamina_cost = stamina_cost
+        self._dict: Optional[Dict[str, Any]] = None
+        self._json: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'name': self.name,
-            'cost': self.cost,
-            'growth_time': self.growth_time,
-            'value': self.value,
-            'color': self.color,
-            'stamina_cost': self.stamina_cost
-        }
+        # Culturas não mudam depois de criadas: o dict (compartilhado, não altere) e o JSON ficam em cache
+        if self._dict is None:
+            self._dict = {
+                'name': self.name,
+                'cost': self.cost,
+                'growth_time': self.growth_time,
+                'value': self.value,
+                'color': self.color,
+                'stamina_cost': self.stamina_cost,
+                'key': self.key
+            }
+        return self._dict
+
+    def to_json(self) -> str:
+        if self._json is None:
+            self._json = json.dumps(self.to_dict())
+        return self._json
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Crop':
@@ -52,48 +112,66 @@ class Crop(ISerializable):
             growth_time=data['growth_time'],
             value=data['value'],
             color=data['color'],
-            stamina_cost=data['stamina_cost']
+            stamina_cost=data['stamina_cost'],
+            key=data.get('key') or CropSystem.key_for(data['name'])
         )
 
 class Plot(ISerializable):
     def __init__(self, crop: Optional[Crop] = None, planted_at: Optional[datetime] = None):
         self.crop = crop
         self.planted_at = planted_at
+        self._owner = None
+        self._dict: Optional[Dict[str, Any]] = None
+        self._json: Optional[str] = None
+
+    def invalidate(self):
+        """Descarta as formas serializadas em cache; `PlotStore.mutable` chama antes de cada alteração."""
+        self._dict = self._json = None
+
+    def copy(self) -> 'Plot':
+        return Plot(self.crop, self.planted_at)
     
     @property
     def is_empty(self) -> bool:
         return self.crop is None
     
-    @property
-    def growth_progress(self) -> float:
+    def progress_at(self, now: datetime, growth: Optional['GrowthTimeline'] = None, region: int = 0) -> float:
         if self.is_empty or self.planted_at is None:
             return 0.0
         
-        elapsed = (datetime.now() - self.planted_at).total_seconds()
+        elapsed = growth.elapsed(self.planted_at, now, region) if growth else (now - self.planted_at).total_seconds()
         return min(1.0, elapsed / self.crop.growth_time)
     
-    @property
-    def is_ready(self) -> bool:
-        return self.growth_progress >= 1.0
-    
-    def plant(self, crop: Crop):
+    def plant(self, crop: Crop, now: Optional[datetime] = None):
         self.crop = crop
-        self.planted_at = datetime.now()
+        self.planted_at = now or datetime.now()
+        self.invalidate()
     
-    def harvest(self) -> int:
-        if self.is_empty or not self.is_ready:
+    def harvest(self, now: Optional[datetime] = None, growth: Optional['GrowthTimeline'] = None,
+                region: int = 0) -> int:
+        if self.is_empty or self.progress_at(now or datetime.now(), growth, region) < 1.0:
             return 0
         
         value = self.crop.value
         self.crop = None
         self.planted_at = None
+        self.invalidate()
         return value
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'crop': self.crop.to_dict() if self.crop else None,
-            'planted_at': self.planted_at.isoformat() if self.planted_at else None
-        }
+        if self._dict is None:
+            self._dict = {
+                'crop': self.crop.to_dict() if self.crop else None,
+                'planted_at': self.planted_at.isoformat() if self.planted_at else None
+            }
+        return self._dict
+
+    def to_json(self) -> str:
+        if self._json is None:
+            crop = self.crop.to_json() if self.crop else "null"
+            planted_at = json.dumps(self.planted_at.isoformat()) if self.planted_at else "null"
+            self._json = f'{{"crop": {crop}, "planted_at": {planted_at}}}'
+        return self._json
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Plot':
@@ -112,8 +190,24 @@ class Player(ISerializable):
         self.stamina = stamina
         self.max_stamina = max_stamina
         self.last_sleep_time = last_sleep_time or datetime.now()
-        self.has_farmdex = False
         self.fossils_found = []
+        self.items: Dict[str, str] = {}
+        self.effects: Counter = Counter()
+
+    def owns(self, item_key: str) -> bool:
+        return item_key in self.items
+
+    def has_effect(self, effect: str) -> bool:
+        return self.effects[effect] > 0
+
+    def add_item(self, item_key: str, effect: str):
+        if item_key not in self.items:
+            self.items[item_key] = effect
+            self.effects[effect] += 1
+
+    @property
+    def has_farmdex(self) -> bool:
+        return self.has_effect("unlock_farmdex")
     
     def can_afford(self, amount: int) -> bool:
         return self.money >= amount
@@ -142,8 +236,9 @@ class Player(ISerializable):
             'stamina': self.stamina,
             'max_stamina': self.max_stamina,
             'last_sleep_time': self.last_sleep_time.isoformat(),
-            'has_farmdex': getattr(self, 'has_farmdex', False),
-            'fossils_found': getattr(self, 'fossils_found', [])
+            'has_farmdex': self.has_farmdex,
+            'fossils_found': self.fossils_found,
+            'items': self.items
         }
     
     @classmethod
@@ -154,73 +249,1196 @@ class Player(ISerializable):
             max_stamina=data['max_stamina'],
             last_sleep_time=datetime.fromisoformat(data['last_sleep_time'])
         )
-        obj.has_farmdex = data.get('has_farmdex', False)
         obj.fossils_found = data.get('fossils_found', [])
+        for item_key, effect in data.get('items', {}).items():
+            obj.add_item(item_key, effect)
+        if 'items' not in data:
+            if data.get('has_farmdex', False):
+                obj.add_item('farmdex_scanner', 'unlock_farmdex')
+            if obj.max_stamina > 5:
+                obj.add_item('balatro_card', 'increase_max_stamina')
         return obj
 
+# ==================== Pacotes de Conteúdo ====================
+class ContentPackError(ValueError):
+    pass
+
+class ContentCatalog:
+    """Catálogo imutável de culturas, itens do mercador e eventos vindos de pacotes JSON.
+
+    Os pacotes são validados uma vez e a forma compilada fica em cache no disco (JSON, nunca
+    código executável), indexada pelo mtime e pelo hash de cada arquivo.
+    """
+    PACK_DIR = "content_packs"
+    CACHE_FILE = ".terminal_farm_catalog.json"
+    CACHE_VERSION = 5
+
+    _default: Optional['ContentCatalog'] = None
+
+    def __init__(self, crops: Dict[str, Crop], seeds: Dict[str, Dict[str, Any]],
+                 items: Dict[str, Dict[str, Any]], events: List[Dict[str, Any]]):
+        self.crops = MappingProxyType(dict(crops))
+        self.seeds = MappingProxyType({k: MappingProxyType(v) for k, v in seeds.items()})
+        self.items = MappingProxyType({k: MappingProxyType(v) for k, v in items.items()})
+        self.events = tuple(MappingProxyType(e) for e in events)
+
+    @classmethod
+    def empty(cls) -> 'ContentCatalog':
+        return cls({}, {}, {}, [])
+
+    @classmethod
+    def get(cls) -> 'ContentCatalog':
+        if cls._default is None:
+            try:
+                cls._default = cls.load(cls.PACK_DIR, cls.CACHE_FILE)
+            except ContentPackError as e:
+                print(f"Error loading content packs: {e}")
+                cls._default = cls.empty()
+        return cls._default
+
+    @staticmethod
+    def _pack_files(pack_dir: str) -> List[str]:
+        if not os.path.isdir(pack_dir):
+            return []
+        return sorted(os.path.join(pack_dir, name) for name in os.listdir(pack_dir) if name.endswith('.json'))
+
+    @staticmethod
+    def _file_hash(path: str) -> str:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    @classmethod
+    def load(cls, pack_dir: str, cache_file: Optional[str] = None) -> 'ContentCatalog':
+        files = cls._pack_files(pack_dir)
+        if not files:
+            return cls.empty()
+
+        stats = {path: os.stat(path) for path in files}
+        cached = cls._read_cache(cache_file) if cache_file else None
+        if cached and sorted(cached['files']) == files:
+            fresh = all(cached['files'][path]['mtime_ns'] == stats[path].st_mtime_ns and
+                        cached['files'][path]['size'] == stats[path].st_size for path in files)
+            if fresh:
+                return cls(**cached['compiled'])
+            hashes = {path: cls._file_hash(path) for path in files}
+            if all(cached['files'][path]['sha256'] == hashes[path] for path in files):
+                cls._write_cache(cache_file, files, stats, hashes, cached['compiled'])
+                return cls(**cached['compiled'])
+
+        hashes = {path: cls._file_hash(path) for path in files}
+        compiled = cls.compile([(path, cls._read_pack(path)) for path in files])
+        if cache_file:
+            cls._write_cache(cache_file, files, stats, hashes, compiled)
+        return cls(**compiled)
+
+    @staticmethod
+    def _read_pack(path: str) -> Dict[str, Any]:
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ContentPackError(f"{path}: {e}")
+        if not isinstance(data, dict):
+            raise ContentPackError(f"{path}: a content pack must be a JSON object")
+        return data
+
+    @staticmethod
+    def _read_cache(cache_file: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(cache_file, 'r') as f:
+                cached = json.load(f)
+            if not isinstance(cached, dict) or cached.get('version') != ContentCatalog.CACHE_VERSION:
+                return None
+            compiled = cached['compiled']
+            compiled['crops'] = {key: Crop.from_dict(crop) for key, crop in compiled['crops'].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        return cached
+
+    @classmethod
+    def _write_cache(cls, cache_file: str, files: List[str], stats: Dict[str, os.stat_result],
+                     hashes: Dict[str, str], compiled: Dict[str, Any]):
+        cached = {
+            'version': cls.CACHE_VERSION,
+            'files': {path: {'mtime_ns': stats[path].st_mtime_ns, 'size': stats[path].st_size,
+                             'sha256': hashes[path]} for path in files},
+            'compiled': dict(compiled, crops={key: crop.to_dict() for key, crop in compiled['crops'].items()}),
+        }
+        try:
+            with open(cache_file, 'w') as f:
+                json.dump(cached, f)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _entries(path: str, pack: Dict[str, Any], section: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Entradas de uma seção do pacote, já checando que a seção é lista e cada entrada, objeto."""
+        entries = pack.get(section, [])
+        if not isinstance(entries, list):
+            raise ContentPackError(f"{path}: '{section}' must be a list")
+        for i, entry in enumerate(entries):
+            where = f"{path}: {section}[{i}]"
+            if not isinstance(entry, dict):
+                raise ContentPackError(f"{where}: an entry must be a JSON object")
+            yield where, entry
+
+    @staticmethod
+    def _require(entry: Dict[str, Any], field: str, kind: Any, where: str) -> Any:
+        if field not in entry:
+            raise ContentPackError(f"{where}: missing '{field}'")
+        value = entry[field]
+        if not isinstance(value, kind) or isinstance(value, bool):
+            raise ContentPackError(f"{where}: '{field}' has the wrong type")
+        if isinstance(value, (int, float)) and value < 0:
+            raise ContentPackError(f"{where}: '{field}' must not be negative")
+        return value
+
+    @classmethod
+    def compile(cls, packs: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        crops: Dict[str, Crop] = {}
+        seeds: Dict[str, Dict[str, Any]] = {}
+        items: Dict[str, Dict[str, Any]] = {}
+        events: List[Dict[str, Any]] = []
+        event_keys = set()
+        known_crops = set(CropSystem.DEFAULT_CROPS)
+
+        # Culturas de todos os pacotes primeiro, para as sementes não dependerem da ordem de carga
+        for path, pack in packs:
+            for where, entry in cls._entries(path, pack, 'crops'):
+                key = cls._require(entry, 'key', str, where)
+                if key in crops:
+                    raise ContentPackError(f"{where}: duplicate crop '{key}'")
+                crops[key] = Crop(
+                    key=key,
+                    name=cls._require(entry, 'name', str, where) if 'name' in entry else key,
+                    cost=cls._require(entry, 'cost', int, where),
+                    growth_time=cls._require(entry, 'growth_time', (int, float), where),
+                    value=cls._require(entry, 'value', int, where),
+                    color=cls._require(entry, 'color', str, where) if 'color' in entry else 'white',
+                    stamina_cost=cls._require(entry, 'stamina_cost', (int, float), where),
+                )
+                if crops[key].growth_time <= 0:
+                    raise ContentPackError(f"{where}: 'growth_time' must be positive")
+
+        for path, pack in packs:
+            for where, entry in cls._entries(path, pack, 'seeds'):
+                key = cls._require(entry, 'key', str, where)
+                crop = cls._require(entry, 'crop', str, where)
+                if key in seeds:
+                    raise ContentPackError(f"{where}: duplicate seed '{key}'")
+                if crop not in crops and crop not in known_crops:
+                    raise ContentPackError(f"{where}: unknown crop '{crop}'")
+                seeds[key] = {'crop': crop, 'price': cls._require(entry, 'price', int, where)}
+
+            for where, entry in cls._entries(path, pack, 'items'):
+                key = cls._require(entry, 'key', str, where)
+                if key in items:
+                    raise ContentPackError(f"{where}: duplicate item '{key}'")
+                item = {'price': cls._require(entry, 'price', int, where)}
+                if 'unlocks' in entry:
+                    item['unlocks'] = cls._require(entry, 'unlocks', str, where)
+                elif 'effect' in entry:
+                    item['effect'] = cls._require(entry, 'effect', str, where)
+                else:
+                    raise ContentPackError(f"{where}: an item needs an 'effect' or 'unlocks'")
+                if ItemEffectRegistry.effect_of(item) not in ITEM_EFFECTS:
+                    raise ContentPackError(f"{where}: unknown effect '{ItemEffectRegistry.effect_of(item)}'")
+                if entry.get('narrative'):
+                    item['narrative'] = True
+                if 'description' in entry:
+                    item['description'] = cls._require(entry, 'description', str, where)
+                items[key] = item
+
+            for where, entry in cls._entries(path, pack, 'events'):
+                key = cls._require(entry, 'key', str, where)
+                if key in event_keys:
+                    raise ContentPackError(f"{where}: duplicate event '{key}'")
+                event_keys.add(key)
+                event = {'key': key, 'message': cls._require(entry, 'message', str, where)}
+                for field in ('money', 'stamina', 'growth_bonus'):
+                    value = entry.get(field, 0)
+                    if not isinstance(value, (int, float)) or isinstance(value, bool):
+                        raise ContentPackError(f"{where}: '{field}' has the wrong type")
+                    event[field] = value
+                # O bônus multiplica a taxa de crescimento: -100% ou menos pararia (ou inverteria) o relógio
+                if event['growth_bonus'] <= -100:
+                    raise ContentPackError(f"{where}: 'growth_bonus' must be greater than -100")
+                events.append(event)
+
+        return {'crops': crops, 'seeds': seeds, 'items': items, 'events': events}
+
+# ==================== Aleatoriedade ====================
+class RandomStream:
+    """Fluxo pseudoaleatório de um subsistema, gerado em blocos.
+
+    Cada bloco de BLOCK_SIZE números vem de um gerador semeado com (semente, índice do bloco),
+    então o estado é só (bloco, posição) e restaurá-lo é O(1). `draws(n)` entrega n números
+    de uma vez, sempre os mesmos que n chamadas de `random()`: com numpy e n grande, os blocos
+    saem do MT19937 do `RandomState`, que semeia e converte em float igual ao `random.Random`.
+    """
+    BLOCK_SIZE = 256
+    NUMPY_BATCH = 1024
+
+    def __init__(self, seed: int, block: int = 0, position: int = 0):
+        self.seed = seed
+        self._block = block
+        self._position = position
+        self._values: Optional[List[float]] = None
+
+    @classmethod
+    def unseeded(cls) -> 'RandomStream':
+        """Fluxo avulso (sistemas fora de um GameState), semeado pelo `random` global."""
+        return cls(random.getrandbits(63))
+
+    def copy(self) -> 'RandomStream':
+        other = RandomStream(self.seed, self._block, self._position)
+        other._values = self._values
+        return other
+
+    def _current(self) -> List[float]:
+        if self._position == self.BLOCK_SIZE:
+            self._block += 1
+            self._position = 0
+            self._values = None
+        if self._values is None:
+            draw = random.Random((self.seed << 32) | self._block).random
+            self._values = [draw() for _ in range(self.BLOCK_SIZE)]
+        return self._values
+
+    def random(self) -> float:
+        values = self._current()
+        value = values[self._position]
+        self._position += 1
+        return value
+
+    def _block_key(self, block: int) -> Any:
+        """A semente do bloco em palavras de 32 bits, como `random.Random` a passa ao MT19937."""
+        value = (self.seed << 32) | block
+        return np.array([(value >> shift) & 0xFFFFFFFF for shift in range(0, max(value.bit_length(), 1), 32)],
+                        dtype=np.uint32)
+
+    def _draw_array(self, n: int) -> Any:
+        out = np.empty(n)
+        generator = np.random.RandomState()
+        filled = 0
+        while filled < n:
+            if self._position == self.BLOCK_SIZE:
+                self._block += 1
+                self._position = 0
+                self._values = None
+            take = min(self.BLOCK_SIZE - self._position, n - filled)
+            if self._values is not None:
+                out[filled:filled + take] = self._values[self._position:self._position + take]
+            else:
+                generator.seed(self._block_key(self._block))
+                values = generator.random_sample(self.BLOCK_SIZE)
+                out[filled:filled + take] = values[self._position:self._position + take]
+                if self._position + take < self.BLOCK_SIZE:
+                    self._values = values.tolist()
+            self._position += take
+            filled += take
+        return out
+
+    def draws(self, n: int) -> Any:
+        """n números em [0, 1): np.ndarray para lotes grandes com numpy, senão lista; os valores são os mesmos."""
+        if np is not None and n >= self.NUMPY_BATCH:
+            return self._draw_array(n)
+        out: List[float] = []
+        while len(out) < n:
+            values = self._current()
+            taken = values[self._position:self._position + n - len(out)]
+            self._position += len(taken)
+            out.extend(taken)
+        return out
+
+    def randrange(self, n: int) -> int:
+        return min(int(self.random() * n), n - 1)
+
+    def randint(self, a: int, b: int) -> int:
+        return a + self.randrange(b - a + 1)
+
+    def choice(self, seq):
+        return seq[self.randrange(len(seq))]
+
+    def sample(self, population, k: int) -> list:
+        pool = list(population)
+        for i in range(k):
+            j = i + self.randrange(len(pool) - i)
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
+
+    def getrandbits(self, k: int) -> int:
+        bits = 0
+        for _ in range(0, k, 32):
+            bits = (bits << 32) | int(self.random() * 2 ** 32)
+        return bits >> (-k % 32)
+
+    def state(self) -> List[int]:
+        return [self._block, self._position]
+
+class RandomStreams:
+    """Um RandomStream por subsistema, todos derivados de uma semente mestre e salvos no jogo.
+
+    Cada subsistema sorteia do seu próprio fluxo, então um não desloca a sequência do outro
+    e a mesma semente com as mesmas ações reproduz a partida.
+    """
+    NAMES = ('weather', 'events', 'farm', 'pests', 'fossils', 'fishing')
+
+    def __init__(self, seed: Optional[int] = None, states: Optional[Dict[str, List[int]]] = None):
+        self.seed = random.getrandbits(63) if seed is None else seed
+        states = states or {}
+        for name in self.NAMES:
+            # [:2]: saves anteriores guardavam também um contador de lotes do numpy
+            setattr(self, name, RandomStream(self.derive(self.seed, name), *states.get(name, ())[:2]))
+
+    @staticmethod
+    def derive(seed: int, name: str) -> int:
+        return int.from_bytes(hashlib.sha256(f"{seed}:{name}".encode()).digest()[:8], "little")
+
+    def fork(self) -> 'RandomStreams':
+        other = RandomStreams.__new__(RandomStreams)
+        other.seed = self.seed
+        for name in self.NAMES:
+            setattr(other, name, getattr(self, name).copy())
+        return other
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'seed': self.seed, 'streams': {name: getattr(self, name).state() for name in self.NAMES}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RandomStreams':
+        return cls(data['seed'], data['streams'])
+
 # ==================== Sistemas do Jogo ====================
+class _PlotChunk(list):
+    __slots__ = ('owner', 'json')
+
+    def __init__(self, plots, owner: object):
+        super().__init__(plots)
+        self.owner = owner
+        self.json: Optional[str] = None
+
+class PlotStore:
+    """Lotes guardados em blocos com cópia-na-escrita entre forks.
+
+    `fork()` é O(1): os dois lados passam a compartilhar os blocos e só copiam o
+    bloco (e o lote) que alterarem. Quem altera um lote deve pegá-lo com `mutable()`.
+    """
+    CHUNK_SIZE = 64
+
+    def __init__(self, plots: List[Plot]):
+        self._token = object()
+        for plot in plots:
+            plot._owner = self._token
+        self._chunks = [_PlotChunk(plots[i:i + self.CHUNK_SIZE], self._token)
+                        for i in range(0, len(plots), self.CHUNK_SIZE)]
+        self._size = len(plots)
+        self._chunks_owned = True
+        self.version = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            yield from chunk
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("plot index out of range")
+        return self._chunks[index // self.CHUNK_SIZE][index % self.CHUNK_SIZE]
+
+    def __setitem__(self, index: int, plot: Plot):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("plot index out of range")
+        plot._owner = self._token
+        chunk = self._writable_chunk(index // self.CHUNK_SIZE)
+        chunk[index % self.CHUNK_SIZE] = plot
+        chunk.json = None
+        self.version += 1
+
+    def _writable_chunk(self, chunk_index: int) -> _PlotChunk:
+        if not self._chunks_owned:
+            self._chunks = list(self._chunks)
+            self._chunks_owned = True
+        chunk = self._chunks[chunk_index]
+        if chunk.owner is not self._token:
+            chunk = _PlotChunk(chunk, self._token)
+            self._chunks[chunk_index] = chunk
+        return chunk
+
+    def mutable(self, index: int) -> Plot:
+        plot = self[index]
+        if plot._owner is not self._token:
+            plot = plot.copy()
+            self[index] = plot
+        else:
+            self._chunks[index // self.CHUNK_SIZE].json = None
+            self.version += 1
+        plot.invalidate()
+        return plot
+
+    def iter_json(self):
+        """Lista JSON dos lotes, em pedaços, com os fragmentos em cache de cada bloco e de cada lote."""
+        separator = "["
+        for chunk in self._chunks:
+            if chunk.json is None:
+                chunk.json = ", ".join(plot.to_json() for plot in chunk)
+            yield separator + chunk.json
+            separator = ", "
+        yield "[]" if separator == "[" else "]"
+
+    def fork(self) -> 'PlotStore':
+        other = PlotStore.__new__(PlotStore)
+        other._chunks = self._chunks
+        other._size = self._size
+        other._token = object()
+        other._chunks_owned = False
+        other.version = self.version
+        self._token = object()
+        self._chunks_owned = False
+        return other
+
+class AdjacencyLayer:
+    """Modificadores de colheita por vizinhança (plantio consorciado e monocultura).
+
+    Os lotes formam uma grade de `width` colunas. Cada lote soma, para os 8 vizinhos
+    pesados por KERNEL, o bônus do par (cultura do centro, cultura do vizinho); em fazendas
+    a partir de NUMPY_MIN_PLOTS lotes, com numpy, isso é uma convolução vetorizada sobre a
+    grade de ids (abaixo disso o laço puro é mais rápido que importar o numpy). Mudanças só marcam o lote como
+    sujo, e o recálculo refaz apenas as janelas 3x3 em volta dos lotes sujos.
+    """
+    KERNEL = ((-1, -1, 0.5), (-1, 0, 1.0), (-1, 1, 0.5), (0, -1, 1.0),
+              (0, 1, 1.0), (1, -1, 0.5), (1, 0, 1.0), (1, 1, 0.5))
+    # Bônus em % por vizinho ortogonal (diagonais valem metade)
+    COMPANIONS = {
+        ('corn', 'pumpkin'): 10.0,
+        ('carrot', 'eggplant'): 8.0,
+        ('blueberry', 'wheat'): 6.0,
+        ('lazy_ghost', 'pumpkin'): 5.0,
+    }
+    MONOCULTURE = -5.0
+    MIN_MODIFIER = 0.5
+    FULL_RECOMPUTE_FRACTION = 0.05
+    NUMPY_MIN_PLOTS = 1024
+
+    def __init__(self, size: int):
+        self.size = size
+        self.width = math.isqrt(max(size, 1) - 1) + 1
+        self.height = -(-size // self.width)
+        self.names: List[Optional[str]] = [None]
+        self._ids: Dict[str, int] = {}
+        self._dirty: set = set()
+        self._stale = True
+        self._shared = False
+        padded = (self.height + 2) * (self.width + 2)
+        self.use_numpy = np is not None and size >= self.NUMPY_MIN_PLOTS
+        if self.use_numpy:
+            self.grid = np.zeros((self.height + 2, self.width + 2), dtype=np.int32)
+            self.modifiers = np.ones(self.height * self.width, dtype=np.float64)
+        else:
+            self.grid = array('i', bytes(4 * padded))
+            self.modifiers = array('d', [1.0]) * (self.height * self.width)
+        self._build_table()
+
+    @classmethod
+    def from_farm(cls, farm: 'FarmSystem') -> 'AdjacencyLayer':
+        layer = cls(len(farm.plots))
+        occupied = farm.occupied_plots()
+        crop_ids = [layer._intern(farm.plots[i].crop.key) for i in occupied]
+        if layer.use_numpy and occupied:
+            rows, cols = np.divmod(np.asarray(occupied, dtype=np.int64), layer.width)
+            layer.grid[rows + 1, cols + 1] = crop_ids
+        else:
+            for i, crop_id in zip(occupied, crop_ids):
+                layer._write(i, crop_id)
+        return layer
+
+    def fork(self) -> 'AdjacencyLayer':
+        other = AdjacencyLayer.__new__(AdjacencyLayer)
+        other.__dict__.update(self.__dict__)
+        other._shared = self._shared = True
+        return other
+
+    def _own(self):
+        if self._shared:
+            self.grid = copy.copy(self.grid)
+            self.modifiers = copy.copy(self.modifiers)
+            self._dirty = set(self._dirty)
+            self.names, self._ids = list(self.names), dict(self._ids)
+            self._shared = False
+
+    def _intern(self, name: str) -> int:
+        crop_id = self._ids.get(name)
+        if crop_id is None:
+            self._own()
+            crop_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+            self._build_table()
+        return crop_id
+
+    def _build_table(self):
+        n = len(self.names)
+        table = [[0.0] * n for _ in range(n)]
+        for i in range(1, n):
+            table[i][i] = self.MONOCULTURE
+        for (a, b), bonus in self.COMPANIONS.items():
+            if a in self._ids and b in self._ids:
+                table[self._ids[a]][self._ids[b]] = table[self._ids[b]][self._ids[a]] = bonus
+        self.table = np.array(table) if self.use_numpy else table
+
+    def _write(self, plot_index: int, crop_id: int):
+        row, col = divmod(plot_index, self.width)
+        if self.use_numpy:
+            self.grid[row + 1, col + 1] = crop_id
+        else:
+            self.grid[(row + 1) * (self.width + 2) + col + 1] = crop_id
+
+    def set_crop(self, plot_index: int, key: Optional[str]):
+        crop_id = self._intern(key) if key else 0
+        self._own()
+        self._write(plot_index, crop_id)
+        if not self._stale:
+            self._dirty.add(plot_index)
+
+    def _compute(self, r0: int, r1: int, c0: int, c1: int):
+        """Recalcula os modificadores das linhas [r0, r1) e colunas [c0, c1)."""
+        if self.use_numpy:
+            grid, table = self.grid, self.table.ravel()
+            center = grid[r0 + 1:r1 + 1, c0 + 1:c1 + 1]
+            row_base = center * len(self.names)
+            # Um termo por peso distinto do kernel: soma as consultas ao par e multiplica uma vez
+            totals: Dict[float, Any] = {}
+            for dr, dc, weight in self.KERNEL:
+                neighbor = grid[r0 + 1 + dr:r1 + 1 + dr, c0 + 1 + dc:c1 + 1 + dc]
+                lookup = table.take(row_base + neighbor)
+                if weight in totals:
+                    totals[weight] += lookup
+                else:
+                    totals[weight] = lookup
+            total = sum(weight * values for weight, values in totals.items())
+            result = np.maximum(1.0 + total / 100.0, self.MIN_MODIFIER)
+            result[center == 0] = 1.0
+            self.modifiers.reshape(self.height, self.width)[r0:r1, c0:c1] = result
+            return
+        grid, table, stride = self.grid, self.table, self.width + 2
+        for row in range(r0, r1):
+            for col in range(c0, c1):
+                at = (row + 1) * stride + col + 1
+                center = grid[at]
+                modifier = 1.0
+                if center:
+                    row_table = table[center]
+                    total = sum(weight * row_table[grid[at + dr * stride + dc]] for dr, dc, weight in self.KERNEL)
+                    modifier = max(1.0 + total / 100.0, self.MIN_MODIFIER)
+                self.modifiers[row * self.width + col] = modifier
+
+    def refresh(self):
+        if not self._stale and not self._dirty:
+            return
+        self._own()
+        if self._stale or len(self._dirty) > self.FULL_RECOMPUTE_FRACTION * self.size:
+            self._compute(0, self.height, 0, self.width)
+        else:
+            for plot_index in self._dirty:
+                row, col = divmod(plot_index, self.width)
+                self._compute(max(row - 1, 0), min(row + 2, self.height),
+                              max(col - 1, 0), min(col + 2, self.width))
+        self._dirty.clear()
+        self._stale = False
+
+    def modifier(self, plot_index: int) -> float:
+        self.refresh()
+        return float(self.modifiers[plot_index])
+
+    def modifiers_for(self, plot_indices: List[int]) -> List[float]:
+        self.refresh()
+        if self.use_numpy:
+            return self.modifiers[np.asarray(plot_indices, dtype=np.int64)].tolist()
+        return [self.modifiers[i] for i in plot_indices]
+
+class PestSystem:
+    """Pragas que se espalham como um autômato celular sobre a grade de lotes.
+
+    A cada dia só a fronteira (lotes infectados com algum vizinho plantado e ainda sadio)
+    tenta contaminar os vizinhos, então o passo custa O(borda da infestação), não O(fazenda).
+    A perda da colheita fica agendada por dia; tratar cancela a infecção.
+    """
+    SPREAD_CHANCE = 0.35
+    KILL_DAYS = 3
+    TREATMENT_COST = 5
+    SUSCEPTIBILITY = {'wheat': 1.2, 'corn': 1.0, 'pumpkin': 0.8, 'carrot': 0.9,
+                      'eggplant': 1.1, 'blueberry': 1.3, 'lazy_ghost': 0.0}
+    # Por índice de WeatherSystem.WEATHER_TYPES: chuva e vento espalham mais
+    WEATHER_FACTORS = (0.7, 1.5, 1.1, 1.3)
+
+    def __init__(self, farm: 'FarmSystem'):
+        self.farm = farm
+        self.day = 1
+        self.infected: Dict[int, int] = {}
+        self.frontier: set = set()
+        self._deaths: Dict[int, List[int]] = {}
+        self._mask: Any = None
+        self._shared = False
+        self.rng = RandomStream.unseeded()
+
+    def __len__(self) -> int:
+        return len(self.infected)
+
+    def fork(self, farm: 'FarmSystem') -> 'PestSystem':
+        other = PestSystem.__new__(PestSystem)
+        other.__dict__.update(self.__dict__)
+        other.farm = farm
+        other._shared = self._shared = True
+        return other
+
+    def _own(self):
+        if self._shared:
+            self.infected, self.frontier = dict(self.infected), set(self.frontier)
+            self._deaths = {day: list(plots) for day, plots in self._deaths.items()}
+            self._mask = copy.copy(self._mask)
+            self._shared = False
+
+    def _grid(self) -> Tuple[Any, Any, int]:
+        """Grade de ids de cultura (da camada de vizinhança) e máscara de infecção, ambas com borda."""
+        layer = self.farm.adjacency
+        stride = layer.width + 2
+        if self._mask is None:
+            cells = (layer.height + 2) * stride
+            self._mask = np.zeros(cells, dtype=np.uint8) if layer.use_numpy else bytearray(cells)
+            for plot_index in self.infected:
+                self._mask[self._position(plot_index, layer.width)] = 1
+        crops = layer.grid.ravel() if layer.use_numpy else layer.grid
+        return crops, self._mask, stride
+
+    @staticmethod
+    def _position(plot_index: int, width: int) -> int:
+        row, col = divmod(plot_index, width)
+        return (row + 1) * (width + 2) + col + 1
+
+    def _infect(self, plot_index: int, day: int):
+        self.infected[plot_index] = day
+        self.frontier.add(plot_index)
+        self._deaths.setdefault(day + self.KILL_DAYS, []).append(plot_index)
+        if self._mask is not None:
+            self._mask[self._position(plot_index, self.farm.adjacency.width)] = 1
+
+    def seed(self, count: int) -> int:
+        """Infecta até `count` lotes plantados e sadios, sorteados."""
+        candidates = [i for i in self.farm.occupied_plots() if i not in self.infected]
+        chosen = self.rng.sample(candidates, min(count, len(candidates)))
+        self._own()
+        for plot_index in chosen:
+            self._infect(plot_index, self.day)
+        return len(chosen)
+
+    def _spread_chances(self, plot_indices: List[int], crop_ids: List[int], weather: 'WeatherSystem') -> List[float]:
+        names = self.farm.adjacency.names
+        regions = weather.regions
+        return [self.SPREAD_CHANCE * self.SUSCEPTIBILITY.get(names[crop_id], 1.0)
+                * self.WEATHER_FACTORS[regions[min(plot_index // FarmSystem.REGION_SIZE, len(regions) - 1)]]
+                for plot_index, crop_id in zip(plot_indices, crop_ids)]
+
+    def step(self, day: int, weather: 'WeatherSystem') -> int:
+        """Avança a infestação para `day`; retorna quantas plantações as pragas destruíram."""
+        self.day = day
+        if not self.infected:
+            # Sem infectados, as mortes agendadas são todas de lotes já tratados
+            self._deaths = {}
+            return 0
+        self._own()
+        if self.frontier:
+            self._spread(weather)
+        lost = 0
+        for plot_index in self._deaths.pop(day, []):
+            if self.infected.get(plot_index) == day - self.KILL_DAYS:
+                self.farm.plots[plot_index] = Plot()
+                self.farm._mark_empty(plot_index)
+                lost += 1
+        return lost
+
+    def _spread(self, weather: 'WeatherSystem'):
+        crops, mask, stride = self._grid()
+        width = stride - 2
+        offsets = (-stride, stride, -1, 1)
+        if self.farm.adjacency.use_numpy:
+            front = np.fromiter(self.frontier, dtype=np.int64, count=len(self.frontier))
+            rows, cols = np.divmod(front, width)
+            positions = (rows + 1) * stride + cols + 1
+            targets = (positions[:, None] + np.array(offsets)).ravel()
+            healthy = (crops[targets] != 0) & (mask[targets] == 0)
+            targets = targets[healthy]
+            target_rows, target_cols = np.divmod(targets, stride)
+            plots = (target_rows - 1) * width + target_cols - 1
+            crop_ids = crops[targets]
+            names = self.farm.adjacency.names
+            susceptibility = np.array([self.SUSCEPTIBILITY.get(name, 1.0) for name in names])
+            regions = weather.regions
+            region_ids = np.minimum(plots // FarmSystem.REGION_SIZE, len(regions) - 1).tolist()
+            factors = np.asarray(self.WEATHER_FACTORS)[[regions[r] for r in region_ids]]
+            chances = self.SPREAD_CHANCE * susceptibility[crop_ids] * factors
+            new_plots = np.unique(plots[np.asarray(self.rng.draws(len(plots))) < chances]).tolist()
+        else:
+            targets = []
+            for plot_index in self.frontier:
+                position = self._position(plot_index, width)
+                for offset in offsets:
+                    neighbor = position + offset
+                    if crops[neighbor] and not mask[neighbor]:
+                        targets.append(neighbor)
+            plots = [(t // stride - 1) * width + t % stride - 1 for t in targets]
+            chances = self._spread_chances(plots, [crops[t] for t in targets], weather)
+            draws = self.rng.draws(len(plots))
+            new_plots = sorted({p for p, chance, u in zip(plots, chances, draws) if u < chance})
+        old_frontier = list(self.frontier)
+        for plot_index in new_plots:
+            self._infect(plot_index, self.day)
+        # Sai da fronteira quem não tem mais vizinho plantado e sadio
+        for plot_index in old_frontier:
+            position = self._position(plot_index, width)
+            if not any(crops[position + o] and not mask[position + o] for o in offsets):
+                self.frontier.discard(plot_index)
+
+    def _neighbors(self, plot_index: int) -> List[int]:
+        width = self.farm.adjacency.width
+        row, col = divmod(plot_index, width)
+        size = len(self.farm.plots)
+        result = []
+        if row > 0:
+            result.append(plot_index - width)
+        if plot_index + width < size:
+            result.append(plot_index + width)
+        if col > 0:
+            result.append(plot_index - 1)
+        if col < width - 1 and plot_index + 1 < size:
+            result.append(plot_index + 1)
+        return result
+
+    def _clear(self, plot_index: int, still_planted: bool):
+        self._own()
+        del self.infected[plot_index]
+        self.frontier.discard(plot_index)
+        if self._mask is not None:
+            self._mask[self._position(plot_index, self.farm.adjacency.width)] = 0
+        if still_planted:
+            self.planted(plot_index)
+
+    def removed(self, plot_index: int):
+        """Lote esvaziado (colhido ou destruído): a infecção vai junto."""
+        if plot_index in self.infected:
+            self._clear(plot_index, still_planted=False)
+
+    def planted(self, plot_index: int):
+        """Um lote sadio com cultura volta a ser alvo: os vizinhos infectados voltam à fronteira."""
+        if self.infected:
+            for neighbor in self._neighbors(plot_index):
+                if neighbor in self.infected and neighbor not in self.frontier:
+                    self._own()
+                    self.frontier.add(neighbor)
+
+    def treat(self, plot_indices: List[int]) -> int:
+        """Trata um lote de plantações infectadas de uma vez; retorna quantas foram curadas."""
+        treated = [i for i in plot_indices if i in self.infected]
+        for plot_index in treated:
+            self._clear(plot_index, still_planted=True)
+        return len(treated)
+
+    def treatment_order(self) -> List[int]:
+        """Infectados da fronteira primeiro: são os que ainda podem espalhar a praga."""
+        return list(self.frontier) + [i for i in self.infected if i not in self.frontier]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'day': self.day, 'infected': sorted(self.infected.items())}
+
+    def load(self, data: Dict[str, Any]):
+        rng = self.rng
+        self.__init__(self.farm)
+        self.rng = rng
+        self.day = data['day']
+        for plot_index, day in data['infected']:
+            self._infect(plot_index, day)
+
+class GrowthTimeline:
+    """Taxa de crescimento constante por trechos ao longo do tempo real, uma por região.
+
+    O progresso de um lote é a integral da taxa da sua região desde o plantio dividida pelo
+    tempo de crescimento. Todas as regiões mudam de trecho nos mesmos instantes, então
+    `starts` é comum e `rates`/`cumulative` guardam uma linha de `regions` valores por trecho.
+    Como os trechos só entram no fim (o tempo só anda para frente), `at()` é O(log n) por
+    bisect e `set_rates()` é O(regiões). Antes do primeiro trecho a taxa é 1, então uma
+    linha do tempo vazia é o relógio comum.
+    """
+    SEASON_RATES = {'spring': 1.0, 'summer': 1.1, 'autumn': 0.9, 'winter': 0.75}
+    DROUGHT_RATE = 0.85
+
+    def __init__(self, regions: int = 1):
+        self.regions = regions
+        self.starts = array('d')
+        self.rates = array('d')
+        # cumulative[k * regions + r] = integral da taxa da região r até starts[k] (segundos "efetivos")
+        self.cumulative = array('d')
+        self._shared = False
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def fork(self) -> 'GrowthTimeline':
+        other = GrowthTimeline.__new__(GrowthTimeline)
+        other.regions = self.regions
+        other.starts, other.rates, other.cumulative = self.starts, self.rates, self.cumulative
+        other._shared = self._shared = True
+        return other
+
+    def _own(self):
+        if self._shared:
+            self.starts, self.rates, self.cumulative = array('d', self.starts), array('d', self.rates), array('d', self.cumulative)
+            self._shared = False
+
+    @property
+    def rate(self) -> float:
+        return self.rate_of(0)
+
+    def rate_of(self, region: int = 0) -> float:
+        return self.rates[len(self.rates) - self.regions + region] if self.rates else 1.0
+
+    def current(self) -> List[float]:
+        """Taxa atual de cada região."""
+        return self.rates[-self.regions:].tolist() if self.rates else [1.0] * self.regions
+
+    def set_rate(self, when: datetime, rate: float):
+        self.set_rates(when, [rate] * self.regions)
+
+    def set_rates(self, when: datetime, rates: List[float]):
+        self._set_rates(when.timestamp(), rates)
+
+    def _set_rates(self, t: float, rates: List[float]):
+        if self.current() == list(rates):
+            return
+        self._own()
+        regions = self.regions
+        if self.starts and t <= self.starts[-1]:
+            # Duas mudanças no mesmo instante (ou relógio que voltou): vale a última
+            self.rates[-regions:] = array('d', rates)
+            return
+        if self.starts:
+            offset, elapsed = len(self.rates) - regions, t - self.starts[-1]
+            row = [self.cumulative[offset + r] + self.rates[offset + r] * elapsed for r in range(regions)]
+        else:
+            row = [t] * regions
+        self.cumulative.extend(row)
+        self.starts.append(t)
+        self.rates.extend(rates)
+
+    def _rate_at(self, t: float, region: int = 0) -> float:
+        k = bisect.bisect_right(self.starts, t) - 1
+        return self.rates[k * self.regions + region] if k >= 0 else 1.0
+
+    def follow(self, base: 'GrowthTimeline', since: float, until: float, factors: List[float]):
+        """Preenche [since, until) com a taxa de `base` (uma região) vezes `factors` por região,
+        abrindo um trecho em `since` e em cada mudança de `base` dentro do intervalo."""
+        changes = base.starts[bisect.bisect_right(base.starts, since):bisect.bisect_left(base.starts, until)]
+        for t in [since, *changes]:
+            rate = base._rate_at(t)
+            self._set_rates(t, [rate * factor for factor in factors])
+
+    def _integral(self, t: float, region: int = 0) -> float:
+        k = bisect.bisect_right(self.starts, t) - 1
+        if k < 0:
+            # Antes do primeiro trecho guardado o relógio anda a taxa 1
+            return t if not self.starts else self.cumulative[region] - (self.starts[0] - t)
+        i = k * self.regions + region
+        return self.cumulative[i] + self.rates[i] * (t - self.starts[k])
+
+    def at(self, when: datetime, region: int = 0) -> float:
+        """Relógio efetivo em `when`: a diferença entre dois instantes é o crescimento entre eles."""
+        return self._integral(when.timestamp(), region)
+
+    def elapsed(self, since: datetime, until: datetime, region: int = 0) -> float:
+        if not self.starts:
+            return (until - since).total_seconds()
+        return self.at(until, region) - self.at(since, region)
+
+    def prune(self, before: Optional[datetime] = None):
+        """Descarta os trechos que terminaram antes de `before` (nenhum lote os consulta mais);
+        sem `before`, fica só o trecho atual."""
+        k = bisect.bisect_right(self.starts, before.timestamp()) - 1 if before else len(self.starts) - 1
+        if k > 0:
+            self._own()
+            del self.starts[:k]
+            del self.rates[:k * self.regions]
+            del self.cumulative[:k * self.regions]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'regions': self.regions, 'starts': list(self.starts),
+                'rates': list(self.rates), 'cumulative': list(self.cumulative)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], regions: Optional[int] = None) -> 'GrowthTimeline':
+        """Restaura a linha do tempo; uma linha de região única vira `regions` regiões iguais."""
+        stored = data.get('regions', 1)
+        timeline = cls(regions or stored)
+        repeat = timeline.regions if stored == 1 else 1
+        if 'cumulative' in data:
+            timeline.starts = array('d', data['starts'])
+            timeline.rates = array('d', (rate for rate in data['rates'] for _ in range(repeat)))
+            timeline.cumulative = array('d', (value for value in data['cumulative'] for _ in range(repeat)))
+            return timeline
+        for start, rate in zip(data['starts'], data['rates']):
+            timeline._set_rates(start, [rate] * timeline.regions)
+        return timeline
+
+class GrowthSnapshot:
+    """Progresso de todos os lotes ocupados num único instante (o de um quadro ou de uma ação).
+
+    Vale enquanto o PlotStore estiver na mesma versão; quadro e colheita leem daqui
+    em vez de consultar o relógio lote a lote.
+    """
+    __slots__ = ('now', 'version', 'progress', 'ready', 'rates')
+
+    def __init__(self, farm: 'FarmSystem', now: datetime):
+        self.now = now
+        self.version = farm.plots.version
+        plots = farm.plots
+        growth = farm.growth
+        progress: Dict[int, float] = {}
+        ready: List[int] = []
+        # Relógio efetivo de cada região no instante do tique, calculado uma vez por região
+        effective_now: Dict[int, float] = {}
+        for plot_idx in farm._occupied:
+            plot = plots[plot_idx]
+            if plot.planted_at is None:
+                value = 0.0
+            else:
+                region = farm.region_of(plot_idx)
+                if region not in effective_now:
+                    effective_now[region] = growth.at(now, region)
+                value = min(1.0, (effective_now[region] - growth.at(plot.planted_at, region)) / plot.crop.growth_time)
+            progress[plot_idx] = value
+            if value >= 1.0:
+                ready.append(plot_idx)
+        self.progress = progress
+        self.ready = ready
+        self.rates = growth.current()
+
+    def progress_of(self, plot_index: int) -> float:
+        return self.progress.get(plot_index, 0.0)
+
+    def seconds_until_ready(self, plot_index: int, crop: Crop) -> float:
+        """Segundos reais até a colheita, supondo que a taxa atual continue valendo."""
+        rate = self.rates[plot_index // FarmSystem.REGION_SIZE]
+        return max(0.0, (1.0 - self.progress_of(plot_index)) * crop.growth_time / rate)
+
 class FarmSystem(ISerializable):
+    REGION_SIZE = 9
+
     def __init__(self, size: int = 9):
-        self.plots = [Plot() for _ in range(size)]
+        self.plots = PlotStore([Plot() for _ in range(size)])
+        # Índice de lotes ocupados: lista densa + mapa de posição (O(1) para inserir/remover/sortear)
+        self._occupied: List[int] = []
+        self._occupied_pos: Dict[int, int] = {}
+        self._occupied_shared = False
+        self._adjacency: Optional[AdjacencyLayer] = None
+        self.pests = PestSystem(self)
+        # (versão do PlotStore, dict serializado): refeito só quando algum lote mudou
+        self._dict_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._tick: Optional[datetime] = None
+        self._snapshot: Optional[GrowthSnapshot] = None
+        # Taxa de crescimento de cada região (estação, efeitos e clima); o GameState a atualiza
+        self.growth = GrowthTimeline(self.region_count)
+        self.rng = RandomStream.unseeded()
+
+    def tick(self, now: Optional[datetime] = None) -> GrowthSnapshot:
+        """Lê o relógio uma vez para o quadro ou ação que começa e avalia todos os lotes."""
+        self._tick = now or datetime.now()
+        self._snapshot = None
+        return self.snapshot()
+
+    def snapshot(self) -> GrowthSnapshot:
+        """Avaliação do tique atual; refeita no mesmo instante se algum lote mudou desde então."""
+        if self._tick is None:
+            return self.tick()
+        if self._snapshot is None or self._snapshot.version != self.plots.version:
+            self._snapshot = GrowthSnapshot(self, self._tick)
+        return self._snapshot
+
+    def fork(self) -> 'FarmSystem':
+        other = FarmSystem.__new__(FarmSystem)
+        other.__dict__.update(self.__dict__)
+        other.plots = self.plots.fork()
+        other.growth = self.growth.fork()
+        if self._adjacency is not None:
+            other._adjacency = self._adjacency.fork()
+        other.pests = self.pests.fork(other)
+        other._occupied_shared = self._occupied_shared = True
+        return other
+
+    def _own_occupied(self):
+        if self._occupied_shared:
+            self._occupied = list(self._occupied)
+            self._occupied_pos = dict(self._occupied_pos)
+            self._occupied_shared = False
+
+    @property
+    def region_count(self) -> int:
+        return (len(self.plots) + self.REGION_SIZE - 1) // self.REGION_SIZE
+
+    def region_of(self, plot_index: int) -> int:
+        return plot_index // self.REGION_SIZE
+
+    @property
+    def width(self) -> int:
+        """Colunas da grade de lotes (a mesma da camada de vizinhança)."""
+        return math.isqrt(max(len(self.plots), 1) - 1) + 1
+
+    @property
+    def adjacency(self) -> AdjacencyLayer:
+        """Camada de vizinhança, construída na primeira consulta e mantida incrementalmente."""
+        if self._adjacency is None:
+            self._adjacency = AdjacencyLayer.from_farm(self)
+        return self._adjacency
+
+    def _mark_occupied(self, plot_index: int):
+        if plot_index not in self._occupied_pos:
+            self._own_occupied()
+            self._occupied_pos[plot_index] = len(self._occupied)
+            self._occupied.append(plot_index)
+
+    def _mark_empty(self, plot_index: int):
+        if plot_index not in self._occupied_pos:
+            return
+        if self._adjacency is not None:
+            self._adjacency.set_crop(plot_index, None)
+        self.pests.removed(plot_index)
+        self._own_occupied()
+        pos = self._occupied_pos.pop(plot_index)
+        last = self._occupied.pop()
+        if last != plot_index:
+            self._occupied[pos] = last
+            self._occupied_pos[last] = pos
+
+    def _rebuild_occupied(self):
+        self._occupied = [i for i, plot in enumerate(self.plots) if not plot.is_empty]
+        self._occupied_pos = {plot_idx: pos for pos, plot_idx in enumerate(self._occupied)}
+        self._occupied_shared = False
+        self._adjacency = None
+
+    @property
+    def occupied_count(self) -> int:
+        return len(self._occupied)
+
+    def occupied_plots(self) -> List[int]:
+        return list(self._occupied)
     
-    def plant_crop(self, plot_index: int, crop: Crop):
+    def plant_crop(self, plot_index: int, crop: Crop, now: Optional[datetime] = None):
         if 0 <= plot_index < len(self.plots):
-            self.plots[plot_index].plant(crop)
+            self.plots.mutable(plot_index).plant(crop, now)
+            self._mark_occupied(plot_index)
+            if self._adjacency is not None:
+                self._adjacency.set_crop(plot_index, crop.key)
+            self.pests.planted(plot_index)
     
-    def harvest_ready_crops(self) -> int:
+    def harvest_ready_crops(self, now: Optional[datetime] = None) -> int:
+        """Colhe o que está pronto no tique atual (ou em `now`, que abre um tique novo)."""
+        snapshot = self.tick(now) if now is not None else self.snapshot()
+        now, ready = snapshot.now, snapshot.ready
+        if not ready:
+            return 0
+        # Os modificadores valem para a grade de antes da colheita, não para a que vai esvaziando
+        modifiers = self.adjacency.modifiers_for(ready)
         total = 0
-        for plot in self.plots:
-            if not plot.is_empty and plot.is_ready:
-                total += plot.harvest()
+        for plot_idx, modifier in zip(ready, modifiers):
+            total += round(self.plots.mutable(plot_idx).harvest(now, self.growth, self.region_of(plot_idx)) * modifier)
+            self._mark_empty(plot_idx)
         return total
     
     def get_plot_status(self, plot_index: int) -> Tuple[Optional[Crop], float]:
         if 0 <= plot_index < len(self.plots):
-            plot = self.plots[plot_index]
-            return plot.crop, plot.growth_progress
+            return self.plots[plot_index].crop, self.snapshot().progress_of(plot_index)
         return None, 0.0
     
     def damage_random_crop(self):
-        occupied_plots = [i for i, plot in enumerate(self.plots) if not plot.is_empty]
-        if occupied_plots:
-            plot_idx = random.choice(occupied_plots)
+        if self._occupied:
+            plot_idx = self.rng.choice(self._occupied)
             self.plots[plot_idx] = Plot()
+            self._mark_empty(plot_idx)
             return "A storm came! Some crops were damaged."
         return None
     
-    def apply_growth_bonus(self, bonus_percent: float):
-        for plot in self.plots:
-            if not plot.is_empty and plot.planted_at:
-                bonus_time = plot.crop.growth_time * (bonus_percent / 100)
-                plot.planted_at -= timedelta(seconds=bonus_time)
-        return "Sunny day bonus! Crops grow faster today."
+    def prune_growth(self):
+        """Esquece os trechos de taxa anteriores ao plantio mais antigo ainda no campo."""
+        planted = [self.plots[plot_idx].planted_at for plot_idx in self._occupied]
+        oldest = min((when for when in planted if when is not None), default=None)
+        self.growth.prune(oldest)
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'plots': [plot.to_dict() for plot in self.plots]
-        }
+        if self._dict_cache is None or self._dict_cache[0] != self.plots.version:
+            self._dict_cache = (self.plots.version, {'plots': [plot.to_dict() for plot in self.plots]})
+        return self._dict_cache[1]
+
+    def iter_json(self):
+        yield '{"plots": '
+        yield from self.plots.iter_json()
+        yield "}"
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FarmSystem':
         farm = cls(size=len(data['plots']))
-        farm.plots = [Plot.from_dict(plot_data) for plot_data in data['plots']]
+        # Lotes com a mesma cultura passam a compartilhar o objeto Crop (e o seu JSON em cache)
+        crops: Dict[str, Crop] = {}
+        plots = []
+        for plot_data in data['plots']:
+            plot = Plot.from_dict(plot_data)
+            if plot.crop:
+                key = json.dumps(plot_data['crop'], sort_keys=True)
+                plot.crop = crops.setdefault(key, plot.crop)
+            plots.append(plot)
+        farm.plots = PlotStore(plots)
+        farm._rebuild_occupied()
         return farm
 
 class CropSystem(ISerializable):
+    DEFAULT_CROPS = ('wheat', 'corn', 'pumpkin', 'carrot', 'eggplant', 'blueberry', 'lazy_ghost')
+
+    _catalog: Optional[MappingProxyType] = None
+    _keys_by_name: Optional[Dict[str, str]] = None
+
     def __init__(self):
-        self.available_crops = self._load_default_crops()
+        self.available_crops = self.catalog()
         self.unlocked_crops = ['wheat']
+
+    @classmethod
+    def catalog(cls) -> MappingProxyType:
+        """Catálogo de culturas compartilhado (somente leitura) por todos os jogos do processo."""
+        if cls._catalog is None:
+            cls._catalog = MappingProxyType(cls._load_default_crops())
+        return cls._catalog
     
-    def _load_default_crops(self) -> Dict[str, Crop]:
-        return {
+    @staticmethod
+    def _load_default_crops() -> Dict[str, Crop]:
+        crops = {
             'wheat': Crop('wheat', 10, 10, 20, 'yellow', 0.5),
             'corn': Crop('corn', 20, 20, 45, 'bright_yellow', 0.5),
             'pumpkin': Crop('pumpkin', 40, 40, 100, 'orange', 1.0),
             'carrot': Crop('carrot', 15, 12, 25, 'orange', 0.5),
             'eggplant': Crop('eggplant', 35, 30, 70, 'purple', 1.0),
             'blueberry': Crop('blueberry', 60, 35, 90, 'blue', 1.0),
-            'lazy_ghost': Crop('lazy ghost seed [rare]', 0, 30, 100, 'white', 0),
+            'lazy_ghost': Crop('lazy ghost seed [rare]', 0, 30, 100, 'white', 0, key='lazy_ghost'),
         }
+        crops.update(ContentCatalog.get().crops)
+        return crops
+
+    @classmethod
+    def key_for(cls, name: str) -> str:
+        """Chave de catálogo de uma cultura salva sem chave (saves antigos guardavam só o nome)."""
+        if cls._keys_by_name is None:
+            cls._keys_by_name = {crop.name: key for key, crop in cls.catalog().items()}
+        return cls._keys_by_name.get(name, name)
     
     def get_crop(self, name: str) -> Optional[Crop]:
         return self.available_crops.get(name)
@@ -242,43 +1460,220 @@ class CropSystem(ISerializable):
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'CropSystem':
         system = cls()
-        system.unlocked_crops = data['unlocked_crops']
+        system.unlocked_crops = list(data['unlocked_crops'])
         return system
 
 class WeatherSystem(IGameSystem):
     WEATHER_TYPES = ['sunny', 'rainy', 'cloudy', 'windy']
-    
-    def __init__(self):
-        self.current_weather = 'sunny'
-    
-    def update(self):
-        if random.random() < 0.2:
-            self.current_weather = random.choice(self.WEATHER_TYPES)
-    
-    def get_weather(self) -> str:
-        return self.current_weather
-    
+
+    # Cadeia de Markov: linha = clima de hoje, coluna = clima de amanhã (ordem de WEATHER_TYPES)
+    TRANSITIONS = {
+        'spring': [[0.55, 0.20, 0.15, 0.10],
+                   [0.25, 0.45, 0.20, 0.10],
+                   [0.30, 0.30, 0.30, 0.10],
+                   [0.30, 0.15, 0.25, 0.30]],
+        'summer': [[0.70, 0.10, 0.10, 0.10],
+                   [0.40, 0.30, 0.20, 0.10],
+                   [0.45, 0.15, 0.30, 0.10],
+                   [0.45, 0.10, 0.15, 0.30]],
+        'autumn': [[0.40, 0.20, 0.25, 0.15],
+                   [0.20, 0.40, 0.25, 0.15],
+                   [0.25, 0.25, 0.35, 0.15],
+                   [0.20, 0.20, 0.20, 0.40]],
+        'winter': [[0.35, 0.15, 0.35, 0.15],
+                   [0.15, 0.35, 0.35, 0.15],
+                   [0.20, 0.20, 0.45, 0.15],
+                   [0.15, 0.15, 0.30, 0.40]],
+    }
+
+    GROWTH_MODIFIERS = {'sunny': 1.1, 'rainy': 1.25, 'cloudy': 1.0, 'windy': 0.9}
+    # Multiplicador da taxa de crescimento por índice de clima
+    MODIFIERS = list(map(GROWTH_MODIFIERS.get, WEATHER_TYPES))
+
+    _cumulative_cache: Dict[str, List[List[float]]] = {}
+    _compose: Any = None
+
+    def __init__(self, region_count: int = 1):
+        # A lista é sempre substituída, nunca alterada no lugar: forks do GameState a compartilham
+        self.regions = [0] * max(1, region_count)
+        self.rng = RandomStream.unseeded()
+
+    @property
+    def current_weather(self) -> str:
+        return self.WEATHER_TYPES[self.regions[0]]
+
+    @current_weather.setter
+    def current_weather(self, weather: str):
+        self.regions = [self.WEATHER_TYPES.index(weather)] + self.regions[1:]
+
+    @classmethod
+    def _cumulative(cls, season: str) -> List[List[float]]:
+        rows = cls._cumulative_cache.get(season)
+        if rows is None:
+            rows = []
+            for row in cls.TRANSITIONS[season]:
+                acc, cum = 0.0, []
+                for p in row:
+                    acc += p
+                    cum.append(acc)
+                cum[-1] = 1.0
+                rows.append(cum)
+            cls._cumulative_cache[season] = rows
+        return rows
+
+    def update(self, season: str = 'spring'):
+        rows = self._cumulative(season)
+        draws = self.rng.draws(len(self.regions))
+        self.regions = [bisect.bisect_right(rows[state], u) for state, u in zip(self.regions, draws)]
+
+    def resize(self, region_count: int):
+        region_count = max(1, region_count)
+        if region_count > len(self.regions):
+            self.regions = self.regions + [self.regions[0]] * (region_count - len(self.regions))
+        else:
+            self.regions = self.regions[:region_count]
+
+    def get_weather(self, region: int = 0) -> str:
+        return self.WEATHER_TYPES[self.regions[region]]
+
+    def growth_modifier(self, region: int = 0) -> float:
+        return self.GROWTH_MODIFIERS[self.get_weather(region)]
+
+    @staticmethod
+    def _matmul(a: List[List[float]], b: List[List[float]]) -> List[List[float]]:
+        size = len(a)
+        return [[sum(a[i][k] * b[k][j] for k in range(size)) for j in range(size)] for i in range(size)]
+
+    @classmethod
+    def _matpow(cls, matrix: List[List[float]], power: int) -> List[List[float]]:
+        size = len(matrix)
+        result = [[1.0 if i == j else 0.0 for j in range(size)] for i in range(size)]
+        while power:
+            if power & 1:
+                result = cls._matmul(result, matrix)
+            matrix = cls._matmul(matrix, matrix)
+            power >>= 1
+        return result
+
+    @classmethod
+    def transition_over(cls, start_day: int, days: int) -> List[List[float]]:
+        """Matriz de transição acumulada de start_day até start_day + days (potências por estação).
+
+        Como em `update`, a transição para um dia usa a estação do dia em que se entra.
+        """
+        size = len(cls.WEATHER_TYPES)
+        result = [[1.0 if i == j else 0.0 for j in range(size)] for i in range(size)]
+        day = start_day + 1
+        end = start_day + days + 1
+        while day < end:
+            season_end = ((day - 1) // 30 + 1) * 30 + 1
+            steps = min(end, season_end) - day
+            season = TimeSystem.season_for_day(day)
+            result = cls._matmul(result, cls._matpow(cls.TRANSITIONS[season], steps))
+            day += steps
+        return result
+
+    def fast_forward(self, start_day: int, days: int):
+        """Avança o clima de todas as regiões em `days` dias sem simular dia a dia."""
+        if days <= 0:
+            return
+        matrix = self.transition_over(start_day, days)
+        cumulative = []
+        for row in matrix:
+            acc, cum = 0.0, []
+            for p in row:
+                acc += p
+                cum.append(acc)
+            cum[-1] = 1.0
+            cumulative.append(cum)
+        draws = self.rng.draws(len(self.regions))
+        self.regions = [bisect.bisect_right(cumulative[state], u) for state, u in zip(self.regions, draws)]
+
+    @classmethod
+    def simulate_history(cls, initial: List[int], start_day: int, days: int,
+                         rng: RandomStream) -> List[List[int]]:
+        """Gera o clima dos dias start_day + 1 .. start_day + days para todas as regiões.
+
+        Retorna uma lista com uma linha por dia simulado, cada uma com o índice de clima
+        de todas as regiões. Os sorteios vêm todos de uma vez do fluxo, na mesma ordem
+        com ou sem NumPy, então os dois caminhos geram o mesmo histórico.
+        """
+        regions = len(initial)
+        if days <= 0:
+            return []
+        draws = rng.draws(days * regions)
+        if np is None or days * regions < RandomStream.NUMPY_BATCH:
+            state = list(initial)
+            history = []
+            for offset in range(days):
+                rows = cls._cumulative(TimeSystem.season_for_day(start_day + offset + 1))
+                row = draws[offset * regions:(offset + 1) * regions]
+                state = [bisect.bisect_right(rows[s], u) for s, u in zip(state, row)]
+                history.append(state)
+            return history
+
+        # Cada dia vira, por região, uma função clima de ontem -> clima de hoje; com quatro
+        # climas ela cabe num byte (2 bits por estado). A composição dos dias é uma varredura
+        # de prefixos por dobramento sobre a tabela de composição, sem laço por dia.
+        seasons = np.asarray([TimeSystem.SEASONS.index(TimeSystem.season_for_day(start_day + offset + 1))
+                              for offset in range(days)])
+        cumulative = np.asarray([cls._cumulative(season) for season in TimeSystem.SEASONS])[seasons]
+        draws = np.asarray(draws).reshape(days, regions)
+        size = len(cls.WEATHER_TYPES)
+        codes = np.zeros((days, regions), dtype=np.uint8)
+        for state in range(size):
+            nxt = np.zeros((days, regions), dtype=np.uint8)
+            for column in range(size - 1):
+                nxt += draws >= cumulative[:, state, column][:, None]
+            codes |= nxt << (2 * state)
+        compose = cls._compose_table()
+        step = 1
+        while step < days:
+            codes[step:] = compose[codes[step:], codes[:-step]]
+            step *= 2
+        shifts = 2 * np.asarray(initial, dtype=np.uint8)
+        return ((codes >> shifts[None, :]) & 3).tolist()
+
+    @classmethod
+    def _compose_table(cls) -> Any:
+        """compose[f, g] = código de "g, depois f" para funções de clima codificadas num byte."""
+        if cls._compose is None:
+            codes = np.arange(256)
+            states = np.arange(len(cls.WEATHER_TYPES))
+            digits = (codes[:, None] >> (2 * states)) & 3
+            composed = (codes[:, None, None] >> (2 * digits[None, :, :])) & 3
+            cls._compose = (composed << (2 * states)).sum(axis=2).astype(np.uint8)
+        return cls._compose
+
     def to_dict(self) -> Dict[str, Any]:
         return {
-            'current_weather': self.current_weather
+            'current_weather': self.current_weather,
+            'regions': [self.WEATHER_TYPES[r] for r in self.regions]
         }
-    
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'WeatherSystem':
-        system = cls()
-        system.current_weather = data['current_weather']
+        regions = data.get('regions') or [data['current_weather']]
+        system = cls(region_count=len(regions))
+        system.regions = [cls.WEATHER_TYPES.index(w) for w in regions]
         return system
 
 class TimeSystem(IGameSystem):
+    SEASONS = ["spring", "summer", "autumn", "winter"]
+
     def __init__(self):
         self.day = 1
-    
+
     def update(self):
         self.day += 1
-    
+
     def get_day(self) -> int:
         return self.day
-    
+
+    @classmethod
+    def season_for_day(cls, day: int) -> str:
+        return cls.SEASONS[(day - 1) // 30 % 4]
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             'day': self.day
@@ -295,12 +1690,13 @@ class EventSystem(IGameSystem):
         self.farm = farm
         self.player = player
         self.last_event_day = -1
+        self.rng = RandomStream.unseeded()
     
     def update(self, current_day: int):
-        base_chance = 0.4
-        if random.random() < base_chance and self.last_event_day != current_day:
+        base_chance = 0.8 if self.player.has_effect("increase_event_chance") else 0.4
+        if self.rng.random() < base_chance and self.last_event_day != current_day:
             self.last_event_day = current_day
-            event = random.choice([
+            events = [
                 self._storm_event,
                 self._sunny_bonus_event,
                 self._found_money_event,
@@ -314,9 +1710,18 @@ class EventSystem(IGameSystem):
                 self._night_robbery_event,
                 self._perfect_fishing_day_event,
                 self._rich_farmer_patron_event,
-                self._sugar_daddy_marriage_event
-            ])
-            return event()
+                self._sugar_daddy_marriage_event,
+                self._drought_event
+            ]
+            keys = [event.__name__[1:-len("_event")] for event in events]
+            for event in ContentCatalog.get().events:
+                events.append(partial(self._content_event, event))
+                keys.append(event['key'])
+            event_index = self.rng.randrange(len(events))
+            self.last_event_key = keys[event_index]
+            if hasattr(self, "game"):
+                self.game.telemetry.record(TelemetrySystem.EVENT, event_index)
+            return events[event_index]()
         return None
     def _rich_farmer_patron_event(self):
         amount = 500
@@ -328,14 +1733,28 @@ class EventSystem(IGameSystem):
         self.player.earn_money(amount)
         return "Farm life is tough… unless you marry rich! 💍 (+$3,000)"
     
+    def _content_event(self, event: Dict[str, Any]):
+        if event['money'] > 0:
+            self.player.earn_money(event['money'])
+        elif event['money'] < 0:
+            self.player.spend_money(min(-event['money'], self.player.money))
+        if event['stamina']:
+            self.player.restore_stamina(event['stamina'])
+        if event['growth_bonus'] and hasattr(self, "game"):
+            self.game.start_growth_bonus(event['growth_bonus'])
+        return event['message']
+
     def _storm_event(self):
         return self.farm.damage_random_crop()
     
     def _sunny_bonus_event(self):
-        return self.farm.apply_growth_bonus(20)
+        if hasattr(self, "game"):
+            self.game.start_growth_bonus(20)
+            return "Sunny day bonus! Crops grow faster today."
+        return None
     
     def _found_money_event(self):
-        amount = random.randint(10, 50)
+        amount = self.rng.randint(10, 50)
         self.player.earn_money(amount)
         return f"You found money on the ground! (+${amount})"
     
@@ -350,13 +1769,9 @@ class EventSystem(IGameSystem):
         return None
 
     def _plague_event(self):
-        damaged = 0
-        for _ in range(2):
-            result = self.farm.damage_random_crop()
-            if result:
-                damaged += 1
-        if damaged:
-            return "A mysterious plague destroyed some crops!"
+        infected = self.farm.pests.seed(2)
+        if infected:
+            return f"A blight appeared on {infected} crop(s)! Treat them before it spreads."
         return None
 
     def _spirit_farmer_event(self):
@@ -366,22 +1781,20 @@ class EventSystem(IGameSystem):
         return "A benevolent spirit gifted you a Lazy Ghost Seed!"
 
     def _lazy_day_event(self):
-        if self.player.max_stamina > 1:
-            self.player.max_stamina -= 2
-            if self.player.stamina > self.player.max_stamina:
-                self.player.stamina = self.player.max_stamina
-            if hasattr(self, "game"):
-                self.game.lazy_day_active = True
-            return "You feel extremely lazy today... (-2 Max Hearts)"
+        if self.player.max_stamina > 1 and hasattr(self, "game"):
+            return self.game.start_effect("lazy_day", self.game.hours_until_next_day())
         return None
 
     def _starry_night_event(self):
-        return self.farm.apply_growth_bonus(100)
+        if hasattr(self, "game"):
+            self.game.start_growth_bonus(100)
+            return "Sunny day bonus! Crops grow faster today."
+        return None
 
     def _inflated_market_event(self):
         if hasattr(self, "game"):
-            self.game.market_inflated = True
-        return "Prices have doubled today! (Inflated Market)"
+            return self.game.start_effect("inflated_market", self.game.hours_until_next_day())
+        return None
 
     def _night_robbery_event(self):
         stolen = min(100, self.player.money)
@@ -390,104 +1803,302 @@ class EventSystem(IGameSystem):
 
     def _perfect_fishing_day_event(self):
         if hasattr(self, "game"):
-            self.game.fishing_bonus = True
-        return "The fish are biting! (+50% fish value today!)"
+            return self.game.start_effect("fishing_bonus", self.game.hours_until_next_day())
+        return None
+
+    def _drought_event(self):
+        if hasattr(self, "game") and not self.game.effect_active("drought"):
+            message = self.game.start_effect("drought", 3 * GameState.HOURS_PER_DAY)
+            return f"A drought settles over the valley for 3 days! {message}"
+        return None
+
+
+def run_adjacency_benchmark(side: int, changes: int):
+    crops = list(CropSystem().available_crops.values())
+    rng = random.Random(3)
+    farm = FarmSystem(side * side)
+    farm_size = side * side
+    for i in range(farm_size):
+        if rng.random() < 0.7:
+            farm.plant_crop(i, rng.choice(crops))
+    backend = "numpy" if farm.adjacency.use_numpy else "pure Python"
+    start = time.perf_counter()
+    farm.adjacency.refresh()
+    print(f"Full evaluation of {side}x{side} ({backend}): {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    for _ in range(changes):
+        farm.plant_crop(rng.randrange(farm_size), rng.choice(crops))
+    farm.adjacency.refresh()
+    elapsed = time.perf_counter() - start
+    print(f"{changes} plantings + incremental update: {elapsed:.3f}s ({elapsed / changes * 1e6:.1f} us each)")
+    ready = farm.occupied_plots()[:changes]
+    start = time.perf_counter()
+    farm.adjacency.modifiers_for(ready)
+    print(f"Modifier lookup for {len(ready)} harvests: {(time.perf_counter() - start) * 1e3:.2f}ms")
+
+
+# ==================== Telemetria ====================
+class TelemetrySystem:
+    """Série temporal das métricas de economia por dia, em um ring buffer de structs.
+
+    `record` só empacota o registro no buffer; a escrita em disco (JSON lines ou CSV)
+    acontece em lotes numa thread separada.
+    """
+    ENV_VAR = "TERMINAL_FARM_TELEMETRY"
+    RECORD = struct.Struct('<IBd')
+    METRICS = ['money', 'stamina', 'harvest', 'fish', 'purchase', 'event']
+    MONEY, STAMINA, HARVEST, FISH, PURCHASE, EVENT = range(6)
+
+    def __init__(self, path: Optional[str] = None, capacity: int = 65536, batch: int = 1024):
+        self.path = path
+        self.enabled = path is not None
+        self.day = 1
+        self.capacity = capacity
+        self.batch = min(batch, capacity)
+        self.dropped = 0
+        self._buffer = bytearray(capacity * self.RECORD.size if self.enabled else 0)
+        self._pack_into = self.RECORD.pack_into
+        self._head = 0
+        self._tail = 0
+        self._closed = False
+        self._wake = self._drain_lock = self._flusher = None
+        if self.enabled:
+            self._wake = threading.Event()
+            self._drain_lock = threading.Lock()
+            self._flusher = threading.Thread(target=self._flush_loop, name="telemetry-flush", daemon=True)
+            self._flusher.start()
+
+    @classmethod
+    def from_env(cls) -> 'TelemetrySystem':
+        return cls(os.environ.get(cls.ENV_VAR) or None)
+
+    def record(self, metric: int, value: float):
+        if not self.enabled:
+            return
+        head = self._head
+        if head - self._tail >= self.capacity:
+            self.dropped += 1
+            return
+        self._pack_into(self._buffer, (head % self.capacity) * self.RECORD.size, self.day, metric, value)
+        self._head = head + 1
+        if (head + 1) % self.batch == 0:
+            self._wake.set()
+
+    def flush(self):
+        if self.enabled:
+            self._drain()
+
+    def close(self):
+        if not self.enabled or self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._flusher.join()
+        self._drain()
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wake.wait(1.0)
+            self._wake.clear()
+            self._drain()
+
+    def _drain(self):
+        with self._drain_lock:
+            head = self._head
+            tail = self._tail
+            if head == tail:
+                return
+            size = self.RECORD.size
+            rows = []
+            for index in range(tail, head):
+                day, metric, value = self.RECORD.unpack_from(self._buffer, (index % self.capacity) * size)
+                rows.append((day, self.METRICS[metric], value))
+            self._tail = head
+            self._write(rows)
 
+    def _write(self, rows: List[Tuple[int, str, float]]):
+        as_csv = self.path.endswith('.csv')
+        new_file = not os.path.exists(self.path)
+        with open(self.path, 'a', newline='') as f:
+            if as_csv:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(['day', 'metric', 'value'])
+                writer.writerows(rows)
+            else:
+                f.writelines(json.dumps({'day': day, 'metric': metric, 'value': value}) + "\n"
+                             for day, metric, value in rows)
 
 # ==================== Sistema do Mercador ====================
+class ItemEffectRegistry:
+    """Tabela de efeitos de itens: cada efeito tem um handler e uma descrição para a loja."""
+
+    def __init__(self):
+        self._handlers: Dict[str, Callable[[Player], str]] = {}
+        self._descriptions: Dict[str, str] = {}
+
+    def register(self, effect: str, description: str = ""):
+        def decorator(handler: Callable[[Player], str]) -> Callable[[Player], str]:
+            self._handlers[effect] = handler
+            self._descriptions[effect] = description
+            return handler
+        return decorator
+
+    def __contains__(self, effect: str) -> bool:
+        return effect in self._handlers
+
+    @staticmethod
+    def effect_of(item: Dict[str, Any]) -> str:
+        if "unlocks" in item:
+            return f"unlock_{item['unlocks']}"
+        return item.get("effect", "")
+
+    def describe(self, effect: str) -> str:
+        return self._descriptions.get(effect, "")
+
+    def apply(self, effect: str, player: Player) -> str:
+        handler = self._handlers.get(effect)
+        return handler(player) if handler else "Item purchased."
+
+ITEM_EFFECTS = ItemEffectRegistry()
+
+@ITEM_EFFECTS.register("unlock_fishing", "Unlocks Fishing")
+def _unlock_fishing(player: Player) -> str:
+    return "You bought a fishing rod! Fishing is now available."
+
+@ITEM_EFFECTS.register("increase_event_chance", "Boosts daily events: 80% chance to occur each day!")
+def _increase_event_chance(player: Player) -> str:
+    return "You feel luckier already... (+Event Chance)"
+
+@ITEM_EFFECTS.register("increase_max_stamina", "Double your max stamina")
+def _increase_max_stamina(player: Player) -> str:
+    player.max_stamina += 4
+    player.stamina = player.max_stamina
+    return "Your soul feels stronger... (+4 Max Stamina)"
+
+@ITEM_EFFECTS.register("cosmetic", "Visual cosmetic item")
+def _cosmetic(player: Player) -> str:
+    return "Cosmetic item? In a CLI game? Bro... you deserved to lose that money. I'm sorry."
+
+@ITEM_EFFECTS.register("unlock_night_work", "Allow you to work at night")
+def _unlock_night_work(player: Player) -> str:
+    return "You bought a lantern! Now you can work through the night."
+
+@ITEM_EFFECTS.register("unlock_farmdex", "Discover buried fossils for the museum")
+def _unlock_farmdex(player: Player) -> str:
+    return "Every two days, you have a 75% chance to discover a buried fossil! Help the local museum build the greatest dinosaur collection in history!"
+
+@ITEM_EFFECTS.register("unlock_greenhouse", "A greenhouse: 6 plots, faster growth, no weather")
+def _unlock_greenhouse(player: Player) -> str:
+    return "You bought a greenhouse! Switch to it from the Fields menu."
+
+@ITEM_EFFECTS.register("unlock_orchard", "An orchard: 16 plots, slower growth, +30% harvest value")
+def _unlock_orchard(player: Player) -> str:
+    return "You bought an orchard! Switch to it from the Fields menu."
+
+@ITEM_EFFECTS.register("unlock_paddies", "Rice paddies: 12 plots, +15% harvest value")
+def _unlock_paddies(player: Player) -> str:
+    return "You bought rice paddies! Switch to them from the Fields menu."
+
 class MerchantSystem:
+    _catalog: Optional[MappingProxyType] = None
+
     def __init__(self, crop_system: CropSystem, player: Player):
         self.crop_system = crop_system
         self.player = player
-        self.fishing_unlocked = False
-
-        if "Skyfish" not in [fish["name"] for fish in getattr(self, "fish_types", [])]:
-            pass
-        if "lazy_ghost" not in self.crop_system.available_crops:
-            self.crop_system.available_crops["lazy_ghost"] = Crop('lazy_ghost', 0, 30, 100, 'white', 0)
+        self.game = None
+        self.inventory = self.catalog()
 
-        self.inventory = {
-            "seeds": {
-                "eggplant_seed": {"crop": "eggplant", "price": 80},
-                "blueberry_seed": {"crop": "blueberry", "price": 120}
-            },
-            "items": {
-                "farmdex_scanner": {"price": 300, "effect": "unlock_farmdex", "narrative": True},
-                "fishing_rod": {"price": 6666, "unlocks": "fishing"},
-                "golden_hat": {"price": 3333, "effect": "cosmetic", "narrative": True},
-                "lucky_egg": {"price": 5000, "effect": "increase_event_chance"},
-                "balatro_card": {"price": 7777, "effect": "increase_max_stamina"},
-                "lantern": {"price": 5000, "effect": "unlock_night_work"}
+    @classmethod
+    def catalog(cls) -> MappingProxyType:
+        """Estoque do mercador (com os pacotes de conteúdo), montado uma vez por processo."""
+        if cls._catalog is None:
+            inventory = {
+                "seeds": {
+                    "eggplant_seed": {"crop": "eggplant", "price": 80},
+                    "blueberry_seed": {"crop": "blueberry", "price": 120}
+                },
+                "items": {
+                    "farmdex_scanner": {"price": 300, "effect": "unlock_farmdex", "narrative": True},
+                    "fishing_rod": {"price": 6666, "unlocks": "fishing"},
+                    "golden_hat": {"price": 3333, "effect": "cosmetic", "narrative": True},
+                    "lucky_egg": {"price": 5000, "effect": "increase_event_chance"},
+                    "balatro_card": {"price": 7777, "effect": "increase_max_stamina"},
+                    "lantern": {"price": 5000, "effect": "unlock_night_work"},
+                    "greenhouse_deed": {"price": 1500, "unlocks": "greenhouse"},
+                    "orchard_deed": {"price": 4000, "unlocks": "orchard"},
+                    "paddies_deed": {"price": 6000, "unlocks": "paddies"}
+                }
             }
-        }
+            catalog = ContentCatalog.get()
+            inventory["seeds"].update(catalog.seeds)
+            inventory["items"].update(catalog.items)
+            cls._catalog = MappingProxyType({section: MappingProxyType(entries)
+                                             for section, entries in inventory.items()})
+        return cls._catalog
 
-    def is_available(self, part_of_day: str) -> bool:
+    @staticmethod
+    def is_available(part_of_day: str) -> bool:
         return part_of_day == "morning"
 
-    def buy_seed(self, seed_key: str) -> Optional[str]:
+    @property
+    def fishing_unlocked(self) -> bool:
+        return self.player.has_effect("unlock_fishing")
+
+    @property
+    def inflated(self) -> bool:
+        return bool(self.game and self.game.effect_active("inflated_market"))
+
+    def price_of(self, entry: Dict[str, Any]) -> int:
+        return entry["price"] * 2 if self.inflated else entry["price"]
+
+    def owns(self, item_key: str) -> bool:
+        return self.player.owns(item_key)
+
+    def buy_seed(self, seed_key: str) -> Tuple[bool, str]:
+        """Retorna (comprou, mensagem)."""
         if seed_key not in self.inventory["seeds"]:
-            return "Invalid seed."
+            return False, "Invalid seed."
 
         seed = self.inventory["seeds"][seed_key]
-        price = seed["price"]
-        if hasattr(self.player, "game") and getattr(self.player.game, 'market_inflated', False):
-            price *= 2
+        price = self.price_of(seed)
         if not self.player.can_afford(price):
-            return "Not enough money."
+            return False, "Not enough money."
 
         self.player.spend_money(price)
+        if self.game:
+            self.game.telemetry.record(TelemetrySystem.PURCHASE, price)
+            self.game.history.record(self.game.time_system.day, "purchase", -price, f"Bought {seed_key}")
         result = self.crop_system.unlock_crop(seed["crop"])
-        return result or f"{seed['crop'].capitalize()} is already unlocked."
+        return True, result or f"{seed['crop'].capitalize()} is already unlocked."
 
-    def buy_item(self, item_key: str) -> Optional[str]:
+    def buy_item(self, item_key: str) -> Tuple[bool, str]:
+        """Retorna (comprou, mensagem)."""
         if item_key not in self.inventory["items"]:
-            return "Invalid item."
+            return False, "Invalid item."
 
         item = self.inventory["items"][item_key]
+        if self.player.owns(item_key):
+            return False, "You already own this item."
+
+        price = self.price_of(item)
+        if not self.player.can_afford(price):
+            return False, "Not enough money."
 
-        if item.get("unlocks") == "fishing" and self.fishing_unlocked:
-            return "You already own this item."
-        if item.get("effect") == "increase_event_chance" and hasattr(self.player, "event_bonus") and self.player.event_bonus == "lucky_egg":
-            return "You already own this item."
-        if item.get("effect") == "increase_max_stamina" and self.player.max_stamina > 5:
-            return "You already own this item."
-        if item.get("effect") == "cosmetic" and hasattr(self.player, "bought_hat") and self.player.bought_hat:
-            return "You already own this item."
-        if item.get("effect") == "unlock_night_work" and getattr(self.player, "has_lantern", False):
-            return "You already own this item."
-        if item.get("effect") == "unlock_farmdex" and getattr(self.player, "has_farmdex", False):
-            return "You already own this item."
-
-        if not self.player.can_afford(item["price"]):
-            return "Not enough money."
-
-        self.player.spend_money(item["price"])
-        if item.get("unlocks") == "fishing":
-            self.fishing_unlocked = True
-            return "You bought a fishing rod! Fishing is now available."
-        elif item.get("effect") == "increase_event_chance":
-            self.player.event_bonus = "lucky_egg"
-            return "You feel luckier already... (+Event Chance)"
-        elif item.get("effect") == "increase_max_stamina":
-            self.player.max_stamina += 4
-            self.player.stamina = self.player.max_stamina
-            return "Your soul feels stronger... (+4 Max Stamina)"
-        elif item.get("effect") == "cosmetic":
-            self.player.bought_hat = True
-            return "Cosmetic item? In a CLI game? Bro... you deserved to lose that money. I'm sorry."
-        elif item.get("effect") == "unlock_night_work":
-            self.player.has_lantern = True
-            return "You bought a lantern! Now you can work through the night."
-        elif item.get("effect") == "unlock_farmdex":
-            self.player.has_farmdex = True
-            return "Every two days, you have a 75% chance to discover a buried fossil! Help the local museum build the greatest dinosaur collection in history!"
-        return "Item purchased."
+        self.player.spend_money(price)
+        if self.game:
+            self.game.telemetry.record(TelemetrySystem.PURCHASE, price)
+            self.game.history.record(self.game.time_system.day, "purchase", -price, f"Bought {item_key}")
+        effect = ItemEffectRegistry.effect_of(item)
+        self.player.add_item(item_key, effect)
+        return True, ITEM_EFFECTS.apply(effect, self.player)
 
 class FishingSystem:
     def __init__(self, player: Player):
         self.player = player
         self.game = None
         self.caught_fish = []
+        self.rng = RandomStream.unseeded()
 
         self.fish_types = [
             {"name": "Salmon", "value": 40},
@@ -501,35 +2112,529 @@ class FishingSystem:
             return "Not enough stamina to fish."
 
         self.player.use_stamina(2.0)
-        fish = random.choice(self.fish_types)
+        fish = self.rng.choice(self.fish_types)
         self.caught_fish.append(fish)
         return f"You caught a {fish['name']} worth ${fish['value']}!"
 
     def sell_all_fish(self) -> str:
-        bonus_multiplier = 1.5 if getattr(self, 'game', None) and getattr(self.game, 'fishing_bonus', False) else 1.0
+        bonus_multiplier = 1.5 if getattr(self, 'game', None) and self.game.effect_active("fishing_bonus") else 1.0
         total = sum(int(f["value"] * bonus_multiplier) for f in self.caught_fish)
         self.player.earn_money(total)
+        if self.game:
+            self.game.telemetry.record(TelemetrySystem.FISH, total)
+            self.game.history.record(self.game.time_system.day, "fish", total, f"Sold all fish for ${total}")
         self.caught_fish = []
         return f"Sold all fish for ${total}!"
 
+# ==================== Histórico ====================
+class HistoryLog(ISerializable):
+    """Log colunar de tudo que acontece no jogo, com índices por dia e por tipo.
+
+    Os registros chegam em ordem de dia, então as consultas por dia ou estação são
+    buscas binárias; cada tipo guarda a lista (ordenada) das posições dos seus registros.
+    """
+    INCOME_KINDS = ("harvest", "fish")
+
+    def __init__(self):
+        self.days = array('I')
+        self.kinds = array('I')
+        self.amounts = array('q')
+        self.messages = array('I')
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self._by_kind: Dict[int, array] = {}
+        self._shared = False
+        self._dict: Optional[Dict[str, Any]] = None
+        self._json: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def _intern(self, text: str) -> int:
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = self._string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def fork(self) -> 'HistoryLog':
+        other = HistoryLog.__new__(HistoryLog)
+        other.__dict__.update(self.__dict__)
+        other._shared = self._shared = True
+        return other
+
+    def _own(self):
+        if self._shared:
+            self.days, self.kinds = array('I', self.days), array('I', self.kinds)
+            self.amounts, self.messages = array('q', self.amounts), array('I', self.messages)
+            self.strings, self._string_ids = list(self.strings), dict(self._string_ids)
+            self._by_kind = {kind: array('I', positions) for kind, positions in self._by_kind.items()}
+            self._shared = False
+
+    def record(self, day: int, kind: str, amount: int = 0, message: str = ""):
+        self._own()
+        self._dict = self._json = None
+        position = len(self.days)
+        kind_id = self._intern(kind)
+        self.days.append(day)
+        self.kinds.append(kind_id)
+        self.amounts.append(int(amount))
+        self.messages.append(self._intern(message))
+        positions = self._by_kind.get(kind_id)
+        if positions is None:
+            positions = self._by_kind[kind_id] = array('I')
+        positions.append(position)
+
+    def entry(self, position: int) -> Dict[str, Any]:
+        return {
+            'day': self.days[position],
+            'kind': self.strings[self.kinds[position]],
+            'amount': self.amounts[position],
+            'message': self.strings[self.messages[position]],
+        }
+
+    @staticmethod
+    def season_days(season: int) -> Tuple[int, int]:
+        """Dias (inclusive) da n-ésima estação do jogo, contando a partir de 1."""
+        return (season - 1) * 30 + 1, season * 30
+
+    def kinds_matching(self, prefix: str) -> List[str]:
+        return [self.strings[k] for k in self._by_kind if self.strings[k] == prefix or self.strings[k].startswith(prefix + ":")]
+
+    def positions(self, kind: Optional[str] = None, first_day: int = 1,
+                  last_day: Optional[int] = None) -> List[int]:
+        last_day = last_day if last_day is not None else 2 ** 32 - 1
+        if kind is None:
+            start = bisect.bisect_left(self.days, first_day)
+            end = bisect.bisect_right(self.days, last_day)
+            return list(range(start, end))
+        result = []
+        for name in self.kinds_matching(kind):
+            positions = self._by_kind[self._string_ids[name]]
+            start = bisect.bisect_left(positions, first_day, key=self.days.__getitem__)
+            end = bisect.bisect_right(positions, last_day, key=self.days.__getitem__)
+            result.extend(positions[start:end])
+        result.sort()
+        return result
+
+    def query(self, kind: Optional[str] = None, first_day: int = 1,
+              last_day: Optional[int] = None) -> List[Dict[str, Any]]:
+        return [self.entry(p) for p in self.positions(kind, first_day, last_day)]
+
+    def in_season(self, kind: str, season: int) -> List[Dict[str, Any]]:
+        return self.query(kind, *self.season_days(season))
+
+    def income_on_day(self, day: int) -> int:
+        start = bisect.bisect_left(self.days, day)
+        end = bisect.bisect_right(self.days, day)
+        income_ids = {self._string_ids[k] for k in self.INCOME_KINDS if k in self._string_ids}
+        return sum(self.amounts[p] for p in range(start, end) if self.kinds[p] in income_ids)
+
+    def page(self, page: int, page_size: int, kind: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """Página `page` (0 = mais recente) do histórico; só os registros da página são montados."""
+        if kind is None:
+            total = len(self.days)
+            end = total - page * page_size
+            positions = range(max(0, end - page_size), max(0, end))
+            positions = reversed(positions)
+        else:
+            # Percorre as listas de posição dos tipos a partir do fim, sem montar a lista inteira
+            lists = [self._by_kind[self._string_ids[name]] for name in self.kinds_matching(kind)]
+            total = sum(len(positions) for positions in lists)
+            newest = heapq.merge(*(reversed(positions) for positions in lists), reverse=True)
+            positions = itertools.islice(newest, page * page_size, (page + 1) * page_size)
+        pages = max(1, (total + page_size - 1) // page_size)
+        return [self.entry(p) for p in positions], pages
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self._dict is None:
+            self._dict = {
+                'strings': list(self.strings),
+                'days': self.days.tolist(),
+                'kinds': self.kinds.tolist(),
+                'amounts': self.amounts.tolist(),
+                'messages': self.messages.tolist(),
+            }
+        return self._dict
+
+    def to_json(self) -> str:
+        if self._json is None:
+            self._json = json.dumps(self.to_dict())
+        return self._json
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HistoryLog':
+        log = cls()
+        log.strings = list(data['strings'])
+        log._string_ids = {text: i for i, text in enumerate(log.strings)}
+        log.days = array('I', data['days'])
+        log.kinds = array('I', data['kinds'])
+        log.amounts = array('q', data['amounts'])
+        log.messages = array('I', data['messages'])
+        for position, kind_id in enumerate(log.kinds):
+            positions = log._by_kind.get(kind_id)
+            if positions is None:
+                positions = log._by_kind[kind_id] = array('I')
+            positions.append(position)
+        return log
+
+# ==================== Efeitos Temporários ====================
+class TimerWheel(ISerializable):
+    """Roda de temporizadores hierárquica, medida em horas de jogo.
+
+    Cada nível tem 64 posições e o nível n cobre 64**(n+1) horas; quando o nível de baixo
+    dá a volta, a posição correspondente do nível de cima desce (cascata). Um temporizador
+    desce no máximo LEVELS vezes, então agendar e disparar é O(1) amortizado.
+    """
+    BITS = 6
+    SLOTS = 1 << BITS
+    MASK = SLOTS - 1
+    LEVELS = 4
+
+    def __init__(self, now: int = 0):
+        self.now = now  # próxima hora ainda não processada
+        self.wheels = [[[] for _ in range(self.SLOTS)] for _ in range(self.LEVELS)]
+        self.overflow: List[tuple] = []
+        self.count = 0
+        self.seq = 0
+        self._shared = False
+
+    def __len__(self) -> int:
+        return self.count
+
+    def fork(self) -> 'TimerWheel':
+        other = TimerWheel.__new__(TimerWheel)
+        other.__dict__.update(self.__dict__)
+        other._shared = self._shared = True
+        return other
+
+    def _own(self):
+        if self._shared:
+            self.wheels = [[list(slot) for slot in wheel] for wheel in self.wheels]
+            self.overflow = list(self.overflow)
+            self._shared = False
+
+    def _place(self, timer: tuple):
+        at = max(timer[0], self.now)
+        delta = at - self.now
+        for level in range(self.LEVELS):
+            if delta < 1 << (self.BITS * (level + 1)):
+                self.wheels[level][(at >> (self.BITS * level)) & self.MASK].append(timer)
+                return
+        self.overflow.append(timer)
+
+    def schedule(self, at: int, *payload):
+        """Agenda `payload` para a hora `at`; horas já passadas disparam no próximo avanço."""
+        self._own()
+        self._place((at, self.seq, *payload))
+        self.seq += 1
+        self.count += 1
+
+    def _cascade(self, level: int):
+        if level == self.LEVELS:
+            pending, self.overflow = self.overflow, []
+        else:
+            index = (self.now >> (self.BITS * level)) & self.MASK
+            if index == 0:
+                self._cascade(level + 1)
+            pending, self.wheels[level][index] = self.wheels[level][index], []
+        for timer in pending:
+            self._place(timer)
+
+    def advance(self, until: int):
+        """Avança o relógio até `until` (inclusive), gerando os temporizadores vencidos em ordem.
+
+        Os handlers podem agendar novos temporizadores enquanto a iteração acontece.
+        """
+        while self.now <= until:
+            if not self.count:
+                self.now = until + 1
+                return
+            self._own()
+            index = self.now & self.MASK
+            if index == 0:
+                self._cascade(1)
+            slot = self.wheels[0][index]
+            if slot:
+                self.wheels[0][index] = []
+                self.count -= len(slot)
+                slot.sort()
+                yield from slot
+            self.now += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        timers = [list(t) for wheel in self.wheels for slot in wheel for t in slot]
+        timers.extend(list(t) for t in self.overflow)
+        return {'now': self.now, 'seq': self.seq, 'timers': sorted(timers)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TimerWheel':
+        wheel = cls(data['now'])
+        for timer in data['timers']:
+            wheel._place(tuple(timer))
+        wheel.count = len(data['timers'])
+        wheel.seq = data['seq']
+        return wheel
+
+class TimedEffectRegistry:
+    """Handlers dos efeitos temporários, por fase: início, tique periódico e expiração."""
+    PHASES = ("start", "tick", "expire")
+
+    def __init__(self):
+        self._handlers: Dict[Tuple[str, str], Callable[['GameState'], Optional[str]]] = {}
+
+    def register(self, effect: str, phase: str = "start"):
+        if phase not in self.PHASES:
+            raise ValueError(f"unknown effect phase {phase!r}")
+        def decorator(handler: Callable[['GameState'], Optional[str]]) -> Callable[['GameState'], Optional[str]]:
+            self._handlers[(effect, phase)] = handler
+            return handler
+        return decorator
+
+    def fire(self, effect: str, phase: str, game: 'GameState') -> Optional[str]:
+        handler = self._handlers.get((effect, phase))
+        return handler(game) if handler else None
+
+TIMED_EFFECTS = TimedEffectRegistry()
+
+@TIMED_EFFECTS.register("lazy_day")
+def _lazy_day_start(game: 'GameState') -> str:
+    game.player.max_stamina -= 2
+    game.player.stamina = min(game.player.stamina, game.player.max_stamina)
+    return "You feel extremely lazy today... (-2 Max Hearts)"
+
+@TIMED_EFFECTS.register("lazy_day", "expire")
+def _lazy_day_expire(game: 'GameState') -> None:
+    game.player.max_stamina += 2
+    game.player.stamina = min(game.player.stamina, game.player.max_stamina)
+
+@TIMED_EFFECTS.register("inflated_market")
+def _inflated_market_start(game: 'GameState') -> str:
+    return "Prices have doubled today! (Inflated Market)"
+
+@TIMED_EFFECTS.register("fishing_bonus")
+def _fishing_bonus_start(game: 'GameState') -> str:
+    return "The fish are biting! (+50% fish value today!)"
+
+@TIMED_EFFECTS.register("drought")
+def _drought_start(game: 'GameState') -> str:
+    return "The drought slows your crops... (-15% growth while it lasts)"
+
+@TIMED_EFFECTS.register("drought", "expire")
+def _drought_expire(game: 'GameState') -> str:
+    return "Rain at last! The drought is over."
+
+# ==================== Campos ====================
+class FieldSet:
+    """Os campos do jogador. Só o campo ativo existe como FarmSystem (em `GameState.farm`);
+    os outros ficam como texto JSON compacto, inclusive dentro do save, e só são
+    reconstruídos (e postos em dia) quando o jogador volta a eles.
+    """
+    # growth: multiplicador da taxa de crescimento; value: multiplicador da colheita
+    TYPES = {
+        'home': {'name': 'Home Field', 'size': 9, 'growth': 1.0, 'value': 1.0, 'weather': True},
+        'orchard': {'name': 'Orchard', 'size': 16, 'growth': 0.8, 'value': 1.3, 'weather': True},
+        'greenhouse': {'name': 'Greenhouse', 'size': 6, 'growth': 1.25, 'value': 1.0, 'weather': False},
+        'paddies': {'name': 'Rice Paddies', 'size': 12, 'growth': 1.0, 'value': 1.15, 'weather': True},
+    }
+
+    def __init__(self):
+        self.active = 'home'
+        self.stored: Dict[str, str] = {}
+        self._encoded: Dict[str, str] = {}
+        # Início (timestamp) de cada dia desde o mais antigo em que algum campo guardado parou
+        self.day_starts: Dict[int, float] = {}
+
+    def fork(self) -> 'FieldSet':
+        other = FieldSet()
+        other.active = self.active
+        other.stored = dict(self.stored)
+        other._encoded = dict(self._encoded)
+        other.day_starts = dict(self.day_starts)
+        return other
+
+    @classmethod
+    def spec(cls, key: str) -> Dict[str, Any]:
+        return cls.TYPES[key]
+
+    def owned(self, player: Player) -> List[str]:
+        return [key for key in self.TYPES if key == 'home' or player.has_effect(f"unlock_{key}")]
+
+    @classmethod
+    def growth_rates(cls, key: str, rate: float, weather: List[int]) -> List[float]:
+        """Taxa de cada região do campo: a global vezes o tipo do campo e, se exposto, o clima."""
+        spec = cls.spec(key)
+        rate *= spec['growth']
+        if not spec['weather']:
+            return [rate] * len(weather)
+        modifiers = WeatherSystem.MODIFIERS
+        return [rate * modifiers[state] for state in weather]
+
+    @staticmethod
+    def _stored_day(text: str) -> int:
+        # O texto guardado sempre começa com '{"day": N, ': lê só o dia, sem decodificar o campo
+        return int(text[8:text.index(",")])
+
+    def day_started(self, day: int, when: datetime):
+        """Anota o início do dia enquanto houver campo parado que vá precisar repor esse dia."""
+        if not self.stored:
+            self.day_starts.clear()
+            return
+        oldest = min(self._stored_day(text) for text in self.stored.values())
+        self.day_starts = {d: t for d, t in self.day_starts.items() if d > oldest}
+        self.day_starts[day] = when.timestamp()
+
+    def store(self, key: str, farm: FarmSystem, day: int, weather: List[int]):
+        """Guarda o campo em forma compacta, com o dia até onde ele está em dia e o clima dele."""
+        self.stored[key] = "".join(['{"day": ', str(day), ', "farm": ', *farm.iter_json(),
+                                    ', "pests": ', json.dumps(farm.pests.to_dict()),
+                                    ', "growth": ', json.dumps(farm.growth.to_dict()),
+                                    ', "weather": ', json.dumps(weather[:farm.region_count]), '}'])
+        self._encoded.pop(key, None)
+
+    def activate(self, key: str, day: int, weather: 'WeatherSystem', growth: GrowthTimeline,
+                 now: datetime, rng: Optional[RandomStreams] = None) -> Tuple[FarmSystem, int]:
+        """Materializa o campo e repõe os dias em que ele ficou parado; retorna (fazenda, perdas).
+
+        O clima de cada dia perdido é sorteado de novo (cadeia de Markov a partir do clima
+        guardado) e entra na linha do tempo da fazenda entre os inícios de dia anotados,
+        junto com as mudanças da taxa global `growth` nesse intervalo. Um campo sem
+        plantações nem pragas só precisa do clima final, avançado de uma vez.
+        """
+        text = self.stored.pop(key, None)
+        self._encoded.pop(key, None)
+        if text is None:
+            return FarmSystem(self.spec(key)['size']), 0
+        data = json.loads(text)
+        farm = FarmSystem.from_dict(data['farm'])
+        if rng is not None:
+            farm.rng, farm.pests.rng = rng.farm, rng.pests
+        farm.pests.load(data['pests'])
+        if 'growth' in data:
+            farm.growth = GrowthTimeline.from_dict(data['growth'])
+        local = WeatherSystem(farm.region_count)
+        local.rng = rng.weather if rng is not None else weather.rng
+        local.regions = data.get('weather') or [weather.regions[0]] * farm.region_count
+        stored_day = data['day']
+        lost = 0
+        if farm.occupied_count or farm.pests:
+            history = WeatherSystem.simulate_history(local.regions, stored_day, day - stored_day, local.rng)
+            for missed_day, regions in zip(range(stored_day + 1, day + 1), history):
+                local.regions = regions
+                start = self.day_starts.get(missed_day)
+                if start is not None:
+                    end = self.day_starts.get(missed_day + 1, now.timestamp())
+                    farm.growth.follow(growth, start, end, self.growth_rates(key, 1.0, regions))
+                lost += self.advance_day(key, farm, missed_day, local)
+        else:
+            local.fast_forward(stored_day, day - stored_day)
+        weather.regions = local.regions
+        return farm, lost
+
+    def advance_day(self, key: str, farm: FarmSystem, day: int, weather: 'WeatherSystem') -> int:
+        """Um dia de um campo: pragas (tipo e clima entram pela taxa de crescimento)."""
+        farm.prune_growth()
+        return farm.pests.step(day, weather)
+
+    def iter_json(self):
+        yield f'{{"active": {json.dumps(self.active)}, "stored": {{'
+        separator = ""
+        for key, text in self.stored.items():
+            # O texto guardado não muda enquanto o campo está inativo: a versão escapada fica em cache
+            if key not in self._encoded:
+                self._encoded[key] = json.dumps(text)
+            yield f'{separator}{json.dumps(key)}: {self._encoded[key]}'
+            separator = ", "
+        yield f'}}, "day_starts": {json.dumps(self.day_starts)}}}'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'active': self.active, 'stored': dict(self.stored),
+                'day_starts': {str(day): when for day, when in self.day_starts.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FieldSet':
+        fields = cls()
+        fields.active = data['active']
+        fields.stored = dict(data['stored'])
+        fields.day_starts = {int(day): when for day, when in data.get('day_starts', {}).items()}
+        return fields
+
 # ==================== Gerenciamento do Jogo ====================
+# Fósseis do Farmdex, na ordem da coleção
+FOSSILS = (
+    "Tyrannosaurus", "Triceratops", "Velociraptor", "Brachiosaurus", "Stegosaurus",
+    "Spinosaurus", "Ankylosaurus", "Parasaurolophus", "Allosaurus", "Diplodocus",
+    "Iguanodon", "Archaeopteryx", "Pteranodon", "Deinonychus", "Megalosaurus",
+    "Pachycephalosaurus", "Corythosaurus", "Oviraptor", "Plateosaurus", "Styracosaurus",
+    "Suchomimus", "Troodon", "Carnotaurus", "Sauropelta", "Albertosaurus",
+    "Mamenchisaurus", "Edmontosaurus", "Herrerasaurus", "Giganotosaurus", "Therizinosaurus",
+    "Kentrosaurus", "Dilophosaurus", "Coelophysis", "Protoceratops", "Sinraptor",
+    "Rugops", "Lambeosaurus", "Mononykus", "Torosaurus", "Rhabdodon",
+    "Ouranosaurus", "Microceratus", "Zuniceratops", "Einiosaurus", "Dromaeosaurus",
+    "Massospondylus", "Lesothosaurus", "Noasaurus", "Gasparinisaura", "Minmi"
+)
+
 class GameState(ISerializable):
     SAVE_FILE = "terminal_farmer_save.json"
+    # Relógio de parede do jogo; o FarmEnv troca pelo seu relógio simulado
+    time_source: Callable[[], datetime] = datetime.now
+    # Culturas liberadas ao chegar em cada dia
+    UNLOCK_DAYS = {'corn': 3, 'pumpkin': 7}
+    # Efeitos temporários "growth_bonus:<percentual>" aceleram o crescimento até a virada do dia
+    GROWTH_BONUS_EFFECT = "growth_bonus:"
     
-    def __init__(self):
+    def __init__(self, storage: Optional['StorageBackend'] = None, telemetry: Optional[TelemetrySystem] = None,
+                 seed: Optional[int] = None, time_source: Optional[Callable[[], datetime]] = None):
+        self.telemetry = telemetry or TelemetrySystem.from_env()
+        self.storage: StorageBackend = storage or JsonStorage(self.SAVE_FILE)
+        if time_source is not None:
+            self.time_source = time_source
+        self._new_state(seed)
+
+    @classmethod
+    def open(cls, storage: Optional['StorageBackend'] = None,
+             telemetry: Optional[TelemetrySystem] = None) -> Tuple['GameState', bool]:
+        """Monta o jogo uma única vez: a partir do save, se houver, ou novo.
+
+        Retorna (jogo, carregado_do_save).
+        """
+        game = cls.__new__(cls)
+        game.telemetry = telemetry or TelemetrySystem.from_env()
+        game.storage = storage or JsonStorage(cls.SAVE_FILE)
+        try:
+            data = game.storage.load()
+            if data is not None:
+                game.from_dict(data, fallback=True)
+                game._restore_offline_stamina()
+                return game, True
+        except Exception as e:
+            print(f"Error loading game: {e}")
+        game._new_state()
+        return game, False
+
+    def _new_state(self, seed: Optional[int] = None):
+        self.rng = RandomStreams(seed)
         self.player = Player()
         self.farm = FarmSystem()
         self.farm.game = self
         self.crop_system = CropSystem()
-        self.weather_system = WeatherSystem()
+        self.weather_system = WeatherSystem(self.farm.region_count)
         self.time_system = TimeSystem()
         self.event_system = EventSystem(self.farm, self.player)
         self.event_system.game = self
         self.day_cycle_system = DayCycleSystem(self.time_system)
-        self.merchant_system = MerchantSystem(self.crop_system, self.player)
-        self.fishing_system = FishingSystem(self.player)
-        self.fishing_system.game = self
-        self.lazy_day_active = False
+        self._merchant_system: Optional[MerchantSystem] = None
+        self._fishing_system: Optional[FishingSystem] = None
+        self._caught_fish: List[Dict[str, Any]] = []
+        self.timers = TimerWheel()
+        self.active_effects: Counter = Counter()
+        self._clock = 0
+        self.growth = GrowthTimeline()
+        self.history = HistoryLog()
+        self.fields = FieldSet()
+        self.undo_stack: List['GameState'] = []
+        self._wire()
+        self.update_growth_rate()
     
     def next_day(self) -> Tuple[bool, Optional[str]]:
         """Advance to next day, returns (success, event_message)"""
@@ -537,52 +2642,313 @@ class GameState(ISerializable):
             return False, None
         
         self.player.use_stamina(1.0)
+        self.telemetry.record(TelemetrySystem.MONEY, self.player.money)
+        self.telemetry.record(TelemetrySystem.STAMINA, self.player.stamina)
         self.time_system.update()
-        self.weather_system.update()
+        self.telemetry.day = self.time_system.day
         self.day_cycle_system = DayCycleSystem(self.time_system)
-        
+        self.weather_system.update(self.day_cycle_system.get_season())
+        day = self.time_system.day
+        self.fields.day_started(day, self.time_source())
+        lost = self.fields.advance_day(self.fields.active, self.farm, day, self.weather_system)
+        messages = []
+        for message in self.advance_timers():
+            messages.append(message)
+            self.history.record(day, "effect", 0, message)
+        if lost:
+            messages.append(f"Pests destroyed {lost} crop(s)!")
+            self.history.record(day, "pests", 0, messages[-1])
         
         if self.player.has_farmdex and self.time_system.day % 2 == 0:
-            if random.random() < 0.75 and len(self.player.fossils_found) < 50:
-                all_fossils = [
-                    "Tyrannosaurus", "Triceratops", "Velociraptor", "Brachiosaurus", "Stegosaurus",
-                    "Spinosaurus", "Ankylosaurus", "Parasaurolophus", "Allosaurus", "Diplodocus",
-                    "Iguanodon", "Archaeopteryx", "Pteranodon", "Deinonychus", "Megalosaurus",
-                    "Pachycephalosaurus", "Corythosaurus", "Oviraptor", "Plateosaurus", "Styracosaurus",
-                    "Suchomimus", "Troodon", "Carnotaurus", "Sauropelta", "Albertosaurus",
-                    "Mamenchisaurus", "Edmontosaurus", "Herrerasaurus", "Giganotosaurus", "Therizinosaurus",
-                    "Kentrosaurus", "Dilophosaurus", "Coelophysis", "Protoceratops", "Sinraptor",
-                    "Rugops", "Lambeosaurus", "Mononykus", "Torosaurus", "Rhabdodon",
-                    "Ouranosaurus", "Microceratus", "Zuniceratops", "Einiosaurus", "Dromaeosaurus",
-                    "Massospondylus", "Lesothosaurus", "Noasaurus", "Gasparinisaura", "Minmi"
-                ]
-                undiscovered = [f for f in all_fossils if f not in self.player.fossils_found]
+            if self.rng.fossils.random() < 0.75 and len(self.player.fossils_found) < len(FOSSILS):
+                undiscovered = [f for f in FOSSILS if f not in self.player.fossils_found]
                 if undiscovered:
-                    found = random.choice(undiscovered)
+                    found = self.rng.fossils.choice(undiscovered)
                     self.player.fossils_found.append(found)
-                    return True, f"NEW FOSSIL DISCOVERED: {found}!"
+                    messages.append(f"NEW FOSSIL DISCOVERED: {found}!")
+                    self.history.record(day, "fossil", 0, messages[-1])
         
-        unlock_message = None
-        if self.time_system.day == 3 and 'corn' not in self.crop_system.unlocked_crops:
-            unlock_message = self.crop_system.unlock_crop('corn')
-        elif self.time_system.day == 7 and 'pumpkin' not in self.crop_system.unlocked_crops:
-            unlock_message = self.crop_system.unlock_crop('pumpkin')
+        for crop, unlock_day in self.UNLOCK_DAYS.items():
+            if day == unlock_day and crop not in self.crop_system.unlocked_crops:
+                unlock_message = self.crop_system.unlock_crop(crop)
+                if unlock_message:
+                    messages.append(unlock_message)
+                    self.history.record(day, "unlock", 0, unlock_message)
         
-        self.market_inflated = False
-        self.fishing_bonus = False
-        if self.lazy_day_active:
-            self.player.max_stamina += 2
-            if self.player.stamina > self.player.max_stamina:
-                self.player.stamina = self.player.max_stamina
-            self.lazy_day_active = False
+        money_before = self.player.money
         event_message = self.event_system.update(self.time_system.day)
+        if event_message:
+            messages.append(event_message)
+            self.history.record(day, f"event:{self.event_system.last_event_key}",
+                                self.player.money - money_before, event_message)
         
-        return True, unlock_message or event_message
+        return True, "\n".join(messages) or None
     
+    def sleep(self) -> Tuple[bool, Optional[str]]:
+        """Dorme até o dia seguinte (só à noite); retorna (dormiu, mensagens do novo dia)."""
+        if self.day_cycle_system.get_current_part() != "night":
+            return False, None
+        _, message = self.next_day()
+        self.player.full_restore()
+        self.player.last_sleep_time = self.time_source()
+        return True, message
+
+    def nap(self) -> List[str]:
+        """Cochila até a próxima parte do dia (+1 coração); retorna as mensagens dos efeitos."""
+        self.player.restore_stamina(1)
+        cycle = self.day_cycle_system
+        cycle.current_part_index = (cycle.current_part_index + 1) % len(cycle.PARTS)
+        cycle.last_update_time = self.time_source()
+        return self.advance_timers()
+
+    HOURS_PER_DAY = 24
+
+    def clock(self) -> int:
+        """Hora de jogo absoluta: o dia avança 24 horas e cada parte do dia, uma fração delas.
+
+        Nunca volta: se o ciclo passa da noite para a manhã sem trocar o dia, a hora fica
+        na da noite até o dia seguinte (o piso `_clock` vai no save, junto dos efeitos).
+        """
+        parts = len(DayCycleSystem.PARTS)
+        hour = ((self.time_system.day - 1) * self.HOURS_PER_DAY
+                + self.day_cycle_system.current_part_index * self.HOURS_PER_DAY // parts)
+        self._clock = max(self._clock, hour)
+        return self._clock
+
+    def hours_until_next_day(self) -> int:
+        return self.time_system.day * self.HOURS_PER_DAY - self.clock()
+
+    def effect_active(self, effect: str) -> bool:
+        return self.active_effects[effect] > 0
+
+    def start_effect(self, effect: str, hours: int, every: int = 0, delay: int = 0) -> Optional[str]:
+        """Agenda um efeito de `hours` horas, com tique a cada `every` horas se pedido.
+
+        Sem `delay` o efeito começa agora e a mensagem de início é retornada.
+        """
+        start = self.clock() + delay
+        if delay:
+            self.timers.schedule(start, effect, "start", start + hours, every)
+            return None
+        return self._begin_effect(effect, start, start + hours, every)
+
+    def _begin_effect(self, effect: str, start: int, until: int, every: int) -> Optional[str]:
+        self.active_effects[effect] += 1
+        if every and start + every < until:
+            self.timers.schedule(start + every, effect, "tick", until, every)
+        self.timers.schedule(until, effect, "expire", until, every)
+        message = TIMED_EFFECTS.fire(effect, "start", self)
+        self.update_growth_rate()
+        return message
+
+    def advance_timers(self) -> List[str]:
+        """Dispara os inícios, tiques e expirações vencidos até a hora atual."""
+        messages = []
+        for at, _, effect, phase, until, every in self.timers.advance(self.clock()):
+            if phase == "start":
+                message = self._begin_effect(effect, at, until, every)
+            else:
+                if phase == "expire":
+                    self.active_effects[effect] -= 1
+                    if self.active_effects[effect] <= 0:
+                        del self.active_effects[effect]
+                elif at + every < until:
+                    self.timers.schedule(at + every, effect, "tick", until, every)
+                message = TIMED_EFFECTS.fire(effect, phase, self)
+            if message:
+                messages.append(message)
+        self.update_growth_rate()
+        return messages
+
+    def growth_rate(self) -> float:
+        rate = GrowthTimeline.SEASON_RATES[self.day_cycle_system.get_season()]
+        if self.effect_active("drought"):
+            rate *= GrowthTimeline.DROUGHT_RATE
+        for effect, count in self.active_effects.items():
+            if effect.startswith(self.GROWTH_BONUS_EFFECT) and count > 0:
+                rate *= (1 + float(effect[len(self.GROWTH_BONUS_EFFECT):]) / 100) ** count
+        return rate
+
+    def start_growth_bonus(self, percent: float) -> Optional[str]:
+        """Crescimento `percent`% mais rápido até a virada do dia, como um trecho novo nas linhas do tempo."""
+        return self.start_effect(f"{self.GROWTH_BONUS_EFFECT}{percent:g}", self.hours_until_next_day())
+
+    def update_growth_rate(self, now: Optional[datetime] = None):
+        """Abre um trecho novo nas linhas do tempo se a estação, os efeitos ou o clima mudaram a taxa.
+
+        `growth` guarda a taxa global; a da fazenda multiplica o tipo do campo e o clima
+        de cada região, se o campo for exposto a ele.
+        """
+        now = now or self.time_source()
+        rate = self.growth_rate()
+        self.growth.set_rate(now, rate)
+        self.farm.growth.set_rates(now, FieldSet.growth_rates(self.fields.active, rate, self.weather_system.regions))
+
+    # Mercador e pesca só existem depois do primeiro uso
+    @property
+    def merchant_system(self) -> 'MerchantSystem':
+        if self._merchant_system is None:
+            self._merchant_system = MerchantSystem(self.crop_system, self.player)
+            self._merchant_system.game = self
+        return self._merchant_system
+
+    @property
+    def fishing_system(self) -> 'FishingSystem':
+        if self._fishing_system is None:
+            self._fishing_system = FishingSystem(self.player)
+            self._fishing_system.caught_fish = self._caught_fish
+            self._fishing_system.game = self
+            self._fishing_system.rng = self.rng.fishing
+        return self._fishing_system
+
+    @property
+    def caught_fish(self) -> List[Dict[str, Any]]:
+        return self._fishing_system.caught_fish if self._fishing_system else self._caught_fish
+
+    @property
+    def fishing_unlocked(self) -> bool:
+        return self.player.has_effect("unlock_fishing")
+
+    UNDO_DEPTH = 20
+
+    def fork(self) -> 'GameState':
+        """Cópia estrutural barata: lotes e catálogos são compartilhados com cópia-na-escrita."""
+        other = GameState.__new__(GameState)
+        other.__dict__.update(self.__dict__)
+        other.telemetry = TelemetrySystem()
+        other.undo_stack = []
+        other.player = copy.copy(self.player)
+        other.player.fossils_found = list(self.player.fossils_found)
+        other.player.items = dict(self.player.items)
+        other.player.effects = Counter(self.player.effects)
+        other.farm = self.farm.fork()
+        other.history = self.history.fork()
+        other.timers = self.timers.fork()
+        other.growth = self.growth.fork()
+        other.rng = self.rng.fork()
+        other.fields = self.fields.fork()
+        other.active_effects = Counter(self.active_effects)
+        other.crop_system = copy.copy(self.crop_system)
+        other.crop_system.unlocked_crops = list(self.crop_system.unlocked_crops)
+        other.weather_system = copy.copy(self.weather_system)
+        other.time_system = copy.copy(self.time_system)
+        other.day_cycle_system = copy.copy(self.day_cycle_system)
+        other.day_cycle_system.time_system = other.time_system
+        other.event_system = copy.copy(self.event_system)
+        other._merchant_system = None
+        other._fishing_system = None
+        other._caught_fish = list(self.caught_fish)
+        other._wire()
+        return other
+
+    def _wire(self):
+        self.farm.game = self
+        self.farm.rng = self.rng.farm
+        self.farm.pests.rng = self.rng.pests
+        self.weather_system.rng = self.rng.weather
+        self.event_system.rng = self.rng.events
+        self.event_system.farm = self.farm
+        self.event_system.player = self.player
+        self.event_system.game = self
+        if self._merchant_system is not None:
+            self._merchant_system.crop_system = self.crop_system
+            self._merchant_system.player = self.player
+            self._merchant_system.game = self
+        if self._fishing_system is not None:
+            self._fishing_system.player = self.player
+            self._fishing_system.game = self
+            self._fishing_system.rng = self.rng.fishing
+        self.day_cycle_system.time_system = self.time_system
+        self.weather_system.resize(self.farm.region_count)
+
+    def push_undo(self, snapshot: Optional['GameState'] = None):
+        """Empilha um passo de undo: o estado atual ou um `fork()` tirado antes da ação."""
+        self.undo_stack.append(snapshot or self.fork())
+        if len(self.undo_stack) > self.UNDO_DEPTH:
+            del self.undo_stack[0]
+
+    def undo(self) -> bool:
+        if not self.undo_stack:
+            return False
+        snapshot = self.undo_stack.pop().fork()
+        snapshot.telemetry = self.telemetry
+        snapshot.undo_stack = self.undo_stack
+        self.__dict__.update(snapshot.__dict__)
+        self._wire()
+        return True
+
+    def plant(self, crop: Crop, plot_index: int, now: Optional[datetime] = None) -> Optional[str]:
+        """Planta `crop` no lote; retorna a mensagem de erro ou None em caso de sucesso."""
+        if not 0 <= plot_index < len(self.farm.plots):
+            return "Invalid plot!"
+        if not self.player.has_stamina(crop.stamina_cost):
+            return "Not enough stamina!"
+        if not self.player.can_afford(crop.cost):
+            return "Not enough money!"
+        if not self.farm.plots[plot_index].is_empty:
+            return "Plot already occupied!"
+        self.player.spend_money(crop.cost)
+        self.player.use_stamina(crop.stamina_cost)
+        self.farm.plant_crop(plot_index, crop, now)
+        return None
+
+    def harvest(self, now: Optional[datetime] = None) -> int:
+        # Abre um tique novo: o do último quadro pode ser de antes de o jogador ficar parado no prompt
+        now = now or self.time_source()
+        harvested_value = round(self.farm.harvest_ready_crops(now) * FieldSet.spec(self.fields.active)['value'])
+        if harvested_value > 0:
+            self.player.earn_money(harvested_value)
+            self.telemetry.record(TelemetrySystem.HARVEST, harvested_value)
+            self.history.record(self.time_system.day, "harvest", harvested_value,
+                                f"Harvested crops worth ${harvested_value}")
+            self.player.use_stamina(0.5)
+        return harvested_value
+
+    def switch_field(self, key: str) -> Optional[str]:
+        """Troca o campo ativo; retorna a mensagem de erro ou None em caso de sucesso."""
+        if key not in self.fields.owned(self.player):
+            return "You don't own that field!"
+        if key == self.fields.active:
+            return None
+        day = self.time_system.day
+        self.fields.store(self.fields.active, self.farm, day, self.weather_system.regions)
+        self.farm, lost = self.fields.activate(key, day, self.weather_system, self.growth,
+                                               self.time_source(), self.rng)
+        self.fields.active = key
+        self.weather_system.resize(self.farm.region_count)
+        self._wire()
+        self.update_growth_rate()
+        if lost:
+            self.history.record(day, "pests", 0, f"Pests destroyed {lost} crop(s) in the {FieldSet.spec(key)['name']}!")
+        return None
+
+    def treat_pests(self) -> Tuple[bool, str]:
+        """Trata de uma vez todos os lotes infectados que o dinheiro cobrir (fronteira primeiro).
+
+        Retorna (tratou, mensagem).
+        """
+        pests = self.farm.pests
+        if not pests:
+            return False, "No pests on your farm."
+        if not self.player.has_stamina(0.5):
+            return False, "Not enough stamina!"
+        affordable = min(len(pests), self.player.money // PestSystem.TREATMENT_COST)
+        if not affordable:
+            return False, "Not enough money!"
+        treated = pests.treat(pests.treatment_order()[:affordable])
+        cost = treated * PestSystem.TREATMENT_COST
+        self.player.spend_money(cost)
+        self.player.use_stamina(0.5)
+        self.history.record(self.time_system.day, "treatment", -cost, f"Treated {treated} infested crop(s)")
+        return True, f"Treated {treated} infested crop(s) for ${cost}."
+
+    def can_work(self) -> bool:
+        return self.day_cycle_system.get_current_part() != "night" or self.player.has_effect("unlock_night_work")
+
     def save(self) -> bool:
         try:
-            with open(self.SAVE_FILE, 'w') as f:
-                json.dump(self.to_dict(), f)
+            self.storage.save(self)
+            self.telemetry.flush()
             return True
         except Exception as e:
             print(f"Error saving game: {e}")
@@ -590,38 +2956,68 @@ class GameState(ISerializable):
     
     def load(self) -> bool:
         try:
-            if not os.path.exists(self.SAVE_FILE):
+            data = self.storage.load()
+            if data is None:
                 return False
-            
-            with open(self.SAVE_FILE, 'r') as f:
-                data = json.load(f)
-                self.from_dict(data, fallback=True)
-            
-            time_passed = datetime.now() - self.player.last_sleep_time
-            hours_passed = time_passed.total_seconds() / 3600
-            stamina_to_restore = min(int(hours_passed / 2), 
-                                   self.player.max_stamina - self.player.stamina)
-            if stamina_to_restore > 0:
-                self.player.restore_stamina(stamina_to_restore)
-            
+            self.from_dict(data, fallback=True)
+            self._restore_offline_stamina()
             return True
         except Exception as e:
             print(f"Error loading game: {e}")
             return False
+
+    def _restore_offline_stamina(self):
+        time_passed = datetime.now() - self.player.last_sleep_time
+        hours_passed = time_passed.total_seconds() / 3600
+        stamina_to_restore = min(int(hours_passed / 2), 
+                               self.player.max_stamina - self.player.stamina)
+        if stamina_to_restore > 0:
+            self.player.restore_stamina(stamina_to_restore)
     
-    def new_game(self):
-        self.__init__()
+    def new_game(self, seed: Optional[int] = None):
+        self._new_state(seed)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def _parts(self) -> Dict[str, Callable[[], Any]]:
+        """Partes do save, na ordem do arquivo."""
         return {
-            'player': self.player.to_dict(),
-            'farm': self.farm.to_dict(),
-            'crop_system': self.crop_system.to_dict(),
-            'weather_system': self.weather_system.to_dict(),
-            'time_system': self.time_system.to_dict(),
-            'day_cycle_system': self.day_cycle_system.to_dict(),
-            'merchant': {'fishing_unlocked': self.merchant_system.fishing_unlocked},
+            'player': self.player.to_dict,
+            'farm': self.farm.to_dict,
+            'crop_system': self.crop_system.to_dict,
+            'weather_system': self.weather_system.to_dict,
+            'time_system': self.time_system.to_dict,
+            'day_cycle_system': self.day_cycle_system.to_dict,
+            'merchant': lambda: {'fishing_unlocked': self.fishing_unlocked},
+            'fishing': lambda: {'caught_fish': self.caught_fish},
+            'history': self.history.to_dict,
+            'effects': lambda: {'active': dict(self.active_effects), 'timers': self.timers.to_dict(),
+                                'clock': self._clock},
+            'growth': self.growth.to_dict,
+            'farm_growth': self.farm.growth.to_dict,
+            'rng': self.rng.to_dict,
+            'pests': self.farm.pests.to_dict,
+            'fields': self.fields.to_dict,
         }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: part() for key, part in self._parts().items()}
+
+    def iter_json(self):
+        """Gera o mesmo texto de `json.dumps(self.to_dict())` em pedaços, reaproveitando os
+        fragmentos em cache da fazenda e do histórico: um save repetido custa O(mudanças)."""
+        cached = {'farm': self.farm.iter_json, 'history': lambda: [self.history.to_json()],
+                  'fields': self.fields.iter_json}
+        separator = "{"
+        for key, part in self._parts().items():
+            yield f"{separator}{json.dumps(key)}: "
+            if key in cached:
+                yield from cached[key]()
+            else:
+                yield json.dumps(part())
+            separator = ", "
+        yield "}"
+
+    def to_json(self) -> str:
+        return "".join(self.iter_json())
     
     def from_dict(self, data: Dict[str, Any], fallback: bool = False):
         self.player = Player.from_dict(data['player'])
@@ -629,18 +3025,1572 @@ class GameState(ISerializable):
         self.farm.game = self
         self.crop_system = CropSystem.from_dict(data['crop_system'])
         self.weather_system = WeatherSystem.from_dict(data['weather_system'])
+        self.weather_system.resize(self.farm.region_count)
         self.time_system = TimeSystem.from_dict(data['time_system'])
         if 'day_cycle_system' in data:
             self.day_cycle_system = DayCycleSystem.from_dict(data['day_cycle_system'])
         elif fallback:
             self.day_cycle_system = DayCycleSystem(self.time_system)
         self.event_system = EventSystem(self.farm, self.player)
-        self.event_system.game = self
-        self.merchant_system = MerchantSystem(self.crop_system, self.player)
-        self.fishing_system = FishingSystem(self.player)
-        self.fishing_system.game = self
+        self._merchant_system = None
+        self._fishing_system = None
+        self._caught_fish = list(data.get('fishing', {}).get('caught_fish', []))
+        self.history = HistoryLog.from_dict(data['history']) if 'history' in data else HistoryLog()
+        effects = data.get('effects')
+        self.active_effects = Counter(effects['active']) if effects else Counter()
+        self.timers = TimerWheel.from_dict(effects['timers']) if effects else TimerWheel()
+        self._clock = effects.get('clock', 0) if effects else 0
+        self.growth = GrowthTimeline.from_dict(data['growth']) if 'growth' in data else GrowthTimeline()
+        if 'farm_growth' in data:
+            self.farm.growth = GrowthTimeline.from_dict(data['farm_growth'])
+        elif 'growth' in data:
+            # Saves antigos: o clima já estava embutido no plantio, a fazenda herda só a taxa global
+            self.farm.growth = GrowthTimeline.from_dict(data['growth'], self.farm.region_count)
+        self.rng = RandomStreams.from_dict(data['rng']) if 'rng' in data else RandomStreams()
+        if 'pests' in data:
+            self.farm.pests.load(data['pests'])
+        self.fields = FieldSet.from_dict(data['fields']) if 'fields' in data else FieldSet()
+        self._wire()
+        if 'growth' not in data:
+            self.update_growth_rate()
+        self.undo_stack = []
+        self.telemetry.day = self.time_system.day
         if 'merchant' in data and data['merchant'].get('fishing_unlocked'):
-            self.merchant_system.fishing_unlocked = True
+            self.player.add_item('fishing_rod', 'unlock_fishing')
+
+# ==================== Persistência ====================
+class StorageBackend(ABC):
+    @abstractmethod
+    def save(self, game: GameState):
+        pass
+
+    @abstractmethod
+    def load(self) -> Optional[Dict[str, Any]]:
+        pass
+
+    def version(self) -> Any:
+        """Marca que muda quando o save é regravado (por este ou outro processo); None se não souber."""
+        return None
+
+    def close(self):
+        pass
+
+class JsonStorage(StorageBackend):
+    def __init__(self, path: str):
+        self.path = path
+
+    def save(self, game: GameState):
+        with open(self.path, 'w') as f:
+            f.writelines(game.iter_json())
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def version(self) -> Any:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+class SqliteStorage(StorageBackend):
+    """Vários jogadores num só banco SQLite (WAL), com tabelas normalizadas.
+
+    Cada save compara o estado com as últimas linhas gravadas para aquele jogador
+    e escreve só o que mudou, numa única transação. O resto do estado (clima, relógios,
+    sementes, pragas...) fica em `state_parts`, uma linha por parte do save.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS players (
+            player_id TEXT PRIMARY KEY,
+            money INTEGER NOT NULL,
+            stamina REAL NOT NULL,
+            max_stamina INTEGER NOT NULL,
+            last_sleep_time TEXT NOT NULL,
+            plot_count INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS state_parts (
+            player_id TEXT NOT NULL,
+            part TEXT NOT NULL,
+            state TEXT NOT NULL,
+            PRIMARY KEY (player_id, part)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS plots (
+            player_id TEXT NOT NULL,
+            plot_index INTEGER NOT NULL,
+            crop TEXT NOT NULL,
+            planted_at TEXT,
+            PRIMARY KEY (player_id, plot_index)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS unlocks (
+            player_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            crop TEXT NOT NULL,
+            PRIMARY KEY (player_id, position)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS fossils (
+            player_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            PRIMARY KEY (player_id, position)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS items (
+            player_id TEXT NOT NULL,
+            item_key TEXT NOT NULL,
+            effect TEXT NOT NULL,
+            PRIMARY KEY (player_id, item_key)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS fish (
+            player_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            value INTEGER NOT NULL,
+            PRIMARY KEY (player_id, position)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS history (
+            player_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            amount INTEGER NOT NULL,
+            message TEXT NOT NULL,
+            PRIMARY KEY (player_id, position)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: str, player_id: str = "default"):
+        self.path = path
+        self.player_id = player_id
+        self._local = threading.local()
+        self._saved: Dict[str, Dict[str, Any]] = {}
+        self._connection().executescript(self.SCHEMA)
+
+    def for_player(self, player_id: str) -> 'SqliteStorage':
+        other = copy.copy(self)
+        other.player_id = player_id
+        return other
+
+    def _connection(self) -> 'sqlite3.Connection':
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def version(self) -> Any:
+        # data_version muda quando outra conexão grava no banco (as do próprio processo não contam)
+        return self._connection().execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @staticmethod
+    def _rows(game: GameState) -> Dict[str, Any]:
+        """Linhas de todas as tabelas, menos o histórico (que `_write_player` escreve só pelo fim)."""
+        data = {part: to_dict() for part, to_dict in game._parts().items() if part != 'history'}
+        player = data.pop('player')
+        plots = data.pop('farm')['plots']
+        data['crop_system'] = dict(data['crop_system'])
+        unlocked = data['crop_system'].pop('unlocked_crops')
+        fish = data.pop('fishing')['caught_fish']
+        # Os dicts de cultura são compartilhados entre lotes: codifica cada um uma vez só
+        crop_json: Dict[int, str] = {}
+        for plot in plots:
+            if plot['crop'] and id(plot['crop']) not in crop_json:
+                crop_json[id(plot['crop'])] = json.dumps(plot['crop'], sort_keys=True)
+        return {
+            'player': (player['money'], player['stamina'], player['max_stamina'],
+                       player['last_sleep_time'], len(plots)),
+            'state_parts': {part: json.dumps(state, sort_keys=True) for part, state in data.items()},
+            'plots': {i: (crop_json[id(plot['crop'])], plot['planted_at'])
+                      for i, plot in enumerate(plots) if plot['crop']},
+            'unlocks': dict(enumerate(unlocked)),
+            'fossils': dict(enumerate(player['fossils_found'])),
+            'items': dict(player['items']),
+            'fish': {i: (f['name'], f['value']) for i, f in enumerate(fish)},
+        }
+
+    def _read_rows(self, conn: 'sqlite3.Connection', player_id: str) -> Optional[Dict[str, Any]]:
+        player = conn.execute(
+            "SELECT money, stamina, max_stamina, last_sleep_time, plot_count FROM players WHERE player_id = ?",
+            (player_id,)).fetchone()
+        if player is None:
+            return None
+        return {
+            'player': tuple(player),
+            'plots': {i: (crop, planted_at) for i, crop, planted_at in conn.execute(
+                "SELECT plot_index, crop, planted_at FROM plots WHERE player_id = ?", (player_id,))},
+            'unlocks': dict(conn.execute("SELECT position, crop FROM unlocks WHERE player_id = ?", (player_id,))),
+            'fossils': dict(conn.execute("SELECT position, name FROM fossils WHERE player_id = ?", (player_id,))),
+            'items': dict(conn.execute("SELECT item_key, effect FROM items WHERE player_id = ?", (player_id,))),
+            'state_parts': dict(conn.execute("SELECT part, state FROM state_parts WHERE player_id = ?", (player_id,))),
+            'fish': {i: (name, value) for i, name, value in conn.execute(
+                "SELECT position, name, value FROM fish WHERE player_id = ?", (player_id,))},
+            'history': {i: tuple(entry) for i, *entry in conn.execute(
+                "SELECT position, day, kind, amount, message FROM history WHERE player_id = ?", (player_id,))},
+        }
+
+    @staticmethod
+    def _diff(old: Dict[Any, Any], new: Dict[Any, Any]) -> Tuple[List[Any], List[Any]]:
+        changed = [(key, value) for key, value in new.items() if old.get(key) != value]
+        removed = [key for key in old if key not in new]
+        return changed, removed
+
+    def save(self, game: GameState):
+        self.save_many([(self.player_id, game)])
+
+    def save_many(self, games: List[Tuple[str, GameState]]):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for player_id, game in games:
+                self._write_player(conn, player_id, game)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            self._saved.clear()
+            raise
+
+    def _write_player(self, conn: 'sqlite3.Connection', player_id: str, game: GameState):
+        new = self._rows(game)
+        old = self._saved.get(player_id)
+        if old is None:
+            old = self._read_rows(conn, player_id) or {
+                'player': None, 'plots': {}, 'unlocks': {}, 'fossils': {}, 'items': {}, 'state_parts': {},
+                'fish': {}, 'history': {}}
+
+        if old['player'] != new['player']:
+            conn.execute("INSERT OR REPLACE INTO players VALUES (?, ?, ?, ?, ?, ?)", (player_id, *new['player']))
+        changed, removed = self._diff(old['plots'], new['plots'])
+        conn.executemany("INSERT OR REPLACE INTO plots VALUES (?, ?, ?, ?)",
+                         [(player_id, i, crop, planted_at) for i, (crop, planted_at) in changed])
+        conn.executemany("DELETE FROM plots WHERE player_id = ? AND plot_index = ?",
+                         [(player_id, i) for i in removed])
+        for table, columns in (('unlocks', ('position', 'crop')), ('fossils', ('position', 'name')),
+                               ('items', ('item_key', 'effect')), ('state_parts', ('part', 'state'))):
+            changed, removed = self._diff(old[table], new[table])
+            conn.executemany(f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?)",
+                             [(player_id, key, value) for key, value in changed])
+            conn.executemany(f"DELETE FROM {table} WHERE player_id = ? AND {columns[0]} = ?",
+                             [(player_id, key) for key in removed])
+        changed, removed = self._diff(old['fish'], new['fish'])
+        conn.executemany("INSERT OR REPLACE INTO fish VALUES (?, ?, ?, ?)",
+                         [(player_id, i, name, value) for i, (name, value) in changed])
+        conn.executemany("DELETE FROM fish WHERE player_id = ? AND position = ?",
+                         [(player_id, i) for i in removed])
+        # O log só cresce enquanto for o mesmo objeto: basta gravar o fim. Depois de carregar ou
+        # desfazer ele é outro objeto, e aí compara com as linhas gravadas uma vez
+        history, rows = game.history, old['history']
+        if old.get('history_log') is history:
+            changed, removed = [(i, tuple(history.entry(i).values())) for i in range(len(rows), len(history))], []
+        else:
+            changed, removed = self._diff(rows, {i: tuple(history.entry(i).values()) for i in range(len(history))})
+        rows.update(changed)
+        for i in removed:
+            del rows[i]
+        new['history'], new['history_log'] = rows, history
+        conn.executemany("INSERT OR REPLACE INTO history VALUES (?, ?, ?, ?, ?, ?)",
+                         [(player_id, i, *entry) for i, entry in changed])
+        conn.executemany("DELETE FROM history WHERE player_id = ? AND position = ?",
+                         [(player_id, i) for i in removed])
+        self._saved[player_id] = new
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        rows = self._read_rows(self._connection(), self.player_id)
+        if rows is None:
+            return None
+        self._saved[self.player_id] = rows
+        money, stamina, max_stamina, last_sleep_time, plot_count = rows['player']
+        data = {part: json.loads(text) for part, text in rows['state_parts'].items()}
+        plots = [{'crop': None, 'planted_at': None} for _ in range(plot_count)]
+        for i, (crop, planted_at) in rows['plots'].items():
+            plots[i] = {'crop': json.loads(crop), 'planted_at': planted_at}
+        items = rows['items']
+        data['player'] = {
+            'money': money,
+            'stamina': stamina,
+            'max_stamina': max_stamina,
+            'last_sleep_time': last_sleep_time,
+            'has_farmdex': 'unlock_farmdex' in items.values(),
+            'fossils_found': [rows['fossils'][i] for i in sorted(rows['fossils'])],
+            'items': items,
+        }
+        data['farm'] = {'plots': plots}
+        data['crop_system']['unlocked_crops'] = [rows['unlocks'][i] for i in sorted(rows['unlocks'])]
+        data['fishing'] = {'caught_fish': [{'name': rows['fish'][i][0], 'value': rows['fish'][i][1]}
+                                           for i in sorted(rows['fish'])]}
+        history = HistoryLog()
+        for i in sorted(rows['history']):
+            history.record(*rows['history'][i])
+        data['history'] = history.to_dict()
+        return data
+
+def migrate_json_to_sqlite(json_path: str, db_path: str, player_id: str) -> bool:
+    game, loaded = GameState.open(JsonStorage(json_path))
+    if not loaded:
+        print(f"No save found at {json_path}.")
+        return False
+    storage = SqliteStorage(db_path, player_id)
+    storage.save(game)
+    storage.close()
+    print(f"Migrated {json_path} into {db_path} as player '{player_id}'.")
+    return True
+
+def run_save_benchmark(plots: int, saves: int, changes: int):
+    crops = list(CropSystem().available_crops.values())
+    rng = random.Random(11)
+    game = GameState()
+    game.farm = FarmSystem(plots)
+    game._wire()
+    for i in range(0, plots, 2):
+        game.farm.plant_crop(i, rng.choice(crops))
+    with tempfile.TemporaryDirectory() as directory:
+        storage = JsonStorage(os.path.join(directory, "bench_save.json"))
+        start = time.perf_counter()
+        json.dumps(game.to_dict())
+        uncached = time.perf_counter() - start
+        start = time.perf_counter()
+        storage.save(game)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(saves):
+            for _ in range(changes):
+                plot_index = rng.randrange(plots)
+                if game.farm.plots[plot_index].is_empty:
+                    game.farm.plant_crop(plot_index, rng.choice(crops))
+                else:
+                    game.farm.plots.mutable(plot_index).planted_at -= timedelta(seconds=1)
+            storage.save(game)
+        warm = (time.perf_counter() - start) / saves
+        size = os.path.getsize(storage.path)
+    print(f"{plots:,} plots, {size / 1e6:.1f} MB per save")
+    print(f"json.dumps(to_dict()) from scratch: {uncached:.3f}s")
+    print(f"First save (fills the JSON fragment caches): {cold:.3f}s")
+    print(f"Repeated save with {changes} changed plots: {warm * 1e3:.1f}ms")
+
+# Primeira sessão numa fazenda pequena: plantar, pragas, virar o dia e colher
+FIRST_SESSION = """
+from datetime import timedelta
+game = hellofarm.GameState(telemetry=hellofarm.TelemetrySystem())
+now = game.time_source()
+for plot_index, key in enumerate(('wheat', 'wheat', 'wheat')):
+    game.plant(hellofarm.CropSystem.catalog()[key], plot_index, now)
+game.farm.pests.seed(1)
+game.next_day()
+game.harvest(now + timedelta(hours=1))
+"""
+
+# Módulos que uma partida pequena não deve importar (ver _LazyModule)
+LAZY_MODULES = ('numpy', 'argparse', 'csv', 'multiprocessing', 'sqlite3', 'subprocess', 'tempfile', 'threading')
+
+def _measure_import(session: str = "") -> Tuple[float, List[str]]:
+    """Importa o módulo (e roda `session`) num processo limpo; retorna (ms, módulos preguiçosos importados)."""
+    script = ("import sys, time\nstart = time.perf_counter()\nimport hellofarm\n" + session
+              + "\nprint((time.perf_counter() - start) * 1e3, *(m for m in hellofarm.LAZY_MODULES if m in sys.modules))")
+    directory = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.run([sys.executable, "-c", script], cwd=directory,
+                            capture_output=True, text=True, check=True).stdout.split()
+    return float(output[0]), output[1:]
+
+def run_startup_benchmark(runs: int, import_budget_ms: Optional[float]) -> int:
+    imports = [_measure_import() for _ in range(runs)]
+    import_ms = min(ms for ms, _ in imports)
+    import_loaded = sorted({name for _, loaded in imports for name in loaded})
+    sessions = [_measure_import(FIRST_SESSION) for _ in range(runs)]
+    session_ms = min(ms for ms, _ in sessions)
+    session_loaded = sorted({name for _, loaded in sessions for name in loaded})
+    with tempfile.TemporaryDirectory() as directory:
+        storage = JsonStorage(os.path.join(directory, "bench_startup.json"))
+        start = time.perf_counter()
+        for _ in range(runs):
+            game = GameState(storage, TelemetrySystem())
+        fresh = (time.perf_counter() - start) / runs
+        storage.save(game)
+        start = time.perf_counter()
+        for _ in range(runs):
+            GameState.open(storage, TelemetrySystem())
+        opened = (time.perf_counter() - start) / runs
+    print(f"Module import (best of {runs}): {import_ms:.1f}ms, "
+          f"optional modules imported: {', '.join(import_loaded) or 'none'}")
+    print(f"New game: {fresh * 1e3:.1f}ms")
+    print(f"Open from save: {opened * 1e3:.1f}ms")
+    print(f"First session, import to harvest (best of {runs}): {session_ms:.1f}ms, "
+          f"optional modules imported: {', '.join(session_loaded) or 'none'}")
+    status = 0
+    if import_budget_ms is not None and import_ms > import_budget_ms:
+        print(f"Import time over budget ({import_ms:.1f}ms > {import_budget_ms:.1f}ms).")
+        status = 1
+    if import_loaded or session_loaded:
+        print(f"{', '.join(sorted(set(import_loaded) | set(session_loaded)))} imported on the small-farm path; "
+              "these should load only for benchmarks, SQLite saves, telemetry or large farms.")
+        status = 1
+    return status
+
+def run_storage_benchmark(db_path: str, farms: int, threads: int, rounds: int, plots: int):
+    if os.path.exists(db_path):
+        print(f"Refusing to overwrite existing database {db_path}.")
+        return
+    crops = list(CropSystem().available_crops.values())
+    rng = random.Random(7)
+    games = []
+    for _ in range(farms):
+        game = GameState()
+        game.farm = FarmSystem(plots)
+        game._wire()
+        for i in range(0, plots, 2):
+            game.farm.plant_crop(i, rng.choice(crops))
+        games.append(game)
+    storage = SqliteStorage(db_path)
+
+    def save_slice(worker: int):
+        for player in range(worker, farms, threads):
+            storage.for_player(f"farm-{player}").save(games[player])
+        storage.close()
+
+    def timed_round() -> float:
+        start = time.perf_counter()
+        workers = [threading.Thread(target=save_slice, args=(w,)) for w in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return time.perf_counter() - start
+
+    elapsed = timed_round()
+    print(f"Initial save: {farms} farms x {plots} plots on {threads} threads in {elapsed:.2f}s "
+          f"({farms / elapsed:,.0f} farms/s)")
+    for round_number in range(rounds):
+        for game in games:
+            game.player.earn_money(1)
+            plot_index = rng.randrange(plots)
+            if game.farm.plots[plot_index].is_empty:
+                game.farm.plant_crop(plot_index, rng.choice(crops))
+        elapsed = timed_round()
+        print(f"Incremental save {round_number + 1}: {farms / elapsed:,.0f} farms/s")
+
+    start = time.perf_counter()
+    batch = [(f"farm-{i}", game) for i, game in enumerate(games)]
+    for game in games:
+        game.player.earn_money(1)
+    storage.save_many(batch)
+    elapsed = time.perf_counter() - start
+    print(f"Batched save of all farms in one transaction: {farms / elapsed:,.0f} farms/s")
+    storage.close()
+
+# ==================== Execução em Shards ====================
+_shard_columns: Dict[str, Any] = {}
+# Horários de plantio vão para a coluna como microssegundos inteiros desde esta época (ingênua,
+# como os datetimes do jogo), então a comparação com o FarmSystem é exata
+_SHARD_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def _to_micros(when: datetime) -> int:
+    return (when - _SHARD_EPOCH) // _MICROSECOND
+
+def _attach_shard_columns(crop_block: str, time_block: str, size: int,
+                          growth_times: List[float], values: List[int]):
+    crop_shm = shared_memory.SharedMemory(name=crop_block)
+    time_shm = shared_memory.SharedMemory(name=time_block)
+    _shard_columns.update(
+        crop_shm=crop_shm,
+        time_shm=time_shm,
+        crop_ids=crop_shm.buf[:size * 4].cast('i'),
+        planted=time_shm.buf[:size * 8].cast('q'),
+        growth_times=growth_times,
+        values=values,
+    )
+
+def _shard_harvest(start: int, end: int, now: int,
+                   columns: Optional[Dict[str, Any]] = None) -> Tuple[int, int]:
+    columns = columns or _shard_columns
+    crop_ids, planted = columns['crop_ids'], columns['planted']
+    growth_times, values = columns['growth_times'], columns['values']
+    durations = [round(growth_time * 1_000_000) for growth_time in growth_times]
+    total = 0
+    harvested = 0
+    for i in range(start, end):
+        crop_id = crop_ids[i]
+        if crop_id >= 0 and now - planted[i] >= durations[crop_id]:
+            total += values[crop_id]
+            harvested += 1
+            crop_ids[i] = -1
+    return total, harvested
+
+def _shard_damage(indices: List[int], columns: Optional[Dict[str, Any]] = None) -> int:
+    columns = columns or _shard_columns
+    crop_ids = columns['crop_ids']
+    damaged = 0
+    for i in indices:
+        if crop_ids[i] >= 0:
+            crop_ids[i] = -1
+            damaged += 1
+    return damaged
+
+class ShardedFarm:
+    """Colunas dos lotes em memória compartilhada, processadas por um pool persistente.
+
+    Com workers=1 as operações rodam no próprio processo sobre as mesmas colunas,
+    então o caminho serial e o paralelo produzem exatamente os mesmos valores. Só o
+    bench-shards usa esta classe: a colheita daqui ignora as taxas por região do
+    GrowthTimeline, e copiar a fazenda para as colunas a cada tique custaria O(fazenda).
+    """
+
+    def __init__(self, crops: List[Crop], size: int, workers: int = 1):
+        self.crops = list(crops)
+        self.crop_index = {id(crop): i for i, crop in enumerate(self.crops)}
+        self.size = size
+        self.workers = max(1, workers)
+        self.growth_times = [float(crop.growth_time) for crop in self.crops]
+        self.values = [crop.value for crop in self.crops]
+
+        self._crop_shm = shared_memory.SharedMemory(create=True, size=max(1, size) * 4)
+        self._time_shm = shared_memory.SharedMemory(create=True, size=max(1, size) * 8)
+        self.crop_ids = self._crop_shm.buf[:size * 4].cast('i')
+        self.planted = self._time_shm.buf[:size * 8].cast('q')
+        for i in range(size):
+            self.crop_ids[i] = -1
+            self.planted[i] = 0
+        self._local = {
+            'crop_ids': self.crop_ids,
+            'planted': self.planted,
+            'growth_times': self.growth_times,
+            'values': self.values,
+        }
+        self._pool = None
+        if self.workers > 1:
+            self._pool = multiprocessing.Pool(
+                self.workers,
+                initializer=_attach_shard_columns,
+                initargs=(self._crop_shm.name, self._time_shm.name, size, self.growth_times, self.values)
+            )
+
+    def _shards(self) -> List[Tuple[int, int]]:
+        step = (self.size + self.workers - 1) // self.workers
+        return [(start, min(start + step, self.size)) for start in range(0, self.size, max(1, step))]
+
+    def harvest_ready_crops(self, now: Optional[datetime] = None) -> Tuple[int, int]:
+        now = _to_micros(now or datetime.now())
+        if self._pool is None:
+            return _shard_harvest(0, self.size, now, self._local)
+        tasks = [(start, end, now) for start, end in self._shards()]
+        results = self._pool.starmap(_shard_harvest, tasks)
+        return sum(r[0] for r in results), sum(r[1] for r in results)
+
+    def damage(self, indices: List[int]) -> int:
+        if self._pool is None:
+            return _shard_damage(indices, self._local)
+        buckets = [[] for _ in range(self.workers)]
+        step = (self.size + self.workers - 1) // self.workers
+        for i in indices:
+            buckets[i // step].append(i)
+        return sum(self._pool.map(_shard_damage, [b for b in buckets if b]))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        self.crop_ids.release()
+        self.planted.release()
+        self._local.clear()
+        self._crop_shm.close()
+        self._crop_shm.unlink()
+        self._time_shm.close()
+        self._time_shm.unlink()
+
+    def __enter__(self) -> 'ShardedFarm':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def run_shard_benchmark(plots: int, max_workers: int, repeat: int = 3):
+    crops = list(CropSystem().available_crops.values())
+    rng = random.Random(42)
+    now = datetime.now()
+    crop_ids = [rng.randrange(-1, len(crops)) for _ in range(plots)]
+    planted = [now - timedelta(seconds=rng.uniform(0, 60)) for _ in range(plots)]
+    damaged = rng.sample(range(plots), min(plots, 1000))
+
+    # Referência: o próprio FarmSystem, com o laço direto nos lotes
+    farm = FarmSystem(plots)
+    for i, crop_id in enumerate(crop_ids):
+        if crop_id >= 0:
+            farm.plots[i] = Plot(crops[crop_id], planted[i])
+    farm._rebuild_occupied()
+    start = time.perf_counter()
+    lost = 0
+    for i in damaged:
+        if not farm.plots[i].is_empty:
+            farm.plots[i] = Plot()
+            farm._mark_empty(i)
+            lost += 1
+    ready = farm.tick(now).ready
+    baseline = time.perf_counter() - start
+    total = sum(farm.plots[i].crop.value for i in ready)
+    harvested = set(ready)
+    expected = (lost, total, len(ready),
+                {i: _to_micros(farm.plots[i].planted_at) for i in farm.occupied_plots() if i not in harvested})
+    planted = [_to_micros(when) for when in planted]
+
+    results = []
+    for workers in range(1, max_workers + 1):
+        with ShardedFarm(crops, plots, workers) as sharded:
+            best = float('inf')
+            for _ in range(repeat):
+                for i in range(plots):
+                    sharded.crop_ids[i] = crop_ids[i]
+                    sharded.planted[i] = planted[i]
+                start = time.perf_counter()
+                lost = sharded.damage(damaged)
+                total, harvested = sharded.harvest_ready_crops(now)
+                best = min(best, time.perf_counter() - start)
+            outcome = (lost, total, harvested,
+                       {i: sharded.planted[i] for i in range(plots) if sharded.crop_ids[i] >= 0})
+        if outcome != expected:
+            raise RuntimeError(f"Sharded result with {workers} workers differs from FarmSystem")
+        results.append((workers, best))
+
+    print(f"Sharded farm tick: {plots:,} plots (damage + harvest), best of {repeat}")
+    print(f"FarmSystem  {baseline * 1000:9.1f} ms  (reference, same results)")
+    serial = results[0][1]
+    for workers, elapsed in results:
+        speedup = serial / elapsed if elapsed else 0.0
+        bar = '█' * max(1, int(round(speedup * 10)))
+        print(f"{workers:>3} core(s) {elapsed * 1000:9.1f} ms  x{speedup:4.2f} {bar}")
+
+# ==================== Análise de Saves ====================
+class SaveAnalytics:
+    """Agregados de muitos saves, calculados em paralelo e mesclados em streaming."""
+    # Partes do save que a análise lê; o jogo as grava primeiro, então o resto nem é decodificado
+    PARTS = ('player', 'farm', 'crop_system')
+    _SPACE = re.compile(r'\s*')
+
+    def __init__(self):
+        self.saves = 0
+        self.corrupt = 0
+        self.money_sum = 0
+        self.money_min: Optional[int] = None
+        self.money_max: Optional[int] = None
+        self.money_buckets: Counter = Counter()
+        self.unlock_counts: Counter = Counter()
+        self.unlocked_crops: Counter = Counter()
+        self.fossil_counts: Counter = Counter()
+        self.plots_total = 0
+        self.plots_occupied = 0
+        self.crop_mix: Counter = Counter()
+
+    @staticmethod
+    def money_bucket(money: int) -> int:
+        # Buckets logarítmicos com 8 subdivisões por potência de 2 (~12% de resolução)
+        if money < 16:
+            return max(0, money)
+        shift = money.bit_length() - 4
+        return (money >> shift) << shift
+
+    @staticmethod
+    def _decode_object(pairs: List[Tuple[str, Any]]) -> Any:
+        data = dict(pairs)
+        if 'growth_time' in data and 'name' in data:
+            return data['name']
+        return data
+
+    @classmethod
+    def _read_parts(cls, text: str) -> Dict[str, Any]:
+        """Decodifica as chaves de topo do save uma a uma e para assim que tiver as PARTS."""
+        decoder = json.JSONDecoder(object_pairs_hook=cls._decode_object)
+        space = cls._SPACE
+        pos = space.match(text).end()
+        if text[pos:pos + 1] != '{':
+            raise ValueError("a save must be a JSON object")
+        pos += 1
+        data: Dict[str, Any] = {}
+        while len(data) < len(cls.PARTS):
+            pos = space.match(text, pos).end()
+            if text[pos:pos + 1] == '}':
+                break
+            key, pos = decoder.raw_decode(text, pos)
+            pos = space.match(text, pos).end()
+            if text[pos:pos + 1] != ':':
+                raise ValueError("expected ':'")
+            value, pos = decoder.raw_decode(text, space.match(text, pos + 1).end())
+            if key in cls.PARTS:
+                data[key] = value
+            pos = space.match(text, pos).end()
+            if text[pos:pos + 1] == ',':
+                pos += 1
+        return data
+
+    def add_file(self, path: str):
+        try:
+            with open(path, 'r') as f:
+                data = self._read_parts(f.read())
+            money = int(data['player']['money'])
+            fossils = len(data['player'].get('fossils_found', []))
+            unlocked = list(data['crop_system']['unlocked_crops'])
+            plots = data['farm']['plots']
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self.corrupt += 1
+            return
+
+        self.saves += 1
+        self.money_sum += money
+        self.money_min = money if self.money_min is None else min(self.money_min, money)
+        self.money_max = money if self.money_max is None else max(self.money_max, money)
+        self.money_buckets[self.money_bucket(money)] += 1
+        self.unlock_counts[len(unlocked)] += 1
+        self.unlocked_crops.update(unlocked)
+        self.fossil_counts[fossils] += 1
+        self.plots_total += len(plots)
+        for plot in plots:
+            crop = plot.get('crop') if isinstance(plot, dict) else None
+            if crop:
+                self.plots_occupied += 1
+                self.crop_mix[crop] += 1
+
+    def merge(self, other: 'SaveAnalytics'):
+        self.saves += other.saves
+        self.corrupt += other.corrupt
+        self.money_sum += other.money_sum
+        for bound in (other.money_min, other.money_max):
+            if bound is not None:
+                self.money_min = bound if self.money_min is None else min(self.money_min, bound)
+                self.money_max = bound if self.money_max is None else max(self.money_max, bound)
+        self.money_buckets.update(other.money_buckets)
+        self.unlock_counts.update(other.unlock_counts)
+        self.unlocked_crops.update(other.unlocked_crops)
+        self.fossil_counts.update(other.fossil_counts)
+        self.plots_total += other.plots_total
+        self.plots_occupied += other.plots_occupied
+        self.crop_mix.update(other.crop_mix)
+
+    def money_percentile(self, percent: float) -> int:
+        if not self.saves:
+            return 0
+        target = self.saves * percent / 100
+        seen = 0
+        for bucket in sorted(self.money_buckets):
+            seen += self.money_buckets[bucket]
+            if seen >= target:
+                return bucket
+        return self.money_max or 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'saves': self.saves,
+            'corrupt': self.corrupt,
+            'money': {
+                'mean': self.money_sum / self.saves if self.saves else 0,
+                'min': self.money_min,
+                'max': self.money_max,
+                'percentiles': {p: self.money_percentile(p) for p in (10, 25, 50, 75, 90, 99)},
+                'histogram': dict(sorted(self.money_buckets.items())),
+            },
+            'unlocks': {
+                'crops_unlocked': dict(sorted(self.unlock_counts.items())),
+                'by_crop': dict(self.unlocked_crops.most_common()),
+            },
+            'fossils': {
+                'found': dict(sorted(self.fossil_counts.items())),
+                'complete': self.fossil_counts.get(len(FOSSILS), 0),
+            },
+            'occupancy': {
+                'plots': self.plots_total,
+                'occupied': self.plots_occupied,
+                'crop_mix': dict(self.crop_mix.most_common()),
+            },
+        }
+
+    @staticmethod
+    def iter_save_files(directory: str):
+        for root, _dirs, files in os.walk(directory):
+            for name in files:
+                if name.endswith('.json'):
+                    yield os.path.join(root, name)
+
+    @staticmethod
+    def _analyze_chunk(paths: List[str]) -> 'SaveAnalytics':
+        partial = SaveAnalytics()
+        for path in paths:
+            partial.add_file(path)
+        return partial
+
+    @classmethod
+    def scan(cls, directory: str, workers: Optional[int] = None, chunk_size: int = 256) -> 'SaveAnalytics':
+        def chunks():
+            chunk = []
+            for path in cls.iter_save_files(directory):
+                chunk.append(path)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+        total = cls()
+        with multiprocessing.Pool(workers) as pool:
+            for partial in pool.imap_unordered(cls._analyze_chunk, chunks()):
+                total.merge(partial)
+        return total
+
+    def print_report(self):
+        data = self.to_dict()
+        print(f"Saves analysed: {self.saves:,} ({self.corrupt:,} corrupt or unreadable)")
+        if not self.saves:
+            return
+        money = data['money']
+        print(f"\nMoney: mean ${money['mean']:,.0f}, min ${money['min']:,}, max ${money['max']:,}")
+        print("  " + ", ".join(f"p{p}≈${v:,}" for p, v in money['percentiles'].items()))
+        coarse: Counter = Counter()
+        for bucket, count in self.money_buckets.items():
+            coarse[1 << (bucket.bit_length() - 1) if bucket > 0 else 0] += count
+        peak = max(coarse.values())
+        for bucket, count in sorted(coarse.items()):
+            print(f"  ${bucket:>10,}+ {'█' * max(1, count * 40 // peak)} {count:,}")
+        print("\nCrops unlocked per save:")
+        for unlocked, count in data['unlocks']['crops_unlocked'].items():
+            print(f"  {unlocked:>2} crops: {count:,}")
+        print("  " + ", ".join(f"{name}: {count * 100 / self.saves:.1f}%" for name, count in data['unlocks']['by_crop'].items()))
+        print(f"\nFossils: {data['fossils']['complete']:,} complete collections ({len(FOSSILS)})")
+        for found, count in data['fossils']['found'].items():
+            print(f"  {found:>2}/{len(FOSSILS)}: {count:,}")
+        occupancy = data['occupancy']
+        ratio = occupancy['occupied'] * 100 / occupancy['plots'] if occupancy['plots'] else 0
+        print(f"\nFarm occupancy: {occupancy['occupied']:,}/{occupancy['plots']:,} plots ({ratio:.1f}%)")
+        for name, count in occupancy['crop_mix'].items():
+            print(f"  {name}: {count:,}")
+
+# ==================== Ambiente para Agentes ====================
+class FarmEnv:
+    """Interface reset()/step() sobre o GameState, sem I/O de terminal nem sleeps.
+
+    O relógio é simulado: cada passo avança `step_seconds` segundos de jogo.
+    Ações: 0 esperar, 1 colher, 2 próximo dia, 3 dormir (só à noite), 4 cochilar e
+    5 + lote * n_culturas + cultura para plantar.
+    """
+    WAIT, HARVEST, NEXT_DAY, SLEEP, NAP = range(5)
+    PLANT_OFFSET = 5
+    EPOCH = datetime(2000, 1, 1)
+
+    def __init__(self, step_seconds: float = 5.0, max_steps: int = 2000):
+        self.step_seconds = step_seconds
+        self.max_steps = max_steps
+        self.crop_keys = list(CropSystem().available_crops)
+        self.plot_count = len(FarmSystem().plots)
+        self.game: Optional[GameState] = None
+
+    @property
+    def action_count(self) -> int:
+        return self.PLANT_OFFSET + self.plot_count * len(self.crop_keys)
+
+    @property
+    def observation_size(self) -> int:
+        return 2 * self.plot_count + 6 + len(self.crop_keys)
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[List[float], Dict[str, Any]]:
+        self.now = self.EPOCH
+        game = GameState(telemetry=TelemetrySystem(), seed=seed, time_source=lambda: self.now)
+        self.game = game
+        self.part_elapsed = 0.0
+        self.steps = 0
+        return self.observation(), {}
+
+    def observation(self) -> List[float]:
+        game = self.game
+        crop_ids = {key: i for i, key in enumerate(game.crop_system.available_crops)}
+        plots = game.farm.plots
+        snapshot = game.farm.tick(self.now)
+        unlocked = set(game.crop_system.unlocked_crops)
+        return (
+            [float(crop_ids[plot.crop.key] + 1) if plot.crop else 0.0 for plot in plots]
+            + [snapshot.progress_of(plot_idx) for plot_idx in range(len(plots))]
+            + [float(game.player.stamina), float(game.player.max_stamina), float(game.player.money),
+               float(game.time_system.day), float(game.day_cycle_system.current_part_index),
+               float(game.weather_system.regions[0])]
+            + [1.0 if key in unlocked else 0.0 for key in self.crop_keys]
+        )
+
+    def step(self, action: int) -> Tuple[List[float], float, bool, bool, Dict[str, Any]]:
+        game = self.game
+        money_before = game.player.money
+        day_before = game.time_system.day
+        message = None
+
+        if action == self.HARVEST:
+            if game.can_work() and game.player.has_stamina(0.5):
+                game.harvest(self.now)
+        elif action == self.NEXT_DAY:
+            _success, message = game.next_day()
+        elif action == self.SLEEP:
+            _slept, message = game.sleep()
+        elif action == self.NAP:
+            message = "\n".join(game.nap()) or None
+            self.part_elapsed = 0.0
+        elif action >= self.PLANT_OFFSET:
+            plot_index, crop_index = divmod(action - self.PLANT_OFFSET, len(self.crop_keys))
+            key = self.crop_keys[crop_index] if crop_index < len(self.crop_keys) else None
+            if key in game.crop_system.unlocked_crops and game.can_work():
+                game.plant(game.crop_system.available_crops[key], plot_index, self.now)
+
+        if game.time_system.day != day_before:
+            self.part_elapsed = 0.0
+        self.now += timedelta(seconds=self.step_seconds)
+        self.part_elapsed += self.step_seconds
+        cycle = game.day_cycle_system
+        if self.part_elapsed >= cycle.durations[cycle.get_current_part()] * 60:
+            cycle.current_part_index = (cycle.current_part_index + 1) % len(cycle.PARTS)
+            self.part_elapsed = 0.0
+
+        self.steps += 1
+        reward = float(game.player.money - money_before)
+        truncated = self.steps >= self.max_steps
+        return self.observation(), reward, False, truncated, {'event': message}
+
+class VectorFarmEnv:
+    """N fazendas independentes avançando em lockstep sobre estado em arrays.
+
+    Mesmas ações e observações de FarmEnv, sobre um subconjunto das regras do GameState:
+    plantio, colheita, stamina, sono e cochilo, desbloqueios por dia (GameState.UNLOCK_DAYS),
+    partes do dia e a taxa de crescimento estação x clima Markov de cada região. Ficam de
+    fora eventos aleatórios (e com eles a seca e os bônus), mercador, pesca, pragas,
+    vizinhança entre culturas e campos extras. Usa NumPy quando disponível e listas puras
+    caso contrário; os dois caminhos sorteiam o clima do mesmo RandomStream na mesma
+    ordem e chegam ao mesmo estado (`run_env_benchmark` confere).
+    Fazendas que atingem `max_steps` são reiniciadas automaticamente.
+    """
+    def __init__(self, num_envs: int, step_seconds: float = 5.0, max_steps: int = 2000,
+                 seed: Optional[int] = None, plots: int = 9, use_numpy: Optional[bool] = None):
+        self.num_envs = num_envs
+        self.step_seconds = step_seconds
+        self.max_steps = max_steps
+        self.plot_count = plots
+        self.regions = (plots + FarmSystem.REGION_SIZE - 1) // FarmSystem.REGION_SIZE
+        self.plot_region = [plot_idx // FarmSystem.REGION_SIZE for plot_idx in range(plots)]
+        crops = CropSystem().available_crops
+        self.crop_keys = list(crops)
+        self.cost = [crops[k].cost for k in self.crop_keys]
+        self.growth = [float(crops[k].growth_time) for k in self.crop_keys]
+        self.value = [crops[k].value for k in self.crop_keys]
+        self.stamina_cost = [float(crops[k].stamina_cost) for k in self.crop_keys]
+        self.unlock_index = {self.crop_keys.index(k): day for k, day in GameState.UNLOCK_DAYS.items() if k in crops}
+        self.part_seconds = []
+        for season in TimeSystem.SEASONS:
+            cycle = DayCycleSystem(TimeSystem())
+            cycle.time_system.day = TimeSystem.SEASONS.index(season) * 30 + 1
+            durations = cycle.get_durations_for_current_season()
+            self.part_seconds.append([durations[part] * 60.0 for part in DayCycleSystem.PARTS])
+        self.weather_cumulative = [WeatherSystem._cumulative(season) for season in TimeSystem.SEASONS]
+        self.weather_modifiers = WeatherSystem.MODIFIERS
+        self.season_rates = [GrowthTimeline.SEASON_RATES[season] for season in TimeSystem.SEASONS]
+        self.use_numpy = np is not None if use_numpy is None else use_numpy and np is not None
+        self._rng = RandomStream(seed) if seed is not None else RandomStream.unseeded()
+        if self.use_numpy:
+            self._np_tables()
+
+    @property
+    def action_count(self) -> int:
+        return FarmEnv.PLANT_OFFSET + self.plot_count * len(self.crop_keys)
+
+    @property
+    def observation_size(self) -> int:
+        return 2 * self.plot_count + 6 + len(self.crop_keys)
+
+    @property
+    def initial_rate(self) -> float:
+        """Taxa do primeiro dia: primavera com o clima inicial (ensolarado), como num jogo novo."""
+        return self.season_rates[0] * self.weather_modifiers[0]
+
+    def _np_tables(self):
+        self.np_cost = np.asarray(self.cost, dtype=np.float64)
+        self.np_growth = np.asarray(self.growth, dtype=np.float64)
+        self.np_value = np.asarray(self.value, dtype=np.float64)
+        self.np_stamina_cost = np.asarray(self.stamina_cost, dtype=np.float64)
+        self.np_part_seconds = np.asarray(self.part_seconds, dtype=np.float64)
+        self.np_weather_cumulative = np.asarray(self.weather_cumulative, dtype=np.float64)
+        self.np_weather_modifiers = np.asarray(self.weather_modifiers, dtype=np.float64)
+        self.np_season_rates = np.asarray(self.season_rates, dtype=np.float64)
+        self.np_plot_region = np.asarray(self.plot_region, dtype=np.int64)
+
+    def reset(self) -> Any:
+        self._reset_envs(list(range(self.num_envs)), initial=True)
+        return self.observations()
+
+    def _reset_envs(self, envs: List[int], initial: bool = False):
+        n, p, c, r = self.num_envs, self.plot_count, len(self.crop_keys), self.regions
+        if self.use_numpy:
+            if initial:
+                self.crop = np.full((n, p), -1, dtype=np.int64)
+                # planted guarda o relógio de crescimento da região do lote no plantio
+                self.planted = np.zeros((n, p))
+                self.growth_clock = np.zeros((n, r))
+                self.rate = np.zeros((n, r))
+                self.money = np.full(n, 50.0)
+                self.stamina = np.full(n, 5.0)
+                self.max_stamina = np.full(n, 5.0)
+                self.day = np.ones(n, dtype=np.int64)
+                self.part = np.zeros(n, dtype=np.int64)
+                self.part_elapsed = np.zeros(n)
+                self.weather = np.zeros((n, r), dtype=np.int64)
+                self.unlocked = np.zeros((n, c), dtype=bool)
+                self.steps = np.zeros(n, dtype=np.int64)
+            rows = np.asarray(envs, dtype=np.int64)
+            self.crop[rows] = -1
+            self.planted[rows] = 0.0
+            self.growth_clock[rows] = 0.0
+            self.rate[rows] = self.initial_rate
+            self.money[rows] = 50.0
+            self.stamina[rows] = 5.0
+            self.max_stamina[rows] = 5.0
+            self.day[rows] = 1
+            self.part[rows] = 0
+            self.part_elapsed[rows] = 0.0
+            self.weather[rows] = 0
+            self.unlocked[rows] = False
+            self.unlocked[rows, self.crop_keys.index('wheat')] = True
+            self.steps[rows] = 0
+            return
+        if initial:
+            self.crop = [[-1] * p for _ in range(n)]
+            self.planted = [[0.0] * p for _ in range(n)]
+            self.growth_clock = [[0.0] * r for _ in range(n)]
+            self.rate = [[0.0] * r for _ in range(n)]
+            self.money = [50.0] * n
+            self.stamina = [5.0] * n
+            self.max_stamina = [5.0] * n
+            self.day = [1] * n
+            self.part = [0] * n
+            self.part_elapsed = [0.0] * n
+            self.weather = [[0] * r for _ in range(n)]
+            self.unlocked = [[False] * c for _ in range(n)]
+            self.steps = [0] * n
+        wheat = self.crop_keys.index('wheat')
+        for e in envs:
+            self.crop[e] = [-1] * p
+            self.planted[e] = [0.0] * p
+            self.growth_clock[e] = [0.0] * r
+            self.rate[e] = [self.initial_rate] * r
+            self.money[e] = 50.0
+            self.stamina[e] = 5.0
+            self.max_stamina[e] = 5.0
+            self.day[e] = 1
+            self.part[e] = 0
+            self.part_elapsed[e] = 0.0
+            self.weather[e] = [0] * r
+            self.unlocked[e] = [i == wheat for i in range(c)]
+            self.steps[e] = 0
+
+    def observations(self) -> Any:
+        if self.use_numpy:
+            crop = np.maximum(self.crop, 0)
+            clock = self.growth_clock[:, self.np_plot_region]
+            progress = np.where(self.crop >= 0, np.minimum(1.0, (clock - self.planted) / self.np_growth[crop]), 0.0)
+            return np.concatenate([
+                (self.crop + 1).astype(np.float64), progress,
+                np.stack([self.stamina, self.max_stamina, self.money, self.day.astype(np.float64),
+                          self.part.astype(np.float64), self.weather[:, 0].astype(np.float64)], axis=1),
+                self.unlocked.astype(np.float64),
+            ], axis=1)
+        observations = []
+        growth, plot_region = self.growth, self.plot_region
+        for e in range(self.num_envs):
+            clock = self.growth_clock[e]
+            crops = self.crop[e]
+            planted = self.planted[e]
+            observations.append(
+                [float(cid + 1) for cid in crops]
+                + [min(1.0, (clock[plot_region[i]] - planted[i]) / growth[cid]) if cid >= 0 else 0.0
+                   for i, cid in enumerate(crops)]
+                + [self.stamina[e], self.max_stamina[e], self.money[e], float(self.day[e]),
+                   float(self.part[e]), float(self.weather[e][0])]
+                + [1.0 if u else 0.0 for u in self.unlocked[e]]
+            )
+        return observations
+
+    def step(self, actions: Any) -> Tuple[Any, Any, Any, Any, Dict[str, Any]]:
+        if self.use_numpy:
+            rewards, truncated = self._step_numpy(np.asarray(actions, dtype=np.int64))
+        else:
+            rewards, truncated = self._step_python(actions)
+        observations = self.observations()
+        terminated = np.zeros(self.num_envs, dtype=bool) if self.use_numpy else [False] * self.num_envs
+        return observations, rewards, terminated, truncated, {}
+
+    def _step_numpy(self, actions: Any) -> Tuple[Any, Any]:
+        n = self.num_envs
+        rows = np.arange(n)
+        money_before = self.money.copy()
+        can_work = self.part != 3
+
+        harvest = (actions == FarmEnv.HARVEST) & can_work & (self.stamina >= 0.5)
+        crop = np.maximum(self.crop, 0)
+        clock = self.growth_clock[:, self.np_plot_region]
+        ready = harvest[:, None] & (self.crop >= 0) & ((clock - self.planted) >= self.np_growth[crop])
+        gain = np.where(ready, self.np_value[crop], 0.0).sum(axis=1)
+        self.money += gain
+        self.stamina -= np.where(gain > 0, 0.5, 0.0)
+        self.crop[ready] = -1
+
+        # Dormir passa o dia como next_day (se houver 1 de stamina) e depois restaura tudo
+        sleep = (actions == FarmEnv.SLEEP) & (self.part == 3)
+        advance = ((actions == FarmEnv.NEXT_DAY) | sleep) & (self.stamina >= 1.0)
+        self.stamina -= np.where(advance, 1.0, 0.0)
+        self.stamina = np.where(sleep, self.max_stamina, self.stamina)
+        if advance.any():
+            self.day += advance
+            self.part[advance] = 0
+            self.part_elapsed[advance] = 0.0
+            for crop_index, unlock_day in self.unlock_index.items():
+                self.unlocked[advance & (self.day >= unlock_day), crop_index] = True
+            season = (self.day - 1) // 30 % 4
+            draws = np.asarray(self._rng.draws(n * self.regions), dtype=np.float64).reshape(n, self.regions)
+            cumulative = self.np_weather_cumulative[season[:, None], self.weather]
+            weather = (draws[:, :, None] >= cumulative).sum(axis=2).clip(max=3)
+            self.weather = np.where(advance[:, None], weather, self.weather)
+            rate = self.np_season_rates[season][:, None] * self.np_weather_modifiers[self.weather]
+            self.rate = np.where(advance[:, None], rate, self.rate)
+
+        nap = actions == FarmEnv.NAP
+        self.stamina = np.where(nap, np.minimum(self.max_stamina, self.stamina + 1.0), self.stamina)
+        self.part = np.where(nap, (self.part + 1) % 4, self.part)
+        self.part_elapsed[nap] = 0.0
+
+        plant = (actions >= FarmEnv.PLANT_OFFSET) & can_work
+        index = np.where(plant, actions - FarmEnv.PLANT_OFFSET, 0)
+        plot, crop_index = np.divmod(index, len(self.crop_keys))
+        plant &= plot < self.plot_count
+        plot = np.minimum(plot, self.plot_count - 1)
+        plant &= (self.unlocked[rows, crop_index] & (self.crop[rows, plot] < 0)
+                  & (self.money >= self.np_cost[crop_index]) & (self.stamina >= self.np_stamina_cost[crop_index]))
+        planted_rows = rows[plant]
+        self.crop[planted_rows, plot[plant]] = crop_index[plant]
+        self.planted[planted_rows, plot[plant]] = self.growth_clock[planted_rows, self.np_plot_region[plot[plant]]]
+        self.money -= np.where(plant, self.np_cost[crop_index], 0.0)
+        self.stamina -= np.where(plant, self.np_stamina_cost[crop_index], 0.0)
+
+        self.growth_clock += self.step_seconds * self.rate
+        self.part_elapsed += self.step_seconds
+        season = (self.day - 1) // 30 % 4
+        roll = self.part_elapsed >= self.np_part_seconds[season, self.part]
+        self.part = np.where(roll, (self.part + 1) % 4, self.part)
+        self.part_elapsed[roll] = 0.0
+
+        rewards = self.money - money_before
+        self.steps += 1
+        truncated = self.steps >= self.max_steps
+        if truncated.any():
+            self._reset_envs(np.flatnonzero(truncated).tolist())
+        return rewards, truncated
+
+    def _step_python(self, actions: List[int]) -> Tuple[List[float], List[bool]]:
+        step_seconds = self.step_seconds
+        growth, value, cost, stamina_cost = self.growth, self.value, self.cost, self.stamina_cost
+        plot_region, modifiers, regions = self.plot_region, self.weather_modifiers, self.regions
+        crop_count = len(self.crop_keys)
+        draws = None
+        rewards = []
+        truncated = []
+        finished = []
+        for e, action in enumerate(actions):
+            money_before = self.money[e]
+            part = self.part[e]
+            crops = self.crop[e]
+            clock = self.growth_clock[e]
+            rate = self.rate[e]
+            if action == FarmEnv.HARVEST:
+                if part != 3 and self.stamina[e] >= 0.5:
+                    planted = self.planted[e]
+                    gain = 0
+                    for i, cid in enumerate(crops):
+                        if cid >= 0 and clock[plot_region[i]] - planted[i] >= growth[cid]:
+                            gain += value[cid]
+                            crops[i] = -1
+                    if gain:
+                        self.money[e] += gain
+                        self.stamina[e] -= 0.5
+            elif action == FarmEnv.NEXT_DAY or action == FarmEnv.SLEEP:
+                sleep = action == FarmEnv.SLEEP and part == 3
+                advance = (action == FarmEnv.NEXT_DAY or sleep) and self.stamina[e] >= 1.0
+                if advance:
+                    self.stamina[e] -= 1.0
+                if sleep:
+                    self.stamina[e] = self.max_stamina[e]
+                if advance:
+                    day = self.day[e] = self.day[e] + 1
+                    part = self.part[e] = 0
+                    self.part_elapsed[e] = 0.0
+                    for crop_index, unlock_day in self.unlock_index.items():
+                        if day >= unlock_day:
+                            self.unlocked[e][crop_index] = True
+                    if draws is None:
+                        draws = self._rng.draws(self.num_envs * regions)
+                    season = (day - 1) // 30 % 4
+                    rows = self.weather_cumulative[season]
+                    season_rate = self.season_rates[season]
+                    weather = self.weather[e]
+                    for r in range(regions):
+                        state = weather[r] = bisect.bisect_right(rows[weather[r]], draws[e * regions + r])
+                        rate[r] = season_rate * modifiers[state]
+            elif action == FarmEnv.NAP:
+                self.stamina[e] = min(self.max_stamina[e], self.stamina[e] + 1.0)
+                part = self.part[e] = (part + 1) % 4
+                self.part_elapsed[e] = 0.0
+            elif action >= FarmEnv.PLANT_OFFSET and part != 3:
+                plot, crop_index = divmod(action - FarmEnv.PLANT_OFFSET, crop_count)
+                if (plot < self.plot_count and crops[plot] < 0 and self.unlocked[e][crop_index]
+                        and self.money[e] >= cost[crop_index] and self.stamina[e] >= stamina_cost[crop_index]):
+                    crops[plot] = crop_index
+                    self.planted[e][plot] = clock[plot_region[plot]]
+                    self.money[e] -= cost[crop_index]
+                    self.stamina[e] -= stamina_cost[crop_index]
+
+            for r in range(regions):
+                clock[r] += step_seconds * rate[r]
+            elapsed = self.part_elapsed[e] + step_seconds
+            if elapsed >= self.part_seconds[(self.day[e] - 1) // 30 % 4][part]:
+                self.part[e] = (part + 1) % 4
+                elapsed = 0.0
+            self.part_elapsed[e] = elapsed
+            rewards.append(self.money[e] - money_before)
+            steps = self.steps[e] = self.steps[e] + 1
+            done = steps >= self.max_steps
+            truncated.append(done)
+            if done:
+                finished.append(e)
+        if finished:
+            self._reset_envs(finished)
+        return rewards, truncated
+
+def vector_backends_agree(num_envs: int = 600, steps: int = 300, plots: int = 18) -> bool:
+    """Roda os caminhos NumPy e puro do VectorFarmEnv com as mesmas ações e semente e
+    compara observações e recompensas a cada passo (inclui clima, reinícios e duas regiões)."""
+    envs = [VectorFarmEnv(num_envs, seed=7, plots=plots, max_steps=120, use_numpy=flag) for flag in (True, False)]
+    for env in envs:
+        env.reset()
+    rng = random.Random(1)
+    for _ in range(steps):
+        actions = [rng.randrange(envs[0].action_count) for _ in range(num_envs)]
+        (fast, fast_rewards, *_), (slow, slow_rewards, *_) = (env.step(actions) for env in envs)
+        if not (np.array_equal(fast, np.asarray(slow)) and np.array_equal(fast_rewards, np.asarray(slow_rewards))):
+            return False
+    return True
+
+def run_env_benchmark(num_envs: int, steps: int):
+    single = FarmEnv()
+    single.reset(seed=0)
+    rng = random.Random(0)
+    actions = [rng.randrange(single.action_count) for _ in range(min(steps, 5000))]
+    start = time.perf_counter()
+    for action in actions:
+        single.step(action)
+    elapsed = time.perf_counter() - start
+    print(f"FarmEnv: {len(actions) / elapsed:,.0f} steps/s")
+
+    vector = VectorFarmEnv(num_envs, seed=0)
+    vector.reset()
+    batches = [[rng.randrange(vector.action_count) for _ in range(num_envs)] for _ in range(16)]
+    if vector.use_numpy:
+        batches = [np.asarray(batch) for batch in batches]
+    start = time.perf_counter()
+    for i in range(steps):
+        vector.step(batches[i % len(batches)])
+    elapsed = time.perf_counter() - start
+    backend = "numpy" if vector.use_numpy else "pure Python"
+    print(f"VectorFarmEnv[{num_envs}] ({backend}): {num_envs * steps / elapsed:,.0f} env steps/s")
+    if np is not None:
+        print(f"NumPy and pure Python backends agree: {'yes' if vector_backends_agree() else 'NO'}")
+
+# ==================== Largura de Exibição ====================
+class DisplayWidth:
+    """Largura em colunas do terminal para textos com emoji, seletores de variação e ANSI."""
+    ANSI_ESCAPE = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
+    ZWJ = 0x200D
+    VS16 = 0xFE0F
+    # Faixas de largura zero além das marcas combinantes (formatação, seletores de variação)
+    ZERO_WIDTH_RANGES = [(0x200B, 0x200F), (0x2028, 0x202E), (0x2060, 0x2064),
+                         (0xFE00, 0xFE0F), (0xE0100, 0xE01EF)]
+    # Pictogramas que os terminais desenham com duas colunas mesmo sem East-Asian-Width W
+    EMOJI_WIDE_RANGES = [(0x1F1E6, 0x1F1FF), (0x1F300, 0x1F5FF), (0x1F600, 0x1F64F),
+                         (0x1F680, 0x1F6FF), (0x1F900, 0x1F9FF), (0x1FA70, 0x1FAFF)]
+    _zero_starts = [start for start, _ in ZERO_WIDTH_RANGES]
+    _wide_starts = [start for start, _ in EMOJI_WIDE_RANGES]
+
+    @staticmethod
+    def _in_ranges(code: int, starts: List[int], ranges: List[Tuple[int, int]]) -> bool:
+        i = bisect.bisect_right(starts, code) - 1
+        return i >= 0 and code <= ranges[i][1]
+
+    @classmethod
+    @functools.lru_cache(maxsize=2048)
+    def char_width(cls, code: int) -> int:
+        if code < 0x300:
+            return 0 if code < 0x20 or 0x7F <= code < 0xA0 else 1
+        char = chr(code)
+        if unicodedata.combining(char) or cls._in_ranges(code, cls._zero_starts, cls.ZERO_WIDTH_RANGES):
+            return 0
+        if unicodedata.east_asian_width(char) in ('W', 'F'):
+            return 2
+        if cls._in_ranges(code, cls._wide_starts, cls.EMOJI_WIDE_RANGES):
+            return 2
+        return 1
+
+    @classmethod
+    @functools.lru_cache(maxsize=4096)
+    def of(cls, text: str) -> int:
+        if '\x1b' in text:
+            text = cls.ANSI_ESCAPE.sub('', text)
+        if text.isascii():
+            return len(text)
+        total = 0
+        previous = 0
+        joined = False
+        for char in text:
+            code = ord(char)
+            if code == cls.ZWJ:
+                joined = True
+                continue
+            if code == cls.VS16:
+                # Seletor de apresentação emoji: o caractere anterior passa a ocupar 2 colunas
+                if previous == 1:
+                    total += 1
+                    previous = 2
+                continue
+            width = cls.char_width(code)
+            if width == 0:
+                continue
+            if joined:
+                joined = False
+                continue
+            total += width
+            previous = width
+        return total
+
+    @classmethod
+    def ljust(cls, text: str, width: int) -> str:
+        return text + " " * max(0, width - cls.of(text))
+
+# ==================== Linguagem de Comandos ====================
+class CommandError(ValueError):
+    pass
+
+Command = Tuple[str, Tuple[Any, ...], int]
+# Maior número de lote aceito numa lista de lotes: bem acima de qualquer campo do jogo,
+# mas impede que '1-999999999' vire uma lista gigante antes de chegar à fazenda
+PLOT_SPEC_MAX = 10_000
+
+def _plot_spec(token: str) -> Optional[List[int]]:
+    """'all', '5', '1-9' ou '1,3,7-9' -> índices (base 0); None significa todos os lotes."""
+    if token.lower() == "all":
+        return None
+    plots = []
+    for part in token.split(","):
+        first, _, last = part.partition("-")
+        if not first.isdigit() or (last and not last.isdigit()):
+            raise ValueError(token)
+        start, end = int(first), int(last or first)
+        if not 1 <= start <= end <= PLOT_SPEC_MAX:
+            raise ValueError(token)
+        plots.extend(range(start - 1, end))
+    return plots
+
+class CommandRegistry:
+    """Verbos do modo de comandos: cada um tem handler, conversores de argumentos e linha de ajuda.
+
+    Uma linha pode ter vários comandos separados por ';' e qualquer comando aceita um sufixo
+    'xN' para repetir. O lote inteiro é validado antes de executar e gera um só passo de undo.
+    """
+
+    REPEAT = re.compile(r"x(\d+)$")
+    # Maior 'xN' aceito: como PLOT_SPEC_MAX, barra um lote que rodaria por horas
+    REPEAT_MAX = 1000
+
+    def __init__(self):
+        self._handlers: Dict[str, Callable[..., str]] = {}
+        self._args: Dict[str, Tuple[Callable[[str], Any], ...]] = {}
+        self._usage: Dict[str, str] = {}
+        self._undoable: Dict[str, bool] = {}
+
+    def register(self, verb: str, usage: str = "", args: Tuple[Callable[[str], Any], ...] = (),
+                 undoable: bool = True):
+        def decorator(handler: Callable[..., str]) -> Callable[..., str]:
+            self._handlers[verb] = handler
+            self._args[verb] = args
+            self._usage[verb] = usage or verb
+            self._undoable[verb] = undoable
+            return handler
+        return decorator
+
+    def __contains__(self, verb: str) -> bool:
+        return verb.lower() in self._handlers
+
+    def usage(self) -> List[str]:
+        return list(self._usage.values())
+
+    def parse(self, text: str) -> List[Command]:
+        commands = []
+        for line in text.splitlines():
+            for chunk in line.split("#", 1)[0].split(";"):
+                tokens = chunk.split()
+                if not tokens:
+                    continue
+                verb, tokens = tokens[0].lower(), tokens[1:]
+                if verb not in self._handlers:
+                    raise CommandError(f"Unknown command '{verb}'. Type 'help' for the list.")
+                repeat = 1
+                match = self.REPEAT.match(tokens[-1].lower()) if tokens else None
+                if match:
+                    repeat = int(match.group(1))
+                    tokens = tokens[:-1]
+                converters = self._args[verb]
+                if len(tokens) != len(converters) or not 1 <= repeat <= self.REPEAT_MAX:
+                    raise CommandError(f"Usage: {self._usage[verb]}")
+                try:
+                    args = tuple(convert(token) for convert, token in zip(converters, tokens))
+                except ValueError:
+                    raise CommandError(f"Usage: {self._usage[verb]}")
+                commands.append((verb, args, repeat))
+        return commands
+
+    def run(self, game: 'GameState', commands: List[Command]) -> Tuple[List[str], Optional[str]]:
+        """Executa o lote e para no primeiro erro; retorna (mensagens, erro ou None).
+
+        O passo de undo do lote só é empilhado quando algum comando mudou o jogo.
+        """
+        snapshot = game.fork() if any(self._undoable[verb] for verb, _, _ in commands) else None
+        game.farm.tick()
+        messages = []
+        for verb, args, repeat in commands:
+            try:
+                for _ in range(repeat):
+                    messages.append(self._handlers[verb](game, *args))
+                    if snapshot is not None and self._undoable[verb]:
+                        game.push_undo(snapshot)
+                        snapshot = None
+            except CommandError as e:
+                # Um comando pode falhar depois de mudar parte do jogo (ex.: plantou alguns lotes)
+                if snapshot is not None and self._undoable[verb] and game.to_json() != snapshot.to_json():
+                    game.push_undo(snapshot)
+                return messages, f"{verb}: {e}"
+        return messages, None
+
+    def execute(self, game: 'GameState', text: str) -> Tuple[List[str], Optional[str]]:
+        return self.run(game, self.parse(text))
+
+COMMANDS = CommandRegistry()
+
+def _require_work(game: 'GameState'):
+    if not game.can_work():
+        raise CommandError("It's too dark to work without a lantern!")
+
+@COMMANDS.register("plant", "plant <crop> <plots>  (plots: 5, 1-9, 1,3,7-9 or all)", (str.lower, _plot_spec))
+def _plant_command(game: 'GameState', name: str, plots: Optional[List[int]]) -> str:
+    _require_work(game)
+    if name not in game.crop_system.unlocked_crops:
+        raise CommandError(f"You can't plant {name}.")
+    crop = game.crop_system.get_crop(name)
+    if plots is None:
+        plots = [i for i, plot in enumerate(game.farm.plots) if plot.is_empty]
+    planted = 0
+    for plot_index in plots:
+        error = game.plant(crop, plot_index)
+        if error:
+            planted_note = f"Planted {planted} {name}; " if planted else ""
+            raise CommandError(f"{planted_note}plot {plot_index + 1}: {error}")
+        planted += 1
+    return f"Planted {planted} {name}."
+
+@COMMANDS.register("harvest")
+def _harvest_command(game: 'GameState') -> str:
+    _require_work(game)
+    if not game.player.has_stamina(0.5):
+        raise CommandError("Not enough stamina!")
+    value = game.harvest()
+    return f"Harvested crops worth ${value}!" if value else "Nothing ready to harvest yet!"
+
+@COMMANDS.register("next")
+def _next_command(game: 'GameState') -> str:
+    success, message = game.next_day()
+    if not success:
+        raise CommandError("Not enough stamina!")
+    return "\n".join([f"Advanced to day {game.time_system.day}!"] + (message or "").splitlines())
+
+@COMMANDS.register("sleep")
+def _sleep_command(game: 'GameState') -> str:
+    slept, message = game.sleep()
+    if not slept:
+        raise CommandError("You can only sleep at night… try taking a nap.")
+    return "\n".join([f"You slept until day {game.time_system.day}."] + (message or "").splitlines())
+
+@COMMANDS.register("nap")
+def _nap_command(game: 'GameState') -> str:
+    return "\n".join(["You took a nap and time passed... (+1 heart)"] + game.nap())
+
+@COMMANDS.register("buy", "buy <seed or item>", (str,))
+def _buy_command(game: 'GameState', key: str) -> str:
+    if not MerchantSystem.is_available(game.day_cycle_system.get_current_part()):
+        raise CommandError("Joji only sells in the morning.")
+    inventory = MerchantSystem.catalog()
+    if key in inventory["seeds"]:
+        bought, message = game.merchant_system.buy_seed(key)
+    elif key in inventory["items"]:
+        bought, message = game.merchant_system.buy_item(key)
+    else:
+        bought, message = False, "Invalid option."
+    if not bought:
+        raise CommandError(message)
+    return message
+
+@COMMANDS.register("fish")
+def _fish_command(game: 'GameState') -> str:
+    if not game.fishing_unlocked:
+        raise CommandError("You need a fishing rod.")
+    _require_work(game)
+    if not game.player.has_stamina(2.0):
+        raise CommandError("Not enough stamina to fish.")
+    return game.fishing_system.fish()
+
+@COMMANDS.register("sell")
+def _sell_command(game: 'GameState') -> str:
+    if not game.fishing_unlocked:
+        raise CommandError("You need a fishing rod.")
+    return game.fishing_system.sell_all_fish()
+
+@COMMANDS.register("treat")
+def _treat_command(game: 'GameState') -> str:
+    _require_work(game)
+    treated, message = game.treat_pests()
+    if not treated and game.farm.pests:
+        raise CommandError(message)
+    return message
+
+@COMMANDS.register("field", "field <key>", (str.lower,))
+def _field_command(game: 'GameState', key: str) -> str:
+    error = game.switch_field(key)
+    if error:
+        raise CommandError(error)
+    return f"You walk over to the {FieldSet.spec(key)['name']}."
+
+@COMMANDS.register("undo", undoable=False)
+def _undo_command(game: 'GameState') -> str:
+    if not game.undo():
+        raise CommandError("Nothing to undo.")
+    return "Undone!"
+
+@COMMANDS.register("save", undoable=False)
+def _save_command(game: 'GameState') -> str:
+    if not game.save():
+        raise CommandError("Could not save.")
+    return "Game saved!"
+
+@COMMANDS.register("help", undoable=False)
+def _help_command(game: 'GameState') -> str:
+    return "Commands (separate with ';', repeat with xN):\n" + "\n".join(f"  {line}" for line in COMMANDS.usage())
 
 # ==================== Interface do Usuário ====================
 class TerminalUI:
@@ -657,18 +4607,26 @@ class TerminalUI:
         print(self.color_text('═' * header_width, 'bright_cyan'))
         print(content)
         print(self.color_text('═' * header_width, 'bright_cyan'))
-    def display_farm(self):
+    def display_farm(self, snapshot: Optional[GrowthSnapshot] = None):
+        """Desenha um quadro; sem `snapshot`, abre um tique novo (a colheita seguinte usa o mesmo)."""
         self.clear_screen()
         self.display_header()
         self.display_status()
+        farm = self.game.farm
+        snapshot = snapshot or farm.tick()
 
-        print(f"{self.color_text('🌱 Farm Layout:', 'bright_green')}\n")
+        title = "🌱 Farm Layout:"
+        if len(self.game.fields.owned(self.game.player)) > 1:
+            title = f"🌱 {FieldSet.spec(self.game.fields.active)['name']}:"
+        print(f"{self.color_text(title, 'bright_green')}\n")
 
-        for i in range(0, 9, 3):
+        plot_count = len(farm.plots)
+        width = farm.width
+        for i in range(0, plot_count, width):
             row_lines = ["", "", ""]
-            for j in range(3):
-                plot_idx = i + j
-                crop, progress = self.game.farm.get_plot_status(plot_idx)
+            for plot_idx in range(i, min(i + width, plot_count)):
+                crop = farm.plots[plot_idx].crop
+                progress = snapshot.progress_of(plot_idx)
 
                 if crop:
                     bg_color = "green" if progress >= 1.0 else "yellow_pastel"
@@ -678,11 +4636,12 @@ class TerminalUI:
                     fg_color = "white"
                 slot_text = str(plot_idx + 1).center(9)
                 content_text = crop.name[:7].center(9) if crop else "Empty".center(9)
+                pest_text = "pests!".center(9) if plot_idx in farm.pests.infected else " " * 9
                 spacer = " "
 
                 row_lines[0] += self.bg_color_text(slot_text, fg_color, bg_color) + spacer
                 row_lines[1] += self.bg_color_text(content_text, fg_color, bg_color) + spacer
-                row_lines[2] += self.bg_color_text(" " * 9, fg_color, bg_color) + spacer
+                row_lines[2] += self.bg_color_text(pest_text, fg_color, bg_color) + spacer
 
             for line in row_lines:
                 print(line)
@@ -730,6 +4689,7 @@ class TerminalUI:
     
     def __init__(self, game_state: GameState):
         self.game = game_state
+        self.username = getpass.getuser()
     
     def clear_screen(self):
         print("\033[H\033[J")
@@ -738,9 +4698,7 @@ class TerminalUI:
         return f"{self.COLORS.get(color, '')}{text}{self.COLORS['reset']}"
 
     def strip_ansi(self, text: str) -> str:
-        import re
-        ansi_escape = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
-        return ansi_escape.sub('', text)
+        return DisplayWidth.ANSI_ESCAPE.sub('', text)
     
     def display_stamina(self, stamina: float, max_stamina: int) -> str:
         full_hearts = int(stamina)
@@ -779,8 +4737,9 @@ class TerminalUI:
         message = self.game.day_cycle_system.update()
         if message:
             print(self.color_text(message, "bright_cyan"))
-        import getpass
-        username = getpass.getuser()
+            for effect_message in self.game.advance_timers():
+                print(f"{self.color_text('EVENT:', 'bright_blue')} {effect_message}")
+        username = self.username
         greeting = self.get_greeting()
         stamina_display = self.display_stamina(self.game.player.stamina, self.game.player.max_stamina)
         season = self.game.day_cycle_system.get_season().capitalize()
@@ -798,22 +4757,23 @@ class TerminalUI:
         raw_greeting = GREETING_LINE
         raw_stamina = STAMINA_LINE
 
+        width = DisplayWidth.of
         content_width = max(
-            len(TITLE_LINE_LEFT) + len(TITLE_LINE_RIGHT) + 2,
-            len(raw_greeting),
-            len(self.strip_ansi(stamina_display)) + len("Stamina: ")
+            width(TITLE_LINE_LEFT) + width(TITLE_LINE_RIGHT) + 2,
+            width(raw_greeting),
+            width(raw_stamina)
         ) + 6
         BOX_WIDTH = content_width
         BOX_BORDER_HORIZONTAL = "═" * BOX_WIDTH
 
-        spacing = BOX_WIDTH - len(TITLE_LINE_LEFT) - len(TITLE_LINE_RIGHT) - 2
+        spacing = BOX_WIDTH - width(TITLE_LINE_LEFT) - width(TITLE_LINE_RIGHT) - 2
         TITLE_LINE = f"{TITLE_LINE_LEFT}{' ' * spacing}{TITLE_LINE_RIGHT}"
 
         centered_title = TITLE_LINE
-        title_line = f"{self.color_text('║', 'bright_cyan')}{self.color_text(centered_title.ljust(BOX_WIDTH - 2), 'bright_green')}{self.color_text('║', 'bright_cyan')}"
-        greeting_line = f"{self.color_text('║', 'bright_cyan')}  {self.color_text(raw_greeting.ljust(BOX_WIDTH - 4), 'green')}  {self.color_text('║', 'bright_cyan')}"
+        title_line = f"{self.color_text('║', 'bright_cyan')} {self.color_text(DisplayWidth.ljust(centered_title, BOX_WIDTH - 2), 'bright_green')} {self.color_text('║', 'bright_cyan')}"
+        greeting_line = f"{self.color_text('║', 'bright_cyan')}  {self.color_text(DisplayWidth.ljust(raw_greeting, BOX_WIDTH - 4), 'green')}  {self.color_text('║', 'bright_cyan')}"
         stamina_text = f"Stamina: {stamina_display}"
-        padding = (BOX_WIDTH - 4) - len(self.strip_ansi(stamina_text))
+        padding = (BOX_WIDTH - 4) - width(stamina_text)
         stamina_line = f"{self.color_text('║', 'bright_cyan')}  {stamina_text}{' ' * padding}  {self.color_text('║', 'bright_cyan')}"
 
         print(self.color_text(f'╔{BOX_BORDER_HORIZONTAL}╗', 'bright_cyan'))
@@ -861,22 +4821,23 @@ class TerminalUI:
                 input(f"{self.color_text('Not enough money!', 'red')} Press Enter...")
                 return
                 
+            plot_count = len(self.game.farm.plots)
+            width = self.game.farm.width
             print(f"\n{self.color_text('Farm Layout:', 'bright_green')}")
-            for i in range(0, 9, 3):
-                print(f"{self.color_text(f'{i+1}-{i+3}', 'cyan')} ", end="")
+            for i in range(0, plot_count, width):
+                print(f"{self.color_text(f'{i+1}-{min(i + width, plot_count)}', 'cyan')} ", end="")
             print("\n")
             
-            plot = int(input(f"{self.color_text('Choose plot', 'bright_cyan')} (1-9): ")) - 1
-            if plot < 0 or plot > 8:
+            plot = int(input(f"{self.color_text('Choose plot', 'bright_cyan')} (1-{plot_count}): ")) - 1
+            if plot < 0 or plot >= plot_count:
                 return
             
-            if not self.game.farm.plots[plot].is_empty:
-                input(f"{self.color_text('Plot already occupied!', 'red')} Press Enter...")
+            snapshot = self.game.fork()
+            error = self.game.plant(crop, plot)
+            if error:
+                input(f"{self.color_text(error, 'red')} Press Enter...")
                 return
-                
-            self.game.player.spend_money(crop.cost)
-            self.game.player.use_stamina(crop.stamina_cost)
-            self.game.farm.plant_crop(plot, crop)
+            self.game.push_undo(snapshot)
             print(f"\n{self.color_text(f'Planted {crop.name} in plot {plot+1}!', 'green')}")
             time.sleep(2.6)
             
@@ -889,11 +4850,11 @@ class TerminalUI:
             input(f"{self.color_text('Not enough stamina!', 'red')} Press Enter...")
             return
             
-        harvested_value = self.game.farm.harvest_ready_crops()
+        snapshot = self.game.fork()
+        harvested_value = self.game.harvest()
         
         if harvested_value > 0:
-            self.game.player.earn_money(harvested_value)
-            self.game.player.use_stamina(0.5)
+            self.game.push_undo(snapshot)
             print(f"{self.color_text(f'Harvested crops worth ${harvested_value}!', 'green')}")
         else:
             print(f"{self.color_text('Nothing ready to harvest yet!', 'yellow')}")
@@ -907,25 +4868,25 @@ class TerminalUI:
         print(f"3. {self.color_text('Cancel', 'red')}")
         
         choice = input("\nChoose option: ")
+        snapshot = self.game.fork()
         if choice == "1":
-            if self.game.day_cycle_system.get_current_part() != "night":
+            slept, message = self.game.sleep()
+            if not slept:
                 print(self.color_text("\nYou can only sleep at night… try taking a nap.", "red"))
                 time.sleep(2.6)
                 return
-            success, message = self.game.next_day()
-            self.game.player.full_restore()
-            self.game.player.last_sleep_time = datetime.now()
+            self.game.push_undo(snapshot)
             
             print(self.color_text("\nYou slept soundly and woke up refreshed the next day!", "bright_green"))
-            if message:
-                print(f"{self.color_text('EVENT:', 'bright_blue')} {message}")
+            for line in (message or "").splitlines():
+                print(f"{self.color_text('EVENT:', 'bright_blue')} {line}")
             time.sleep(2.6)
         elif choice == "2":
-            self.game.player.restore_stamina(1)
-            
-            self.game.day_cycle_system.current_part_index = (self.game.day_cycle_system.current_part_index + 1) % len(self.game.day_cycle_system.PARTS)
-            self.game.day_cycle_system.last_update_time = datetime.now()
+            messages = self.game.nap()
+            self.game.push_undo(snapshot)
             print(self.color_text("\nYou took a nap and time passed... (+1 heart)", "green"))
+            for message in messages:
+                print(f"{self.color_text('EVENT:', 'bright_blue')} {message}")
             time.sleep(2.6)
 
     def start_game_loop(self):
@@ -941,19 +4902,31 @@ class TerminalUI:
             actions.append(f"{self.color_text('5.', 'cyan')} {self.color_text('Save & Quit', 'grey')}")
             actions.append(f"{self.color_text('6.', 'cyan')} {self.color_text('Reset Game', 'red')}")
 
-            if self.game.merchant_system.is_available(self.game.day_cycle_system.get_current_part()):
+            if MerchantSystem.is_available(self.game.day_cycle_system.get_current_part()):
                 actions.append(f"{self.color_text('7.', 'cyan')} {self.color_text('Joji the Merchant', 'bright_yellow')}")
 
-            if self.game.merchant_system.fishing_unlocked:
+            if self.game.fishing_unlocked:
                 actions.append(f"{self.color_text('8.', 'cyan')} {self.color_text('Go Fishing', 'grey')}")
 
             if self.game.player.has_farmdex:
                 actions.append(f"{self.color_text('9.', 'cyan')} {self.color_text('Farmdex', 'grey')}")
 
+            if self.game.undo_stack:
+                actions.append(f"{self.color_text('u.', 'cyan')} {self.color_text('Undo', 'grey')}")
+
+            if len(self.game.history):
+                actions.append(f"{self.color_text('h.', 'cyan')} {self.color_text('History', 'grey')}")
+
+            if self.game.farm.pests:
+                actions.append(f"{self.color_text('t.', 'cyan')} {self.color_text('Treat Pests', 'red')}")
+
+            if len(self.game.fields.owned(self.game.player)) > 1:
+                actions.append(f"{self.color_text('f.', 'cyan')} {self.color_text('Fields', 'grey')}")
+
             max_widths = [0, 0, 0]
             for i, action in enumerate(actions):
                 col = i % 3
-                length = len(self.strip_ansi(action))
+                length = DisplayWidth.of(action)
                 if length > max_widths[col]:
                     max_widths[col] = length
 
@@ -961,31 +4934,36 @@ class TerminalUI:
                 row = actions[i:i+3]
                 padded_row = []
                 for j, action in enumerate(row):
-                    col_width = max_widths[j]
-                    raw = self.strip_ansi(action)
-                    pad = col_width - len(raw)
-                    padded_row.append(action + (" " * pad))
+                    padded_row.append(DisplayWidth.ljust(action, max_widths[j]))
                 print(" | ".join(padded_row))
 
+            print(self.color_text("Or type commands, e.g. 'plant wheat 1-9; harvest' ('help' lists them).", "gray"))
+
             choice = input(f"\n{self.color_text('Choose action:', 'bright_cyan')} ")
+            words = choice.split()
+            if words and words[0] in COMMANDS:
+                self.run_commands(choice)
+                continue
 
             if choice == "1":
-                if self.game.day_cycle_system.get_current_part() == "night" and not getattr(self.game.player, "has_lantern", False):
+                if not self.game.can_work():
                     input(self.color_text("It's too dark to work without a lantern!", "red") + " Press Enter...")
                     continue
                 self.plant_crop_menu()
             elif choice == "2":
-                if self.game.day_cycle_system.get_current_part() == "night" and not getattr(self.game.player, "has_lantern", False):
+                if not self.game.can_work():
                     input(self.color_text("It's too dark to work without a lantern!", "red") + " Press Enter...")
                     continue
                 self.harvest_menu()
             elif choice == "3":
+                snapshot = self.game.fork()
                 success, message = self.game.next_day()
                 if success:
+                    self.game.push_undo(snapshot)
                     print(f"{self.color_text('Advanced to day', 'blue')} "
                           f"{self.color_text(self.game.time_system.day, 'bright_blue')}!")
-                    if message:
-                        print(f"{self.color_text('EVENT:', 'bright_blue')} {message}")
+                    for line in (message or "").splitlines():
+                        print(f"{self.color_text('EVENT:', 'bright_blue')} {line}")
                     time.sleep(2.6)
                 else:
                     input(f"{self.color_text('Not enough stamina!', 'red')} Press Enter...")
@@ -1001,41 +4979,117 @@ class TerminalUI:
                     self.game.new_game()
                     print(self.color_text("Game reset!", "green"))
                     time.sleep(1)
-            elif choice == "7" and self.game.merchant_system.is_available(self.game.day_cycle_system.get_current_part()):
+            elif choice == "7" and MerchantSystem.is_available(self.game.day_cycle_system.get_current_part()):
                 self.merchant_menu()
-            elif choice == "8" and self.game.merchant_system.fishing_unlocked:
-                if self.game.day_cycle_system.get_current_part() == "night" and not getattr(self.game.player, "has_lantern", False):
+            elif choice == "8" and self.game.fishing_unlocked:
+                if not self.game.can_work():
                     input(self.color_text("It's too dark to work without a lantern!", "red") + " Press Enter...")
                     continue
                 self.fishing_menu()
             elif choice == "9" and self.game.player.has_farmdex:
                 self.farmdex_menu()
+            elif choice.lower() == "u" and self.game.undo_stack:
+                self.game.undo()
+                print(self.color_text("Undone!", "green"))
+                time.sleep(1)
+            elif choice.lower() == "h" and len(self.game.history):
+                self.history_menu()
+            elif choice.lower() == "f" and len(self.game.fields.owned(self.game.player)) > 1:
+                self.fields_menu()
+            elif choice.lower() == "t" and self.game.farm.pests:
+                if not self.game.can_work():
+                    input(self.color_text("It's too dark to work without a lantern!", "red") + " Press Enter...")
+                    continue
+                snapshot = self.game.fork()
+                treated, message = self.game.treat_pests()
+                if treated:
+                    self.game.push_undo(snapshot)
+                input(message + " Press Enter...")
             else:
                 print(f"{self.color_text('Invalid choice!', 'red')}")
                 time.sleep(2.6)
 
+    def run_commands(self, text: str, pause: bool = True):
+        """Executa um lote de comandos e mostra o resultado uma única vez, sem pausas entre eles."""
+        try:
+            messages, error = COMMANDS.execute(self.game, text)
+        except CommandError as e:
+            messages, error = [], str(e)
+        for message in messages:
+            for line in message.splitlines():
+                print(self.color_text(line, "green"))
+        if error:
+            print(self.color_text(error, "red"))
+        if pause:
+            input(self.color_text("(Press Enter to continue)", "white"))
+
+    def fields_menu(self):
+        self.clear_screen()
+        print(self.color_text("🗺️ Your Fields", "bright_green"))
+        print()
+        owned = self.game.fields.owned(self.game.player)
+        for i, key in enumerate(owned, 1):
+            spec = FieldSet.spec(key)
+            marker = self.color_text(" (you are here)", "bright_yellow") if key == self.game.fields.active else ""
+            details = f"{spec['size']} plots, growth x{spec['growth']}, value x{spec['value']}"
+            if not spec['weather']:
+                details += ", sheltered from weather"
+            print(f"{self.color_text(f'{i}.', 'cyan')} {self.color_text(spec['name'], 'bright_green')} ({details}){marker}")
+        choice = input(f"\n{self.color_text('Go to field', 'bright_cyan')} (0 to cancel): ")
+        if not choice.isdigit() or not 1 <= int(choice) <= len(owned):
+            return
+        key = owned[int(choice) - 1]
+        snapshot = self.game.fork()
+        error = self.game.switch_field(key)
+        if error:
+            input(f"{self.color_text(error, 'red')} Press Enter...")
+            return
+        if key != snapshot.fields.active:
+            self.game.push_undo(snapshot)
+        print(self.color_text(f"You walk over to the {FieldSet.spec(key)['name']}.", "green"))
+        time.sleep(1)
+
+    HISTORY_PAGE_SIZE = 15
+
+    def history_menu(self):
+        page, kind = 0, None
+        while True:
+            entries, pages = self.game.history.page(page, self.HISTORY_PAGE_SIZE, kind)
+            self.clear_screen()
+            title = f"📜 Farm History ({kind})" if kind else "📜 Farm History"
+            print(self.color_text(title, "bright_blue"))
+            print(self.color_text(f"Page {page + 1}/{pages}", "cyan"))
+            print()
+            for entry in entries:
+                amount = f" ({entry['amount']:+d}$)" if entry['amount'] else ""
+                day_label = f"Day {entry['day']:>4}"
+                print(f"{self.color_text(day_label, 'yellow')} "
+                      f"{DisplayWidth.ljust(self.color_text(entry['kind'], 'cyan'), 18)}"
+                      f"{entry['message']}{amount}")
+            if not entries:
+                print(self.color_text("Nothing recorded yet.", "gray"))
+            choice = input(f"\n{self.color_text('n', 'cyan')}ext, {self.color_text('p', 'cyan')}revious, "
+                           f"{self.color_text('f', 'cyan')}ilter by type, Enter to return: ").strip().lower()
+            if choice == "n" and page + 1 < pages:
+                page += 1
+            elif choice == "p" and page > 0:
+                page -= 1
+            elif choice == "f":
+                kind = input("Type (e.g. harvest, event, event:storm, fossil; empty for all): ").strip() or None
+                page = 0
+            elif not choice:
+                return
+
     def farmdex_menu(self):
         self.clear_screen()
         print(self.color_text("🦖 Farmdex Collection", "bright_green"))
-        print(self.color_text(f"Fossils Discovered: {len(self.game.player.fossils_found)}/50", "cyan"))
+        print(self.color_text(f"Fossils Discovered: {len(self.game.player.fossils_found)}/{len(FOSSILS)}", "cyan"))
         print()
-        all_fossils = [
-            "Tyrannosaurus", "Triceratops", "Velociraptor", "Brachiosaurus", "Stegosaurus",
-            "Spinosaurus", "Ankylosaurus", "Parasaurolophus", "Allosaurus", "Diplodocus",
-            "Iguanodon", "Archaeopteryx", "Pteranodon", "Deinonychus", "Megalosaurus",
-            "Pachycephalosaurus", "Corythosaurus", "Oviraptor", "Plateosaurus", "Styracosaurus",
-            "Suchomimus", "Troodon", "Carnotaurus", "Sauropelta", "Albertosaurus",
-            "Mamenchisaurus", "Edmontosaurus", "Herrerasaurus", "Giganotosaurus", "Therizinosaurus",
-            "Kentrosaurus", "Dilophosaurus", "Coelophysis", "Protoceratops", "Sinraptor",
-            "Rugops", "Lambeosaurus", "Mononykus", "Torosaurus", "Rhabdodon",
-            "Ouranosaurus", "Microceratus", "Zuniceratops", "Einiosaurus", "Dromaeosaurus",
-            "Massospondylus", "Lesothosaurus", "Noasaurus", "Gasparinisaura", "Minmi"
-        ]
         columns = 3
-        rows = (len(all_fossils) + columns - 1) // columns
+        rows = (len(FOSSILS) + columns - 1) // columns
         fossil_entries = []
 
-        for name in all_fossils:
+        for name in FOSSILS:
             if name in self.game.player.fossils_found:
                 fossil_entries.append(self.color_text(name, 'bright_green'))
             else:
@@ -1047,8 +5101,7 @@ class TerminalUI:
                 idx = row + col * rows
                 if idx < len(fossil_entries):
                     entry = fossil_entries[idx]
-                    entry_padded = entry + " " * (20 - len(self.strip_ansi(entry)))
-                    line += entry_padded
+                    line += DisplayWidth.ljust(entry, 20)
             print(line)
         input(self.color_text("\n(Press Enter to return)", "white"))
 
@@ -1059,69 +5112,46 @@ class TerminalUI:
         print(self.color_text("Welcome! Take a look at my goods:", "white"))
         print()
 
+        merchant = self.game.merchant_system
+        key_width = max(DisplayWidth.of(key) for section in merchant.inventory.values() for key in section)
+        inflated_tag = self.color_text(" [INFLATED]", "red") if merchant.inflated else ""
+
         print(self.color_text("🌱 Seeds:", "bright_blue"))
-        for key, seed in self.game.merchant_system.inventory["seeds"].items():
+        for key, seed in merchant.inventory["seeds"].items():
             already_unlocked = seed["crop"] in self.game.crop_system.unlocked_crops
-            item_name = self.color_text(key, "gray" if already_unlocked else "cyan")
+            item_name = self.color_text(DisplayWidth.ljust(key + ":", key_width + 1), "gray" if already_unlocked else "cyan")
             unlock = self.color_text(f"(Unlocks {seed['crop'].capitalize()})", "grey")
-            inflated = hasattr(self.game, "market_inflated") and self.game.market_inflated
-            price_display = f"${seed['price'] * 2}" if inflated else f"${seed['price']}"
-            inflated_tag = self.color_text(" [INFLATED]", "red") if inflated else ""
-            print(f" - {item_name}: {price_display} {unlock}{inflated_tag}")
+            print(f" - {item_name} {DisplayWidth.ljust(f'${merchant.price_of(seed)}', 7)} {unlock}{inflated_tag}")
 
         print()
         print(self.color_text("🎁 Items:", "bright_blue"))
-        for key, item in self.game.merchant_system.inventory["items"].items():
-            already_owned = False
-            if item.get("unlocks") == "fishing" and self.game.merchant_system.fishing_unlocked:
-                already_owned = True
-            elif item.get("effect") == "increase_event_chance" and hasattr(self.game.player, "event_bonus") and self.game.player.event_bonus == "lucky_egg":
-                already_owned = True
-            elif item.get("effect") == "increase_max_stamina" and self.game.player.max_stamina > 5:
-                already_owned = True
-            elif item.get("effect") == "cosmetic":
-                already_owned = hasattr(self.game.player, "bought_hat") and self.game.player.bought_hat
-
-            item_name = self.color_text(key, "gray" if already_owned else "cyan")
-            if "unlocks" in item:
-                detail = self.color_text(f"(Unlocks {item['unlocks'].capitalize()})", "grey")
-            elif "effect" in item:
-                readable_effects = {
-                    "cosmetic": "Visual cosmetic item",
-                    "increase_event_chance": "Boosts daily events: 80% chance to occur each day!",
-                    "increase_max_stamina": "Double your max stamina",
-                    "unlock_night_work": "Allow you to work at night"
-                }
-                effect_description = readable_effects.get(item.get("effect", ""), "")
-                detail = self.color_text(f"({effect_description})", "grey") if effect_description else ""
-            else:
-                detail = ""
-            inflated = hasattr(self.game, "market_inflated") and self.game.market_inflated
-            price_display = f"${item['price'] * 2}" if inflated else f"${item['price']}"
-            inflated_tag = self.color_text(" [INFLATED]", "red") if inflated else ""
-            print(f" - {item_name}: {price_display} {detail}{inflated_tag}")
+        for key, item in merchant.inventory["items"].items():
+            item_name = self.color_text(DisplayWidth.ljust(key + ":", key_width + 1), "gray" if merchant.owns(key) else "cyan")
+            effect_description = item.get("description") or ITEM_EFFECTS.describe(ItemEffectRegistry.effect_of(item))
+            detail = self.color_text(f"({effect_description})", "grey") if effect_description else ""
+            print(f" - {item_name} {DisplayWidth.ljust(f'${merchant.price_of(item)}', 7)} {detail}{inflated_tag}")
 
         choice = input("\nWhat would you like to buy? (type item key or '0' to cancel): ").strip()
         if choice == "0":
             return
         narrative = False
         item = None
+        snapshot = self.game.fork()
         if choice in self.game.merchant_system.inventory["seeds"]:
-            msg = self.game.merchant_system.buy_seed(choice)
+            bought, msg = self.game.merchant_system.buy_seed(choice)
         elif choice in self.game.merchant_system.inventory["items"]:
             item = self.game.merchant_system.inventory["items"][choice]
             narrative = item.get("narrative", False)
-            msg = self.game.merchant_system.buy_item(choice)
+            bought, msg = self.game.merchant_system.buy_item(choice)
         else:
-            msg = "Invalid option."
+            bought, msg = False, "Invalid option."
 
-        error_keywords = ["invalid", "not enough"]
-        is_error = msg is None or any(kw in msg.lower() for kw in error_keywords)
-
-        if is_error:
+        if not bought:
             print(self.color_text(msg, "red"))
             time.sleep(2.6)
-        elif narrative:
+            return
+        self.game.push_undo(snapshot)
+        if narrative:
             print(self.color_text(msg, "green"))
             input(self.color_text("\n(Press Enter to continue)", "white"))
         else:
@@ -1136,15 +5166,109 @@ class TerminalUI:
         print("3. Back")
 
         choice = input("\nChoose an option: ").strip()
+        snapshot = self.game.fork()
         if choice == "1":
+            acted = self.game.player.has_stamina(2.0)
             result = self.game.fishing_system.fish()
         elif choice == "2":
+            acted = True
             result = self.game.fishing_system.sell_all_fish()
         else:
             return
+        if acted:
+            self.game.push_undo(snapshot)
 
         print(self.color_text(result, "green"))
         time.sleep(2)
+
+    WATCH_BAR_WIDTH = 20
+
+    def _watch_state(self) -> Tuple[Any, ...]:
+        game = self.game
+        snapshot = game.farm.tick()
+        plots = []
+        next_ripe = None
+        for plot_idx, plot in enumerate(game.farm.plots):
+            if plot.is_empty:
+                plots.append(None)
+                continue
+            progress = snapshot.progress_of(plot_idx)
+            remaining = math.ceil(snapshot.seconds_until_ready(plot_idx, plot.crop))
+            plots.append((plot.crop.name, int(progress * self.WATCH_BAR_WIDTH), remaining))
+            if remaining > 0 and (next_ripe is None or remaining < next_ripe):
+                next_ripe = remaining
+        return (
+            game.time_system.day,
+            game.day_cycle_system.current_part_index,
+            math.ceil(game.day_cycle_system.seconds_until_next_part()),
+            game.player.money,
+            game.player.stamina,
+            game.player.max_stamina,
+            game.weather_system.get_weather(),
+            next_ripe,
+            tuple(plots),
+        )
+
+    def render_watch_frame(self, state: Tuple[Any, ...]) -> str:
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            self.display_farm(self.game.farm.snapshot())
+            part_countdown, next_ripe, plots = state[2], state[7], state[8]
+            part = self.game.day_cycle_system.get_current_part().capitalize()
+            print(self.color_text("Growth:", "bright_blue"))
+            for i, plot_state in enumerate(plots):
+                if plot_state is None:
+                    print(f"{i + 1}. {self.color_text('Empty', 'gray')}")
+                    continue
+                name, filled, remaining = plot_state
+                bar = self.color_text('█' * filled, 'green') + self.color_text('░' * (self.WATCH_BAR_WIDTH - filled), 'gray')
+                status = self.color_text("ready!", "bright_green") if remaining == 0 else f"ready in {remaining}s"
+                print(f"{i + 1}. {name[:12]:<12} {bar} {status}")
+            minutes, seconds = divmod(part_countdown, 60)
+            print()
+            print(f"{part} ends in {minutes:02d}:{seconds:02d}", end="")
+            if next_ripe is not None:
+                print(f"   Next ripe crop in {next_ripe}s", end="")
+            print()
+            print(self.color_text("(watching — Ctrl+C to exit)", "gray"))
+        return buffer.getvalue()
+
+    def watch(self, fps: float = 10.0):
+        """Painel somente leitura: redesenha no máximo `fps` vezes por segundo, só quando algo muda."""
+        frame_interval = 1.0 / max(0.1, fps)
+        last_state = None
+        next_frame = time.monotonic()
+        resized = [False]
+        previous_handler = None
+        if hasattr(signal, "SIGWINCH"):
+            previous_handler = signal.signal(signal.SIGWINCH, lambda signum, frame: resized.__setitem__(0, True))
+        storage = self.game.storage
+        save_version = storage.version()
+        try:
+            while True:
+                # O jogo roda em outro processo: relê o save quando ele muda e segue o relógio do dia
+                version = storage.version()
+                if version != save_version and self.game.load():
+                    save_version = version
+                if self.game.day_cycle_system.update():
+                    self.game.advance_timers()
+                state = self._watch_state()
+                if state != last_state or resized[0]:
+                    resized[0] = False
+                    sys.stdout.write(self.render_watch_frame(state))
+                    sys.stdout.flush()
+                    last_state = state
+                next_frame += frame_interval
+                delay = next_frame - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_frame = time.monotonic()
+        except KeyboardInterrupt:
+            print()
+        finally:
+            if previous_handler is not None:
+                signal.signal(signal.SIGWINCH, previous_handler)
 # ==================== Ciclo do Dia ====================
 class DayCycleSystem(ISerializable):
     PARTS = ["morning", "afternoon", "evening", "night"]
@@ -1156,8 +5280,7 @@ class DayCycleSystem(ISerializable):
         self.durations = self.get_durations_for_current_season()
 
     def get_season(self) -> str:
-        season_index = (self.time_system.day - 1) // 30 % 4
-        return ["spring", "summer", "autumn", "winter"][season_index]
+        return TimeSystem.season_for_day(self.time_system.day)
 
     def get_durations_for_current_season(self) -> Dict[str, int]:
         season = self.get_season()
@@ -1184,6 +5307,10 @@ class DayCycleSystem(ISerializable):
     def get_current_part(self) -> str:
         return self.PARTS[self.current_part_index]
 
+    def seconds_until_next_part(self) -> float:
+        duration = self.durations[self.get_current_part()] * 60
+        return max(0.0, duration - (datetime.now() - self.last_update_time).total_seconds())
+
     def to_dict(self):
         return {
             'current_part_index': self.current_part_index,
@@ -1200,10 +5327,108 @@ class DayCycleSystem(ISerializable):
 
 # ==================== Inicialização do Jogo ====================
 def main():
-    game_state = GameState()
+    parser = argparse.ArgumentParser(description="Terminal Farm")
+    commands = parser.add_subparsers(dest="command")
+    bench_shards = commands.add_parser("bench-shards", help="Benchmark the sharded farm tick on 1..N cores")
+    bench_shards.add_argument("--plots", type=int, default=1_000_000)
+    bench_shards.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    analytics = commands.add_parser("analytics", help="Aggregate reports over a directory of save files")
+    analytics.add_argument("directory")
+    analytics.add_argument("--workers", type=int, default=None)
+    analytics.add_argument("--json", action="store_true", help="Print the aggregates as JSON")
+    bench_env = commands.add_parser("bench-env", help="Measure FarmEnv and VectorFarmEnv throughput")
+    bench_env.add_argument("--envs", type=int, default=1024)
+    bench_env.add_argument("--steps", type=int, default=200)
+    bench_adjacency = commands.add_parser("bench-adjacency", help="Time companion-planting bonus evaluation")
+    bench_adjacency.add_argument("--side", type=int, default=1000)
+    bench_adjacency.add_argument("--changes", type=int, default=1000)
+    bench_save = commands.add_parser("bench-save", help="Time repeated JSON saves of a mostly unchanged farm")
+    bench_save.add_argument("--plots", type=int, default=100_000)
+    bench_save.add_argument("--saves", type=int, default=20)
+    bench_save.add_argument("--changes", type=int, default=10)
+    bench_startup = commands.add_parser("bench-startup", help="Time module import and game construction")
+    bench_startup.add_argument("--runs", type=int, default=5)
+    bench_startup.add_argument("--import-budget-ms", type=float, default=None,
+                               help="Exit with an error if importing the module takes longer than this")
+    migrate = commands.add_parser("migrate", help="Import a JSON save into an SQLite database")
+    migrate.add_argument("--json", default=GameState.SAVE_FILE)
+    migrate.add_argument("--db", required=True)
+    migrate.add_argument("--player", default="default")
+    bench_storage = commands.add_parser("bench-storage", help="Measure concurrent SQLite saves")
+    bench_storage.add_argument("--db", default="terminal_farm_bench.db")
+    bench_storage.add_argument("--farms", type=int, default=500)
+    bench_storage.add_argument("--threads", type=int, default=8)
+    bench_storage.add_argument("--rounds", type=int, default=3)
+    bench_storage.add_argument("--plots", type=int, default=81)
+    parser.add_argument("--db", dest="game_db", help="Play using an SQLite database instead of the JSON save")
+    parser.add_argument("--player", dest="game_player", default="default")
+    run = commands.add_parser("run", help="Run typed commands against the saved farm, then save")
+    run.add_argument("script", nargs="*", help="Commands, e.g. 'plant wheat 1-9; harvest' (default: read stdin)")
+    run.add_argument("--dry-run", action="store_true", help="Don't save the result")
+    watch = commands.add_parser("watch", help="Read-only live view of the saved farm")
+    watch.add_argument("--fps", type=float, default=10.0, help="Maximum redraws per second")
+    args = parser.parse_args()
+
+    if args.command == "bench-shards":
+        run_shard_benchmark(args.plots, args.max_workers)
+        return
+    if args.command == "bench-env":
+        run_env_benchmark(args.envs, args.steps)
+        return
+    if args.command == "bench-adjacency":
+        run_adjacency_benchmark(args.side, args.changes)
+        return
+    if args.command == "bench-save":
+        run_save_benchmark(args.plots, args.saves, args.changes)
+        return
+    if args.command == "migrate":
+        migrate_json_to_sqlite(args.json, args.db, args.player)
+        return
+    if args.command == "bench-storage":
+        run_storage_benchmark(args.db, args.farms, args.threads, args.rounds, args.plots)
+        return
+    if args.command == "analytics":
+        report = SaveAnalytics.scan(args.directory, args.workers)
+        if args.json:
+            print(json.dumps(report.to_dict(), indent=2))
+        else:
+            report.print_report()
+        return
+
+    if args.command == "bench-startup":
+        sys.exit(run_startup_benchmark(args.runs, args.import_budget_ms))
+
+    storage = SqliteStorage(args.game_db, args.game_player) if args.game_db else None
+    game_state, loaded = GameState.open(storage)
     ui = TerminalUI(game_state)
+
+    if args.command == "run":
+        script = "\n".join(args.script) if args.script else sys.stdin.read()
+        try:
+            commands = COMMANDS.parse(script)
+        except CommandError as e:
+            print(e)
+            sys.exit(2)
+        messages, error = COMMANDS.run(game_state, commands)
+        if sys.stdout.isatty():
+            ui.display_farm()
+        for message in messages:
+            print(message)
+        if error:
+            print(error)
+        if not args.dry_run:
+            game_state.save()
+        game_state.telemetry.close()
+        sys.exit(1 if error else 0)
+
+    if args.command == "watch":
+        if not loaded:
+            print("No saved farm to watch.")
+            return
+        ui.watch(args.fps)
+        return
     
-    if not game_state.load():
+    if not loaded:
         print("Starting new game...")
         time.sleep(1)
     
@@ -1214,6 +5439,8 @@ def main():
         game_state.save()
         print(f"\nGame saved automatically!")
         sys.exit()
+    finally:
+        game_state.telemetry.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file